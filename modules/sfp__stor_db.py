@@ -20,16 +20,23 @@ class sfp__stor_db(SpiderFootPlugin):
     # Default options
     opts = {
         'maxstorage': 1024,  # max bytes for any piece of info stored (0 = unlimited)
+        'batchsize': 500,
+        'batchtime': 1000,
         '_store': True
     }
 
     # Option descriptions
     optdescs = {
-        'maxstorage': "Maximum bytes to store for any piece of information retreived (0 = unlimited.)"
+        'maxstorage': "Maximum bytes to store for any piece of information retreived (0 = unlimited.)",
+        'batchsize': "Maximum number of events to write to the database in one transaction (0 = write each event as it arrives.)",
+        'batchtime': "Maximum milliseconds to hold events before writing them to the database, when writing in batches."
     }
 
+    batching = False
+
     def setup(self, sfc, userOpts=dict()):
         self.sf = sfc
+        self.batching = False
 
         for opt in userOpts.keys():
             self.opts[opt] = userOpts[opt]
@@ -45,14 +52,19 @@ class sfp__stor_db(SpiderFootPlugin):
         if not self.opts['_store']:
             return None
 
-        if self.opts['maxstorage'] != 0:
-            if len(sfEvent.data) > self.opts['maxstorage']:
-                self.sf.debug("Storing an event: " + sfEvent.eventType)
-                self.__sfdb__.scanEventStore(self.getScanId(), sfEvent, self.opts['maxstorage'])
-                return None
+        # Hand events to a background writer. The scanner flushes it
+        # when the scan ends.
+        if self.opts['batchsize'] > 0 and not self.batching:
+            self.__sfdb__.scanEventBatchStart(self.opts['batchsize'],
+                                              self.opts['batchtime'])
+            self.batching = True
 
-        self.sf.debug("Storing an event: " + sfEvent.eventType)
-        self.__sfdb__.scanEventStore(self.getScanId(), sfEvent)
+        if self.opts['maxstorage'] != 0 and len(sfEvent.data) > self.opts['maxstorage']:
+            self.sf.debug("Storing an event: " + sfEvent.eventType)
+            self.__sfdb__.scanEventStore(self.getScanId(), sfEvent, self.opts['maxstorage'])
+        else:
+            self.sf.debug("Storing an event: " + sfEvent.eventType)
+            self.__sfdb__.scanEventStore(self.getScanId(), sfEvent)
 
 
 # End of sfp__stor_db class
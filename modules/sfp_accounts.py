@@ -65,17 +65,13 @@ class sfp_accounts(SpiderFootPlugin):
         self.commonNames = set(self.sf.dictnames())
         self.words = set(self.sf.dictwords())
 
-        content = self.sf.cacheGet("sfaccounts", 48)
+        url = "https://raw.githubusercontent.com/WebBreacher/WhatsMyName/master/web_accounts_list.json"
+        content = self.sf.cacheGetOrPut("sfaccounts", 48,
+            lambda: self.sf.fetchUrl(url, useragent="SpiderFoot")['content'])
         if content is None:
-            url = "https://raw.githubusercontent.com/WebBreacher/WhatsMyName/master/web_accounts_list.json"
-            data = self.sf.fetchUrl(url, useragent="SpiderFoot")
-            if data['content'] is None:
-                self.sf.error("Unable to fetch " + url, False)
-                self.errorState = True
-                return None
-            else:
-                self.sf.cachePut("sfaccounts", data['content'])
-                content = data['content']
+            self.sf.error("Unable to fetch " + url, False)
+            self.errorState = True
+            return None
 
         self.sites = json.loads(content)['sites']
 
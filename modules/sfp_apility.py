@@ -12,7 +12,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 from sflib import SpiderFoot, SpiderFootPlugin, SpiderFootEvent
 
 class sfp_apility(SpiderFootPlugin):
@@ -63,9 +62,8 @@ class sfp_apility(SpiderFootPlugin):
         res = self.sf.fetchUrl('https://api.apility.net/baddomain/' + qry,
                                headers=headers,
                                timeout=15,
-                               useragent=self.opts['_useragent'])
-
-        time.sleep(self.opts['delay'])
+                               useragent=self.opts['_useragent'],
+                               rateLimit=self.opts['delay'])
 
         return self.parseApiResponse(res)
 
@@ -79,9 +77,8 @@ class sfp_apility(SpiderFootPlugin):
         res = self.sf.fetchUrl('https://api.apility.net/badip/' + qry,
                                headers=headers,
                                timeout=15,
-                               useragent=self.opts['_useragent'])
-
-        time.sleep(self.opts['delay'])
+                               useragent=self.opts['_useragent'],
+                               rateLimit=self.opts['delay'])
 
         return self.parseApiResponse(res)
 
@@ -97,9 +94,8 @@ class sfp_apility(SpiderFootPlugin):
         res = self.sf.fetchUrl('https://api.apility.net/v2.0/ip/' + qry,
                                headers=headers,
                                timeout=15,
-                               useragent=self.opts['_useragent'])
-
-        time.sleep(self.opts['delay'])
+                               useragent=self.opts['_useragent'],
+                               rateLimit=self.opts['delay'])
 
         return self.parseApiResponse(res)
 
@@ -114,9 +110,8 @@ class sfp_apility(SpiderFootPlugin):
         res = self.sf.fetchUrl('https://api.apility.net/v2.0/as/ip/' + qry,
                                headers=headers,
                                timeout=15,
-                               useragent=self.opts['_useragent'])
-
-        time.sleep(self.opts['delay'])
+                               useragent=self.opts['_useragent'],
+                               rateLimit=self.opts['delay'])
 
         return self.parseApiResponse(res)
 
@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 from sflib import SpiderFoot, SpiderFootPlugin, SpiderFootEvent
 
 class sfp_bgpview(SpiderFootPlugin):
@@ -43,9 +42,8 @@ class sfp_bgpview(SpiderFootPlugin):
     def queryAsn(self, qry):
         res = self.sf.fetchUrl("https://api.bgpview.io/asn/" + qry.replace('AS', ''),
                                useragent=self.opts['_useragent'],
-                               timeout=self.opts['_fetchtimeout'])
-
-        time.sleep(1)
+                               timeout=self.opts['_fetchtimeout'],
+                               rateLimit=1)
 
         if res['content'] is None:
             return None
@@ -71,9 +69,8 @@ class sfp_bgpview(SpiderFootPlugin):
     def queryAsnPeers(self, qry):
         res = self.sf.fetchUrl("https://api.bgpview.io/asn/" + qry.replace('AS', '') + '/peers',
                                useragent=self.opts['_useragent'],
-                               timeout=self.opts['_fetchtimeout'])
-
-        time.sleep(1)
+                               timeout=self.opts['_fetchtimeout'],
+                               rateLimit=1)
 
         if res['content'] is None:
             return None
@@ -99,9 +96,8 @@ class sfp_bgpview(SpiderFootPlugin):
     def queryIp(self, qry):
         res = self.sf.fetchUrl("https://api.bgpview.io/ip/" + qry,
                                useragent=self.opts['_useragent'],
-                               timeout=self.opts['_fetchtimeout'])
-
-        time.sleep(1)
+                               timeout=self.opts['_fetchtimeout'],
+                               rateLimit=1)
 
         if res['content'] is None:
             return None
@@ -127,9 +123,8 @@ class sfp_bgpview(SpiderFootPlugin):
     def queryNetblock(self, qry):
         res = self.sf.fetchUrl("https://api.bgpview.io/prefix/" + qry,
                                useragent=self.opts['_useragent'],
-                               timeout=self.opts['_fetchtimeout'])
-
-        time.sleep(1)
+                               timeout=self.opts['_fetchtimeout'],
+                               rateLimit=1)
 
         if res['content'] is None:
             return None
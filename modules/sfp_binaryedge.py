@@ -110,7 +110,8 @@ class sfp_binaryedge(SpiderFootPlugin):
         }
         url = binaryedgeurl + queryurl.format(qry.encode('utf-8', errors='replace'), page)
         res = self.sf.fetchUrl(url, timeout=self.opts['_fetchtimeout'], 
-                               useragent="SpiderFoot", headers=headers)
+                               useragent="SpiderFoot", headers=headers, retries=3,
+                               stopCheck=self.checkForStop)
 
         if res['code'] in [ "429", "500" ]:
             self.sf.error("BinaryEdge.io API key seems to have been rejected or you have exceeded usage limits for the month.", False)
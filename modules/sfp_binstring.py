@@ -11,6 +11,7 @@
 # -------------------------------------------------------------------------------
 
 import string
+from itertools import chain
 from sflib import SpiderFoot, SpiderFootPlugin, SpiderFootEvent
 
 class sfp_binstring(SpiderFootPlugin):
@@ -54,6 +55,8 @@ class sfp_binstring(SpiderFootPlugin):
         for opt in userOpts.keys():
             self.opts[opt] = userOpts[opt]
 
+    # content is an iterable of chunks of the file, so that we stop
+    # downloading once enough words have been found.
     def getStrings(self, content):
         words = list()
         result = ""
@@ -61,7 +64,7 @@ class sfp_binstring(SpiderFootPlugin):
         if not content:
             return None
 
-        for c in content:
+        for c in chain.from_iterable(content):
             if len(words) >= self.opts['maxwords']:
                 break
             if c in string.printable and c not in string.whitespace:
@@ -124,14 +127,16 @@ class sfp_binstring(SpiderFootPlugin):
         res = None
         for fileExt in self.opts['fileexts']:
             if eventData.lower().endswith("." + fileExt.lower()) or "." + fileExt + "?" in eventData.lower():
-                res = self.sf.fetchUrl(eventData, 
-                                       useragent=self.opts['_useragent'], 
-                                       dontMangle=True,
-                                       sizeLimit=self.opts['maxfilesize'])
-                
+                res = self.sf.fetchUrlStream(eventData,
+                                             useragent=self.opts['_useragent'],
+                                             sizeLimit=self.opts['maxfilesize'])
+                break
+
         if res:
             self.sf.debug("Searching for strings")
             words = self.getStrings(res['content'])
+            if res['content'] is not None:
+                res['content'].close()
 
             if words:
                 wordstr = '\n'.join(words[0:self.opts['maxwords']])
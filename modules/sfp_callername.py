@@ -15,7 +15,6 @@ try:
 except ImportError as e:
     import re
 
-import time
 from sflib import SpiderFoot, SpiderFootPlugin, SpiderFootEvent
 
 class sfp_callername(SpiderFootPlugin):
@@ -79,9 +78,8 @@ class sfp_callername(SpiderFootPlugin):
 
         # Query CallerName.com for the specified phone number
         url = 'https://callername.com/' + number
-        res = self.sf.fetchUrl(url, timeout=self.opts['_fetchtimeout'], useragent=self.opts['_useragent'])
-
-        time.sleep(1)
+        res = self.sf.fetchUrl(url, timeout=self.opts['_fetchtimeout'], useragent=self.opts['_useragent'],
+                               rateLimit=1)
 
         if res['content'] is None:
             self.sf.debug('No response from CallerName.com')
@@ -25,7 +25,8 @@ class sfp_censys(SpiderFootPlugin):
         "censys_api_key_uid": "",
         "censys_api_key_secret": "",
         'delay': 3,
-        "age_limit_days": 90
+        "age_limit_days": 90,
+        "apicache": 0
     }
 
     # Option descriptions
@@ -33,7 +34,8 @@ class sfp_censys(SpiderFootPlugin):
         "censys_api_key_uid": "Censys.io API UID.",
         "censys_api_key_secret": "Censys.io API Secret.",
         'delay': 'Delay between requests, in seconds.',
-        "age_limit_days": "Ignore any records older than this many days. 0 = unlimited."
+        "age_limit_days": "Ignore any records older than this many days. 0 = unlimited.",
+        "apicache": "Hours to re-use API responses for, in this and later scans, instead of querying the API again. 0 = always query the API."
     }
 
     # Be sure to completely clear any class variables in setup()
@@ -71,13 +73,13 @@ class sfp_censys(SpiderFootPlugin):
         headers = {
             'Authorization': "Basic " + base64.b64encode(self.opts['censys_api_key_uid'] + ":" + self.opts['censys_api_key_secret'])
         }
+        # API rate limit: 0.4 actions/second (120.0 per 5 minute interval)
         res = self.sf.fetchUrl('https://censys.io/api/v1/view/' + querytype.format(qry.encode('utf-8', errors='replace')),
                                timeout=self.opts['_fetchtimeout'],
                                useragent="SpiderFoot",
-                               headers=headers)
-
-        # API rate limit: 0.4 actions/second (120.0 per 5 minute interval)
-        time.sleep(self.opts['delay'])
+                               headers=headers,
+                               cacheHrs=self.opts['apicache'],
+                               rateLimit=self.opts['delay'])
 
         if res['code'] in [ "400", "429", "500", "403" ]:
             self.sf.error("Censys.io API key seems to have been rejected or you have exceeded usage limits for the month.", False)
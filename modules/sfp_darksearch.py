@@ -12,7 +12,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 import urllib
 from sflib import SpiderFoot, SpiderFootPlugin, SpiderFootEvent
 
@@ -56,12 +55,11 @@ class sfp_darksearch(SpiderFootPlugin):
             'page': str(page)
         }
 
+        # Usage policy mandates maximum 30 requests per minute
         res = self.sf.fetchUrl("https://darksearch.io/api/search?" + urllib.urlencode(params),
                                useragent=self.opts['_useragent'],
-                               timeout=self.opts['_fetchtimeout'])
-
-        # Usage policy mandates maximum 30 requests per minute
-        time.sleep(2)
+                               timeout=self.opts['_fetchtimeout'],
+                               rateLimit=2)
 
         if res['content'] is None:
             return None
@@ -11,9 +11,6 @@
 # Licence:     GPL
 # -------------------------------------------------------------------------------
 
-import random
-import threading
-import time
 from sflib import SpiderFoot, SpiderFootPlugin, SpiderFootEvent
 
 class sfp_dnsbrute(SpiderFootPlugin):
@@ -28,7 +25,9 @@ class sfp_dnsbrute(SpiderFootPlugin):
         "top10000": False,
         "numbersuffix": True,
         "numbersuffixlimit": True,
-        "_maxthreads": 100
+        "_maxinflight": 1000,
+        "_dnsrate": 500,
+        "_dnsretries": 2
     }
 
     # Option descriptions
@@ -43,14 +42,12 @@ class sfp_dnsbrute(SpiderFootPlugin):
 
     events = None
     sublist = None
-    lock = None
 
     def setup(self, sfc, userOpts=dict()):
         self.sf = sfc
         self.sublist = self.tempStorage()
         self.events = self.tempStorage()
         self.__dataSource__ = "DNS"
-        self.lock = threading.Lock()
 
         for opt in userOpts.keys():
             self.opts[opt] = userOpts[opt]
@@ -84,44 +81,28 @@ class sfp_dnsbrute(SpiderFootPlugin):
     def producedEvents(self):
         return ["INTERNET_NAME"]
 
-    def tryHost(self, name):
-        try:
-            addrs = self.sf.resolveHost(name)
-            with self.lock:
-                self.hostResults[name] = True
-        except BaseException as e:
-            with self.lock:
-                self.hostResults[name] = False
-
-    def tryHostWrapper(self, hostList, sourceEvent):
-        self.hostResults = dict()
-        running = True
-        i = 0
-        t = []
+    # Resolve the hosts in hostList and report those that resolved. Hosts
+    # resolving only to addresses in wildcard, the addresses wildcard DNS
+    # for their zone resolves to, are dropped.
+    def tryHostWrapper(self, hostList, sourceEvent, wildcard=frozenset()):
+        self.sf.info("Checking " + str(len(hostList)) + " possible hosts.")
+        found = self.sf.resolveHostsBulk(hostList, rate=self.opts['_dnsrate'],
+                                         retries=self.opts['_dnsretries'],
+                                         maxInFlight=self.opts['_maxinflight'],
+                                         stopCheck=self.checkForStop)
 
-        # Spawn threads for scanning
-        self.sf.info("Spawning threads to check hosts: " + str(hostList))
         for name in hostList:
-            tn = 'thread_sfp_dnsbrute_' + str(random.randint(0, 999999999))
-            t.append(threading.Thread(name=tn, target=self.tryHost, args=(name,)))
-            t[i].start()
-            i += 1
-
-        # Block until all threads are finished
-        while running:
-            found = False
-            for rt in threading.enumerate():
-                if rt.name.startswith("thread_sfp_dnsbrute_"):
-                    found = True
+            if self.checkForStop():
+                return None
 
-            if not found:
-                running = False
+            if name not in found:
+                continue
 
-            time.sleep(0.05)
+            if len(wildcard) > 0 and set(found[name]).issubset(wildcard):
+                self.sf.debug("Skipping " + name + " as it only resolves to wildcard DNS addresses.")
+                continue
 
-        for res in self.hostResults:
-            if self.hostResults.get(res, False):
-                self.sendEvent(sourceEvent, res)
+            self.sendEvent(sourceEvent, name)
 
     # Store the result internally and notify listening modules
     def sendEvent(self, source, result):
@@ -164,7 +145,7 @@ class sfp_dnsbrute(SpiderFootPlugin):
             h, dom = eventData.split(".", 1)
 
             # Try resolving common names
-            wildcard = self.sf.checkDnsWildcard(dom)
+            wildcard = self.sf.dnsWildcardAnswers(dom)
             if self.opts['skipcommonwildcard'] and wildcard:
                 self.sf.debug("Wildcard DNS detected on " + dom + " so skipping host iteration.")
                 return None
@@ -179,7 +160,7 @@ class sfp_dnsbrute(SpiderFootPlugin):
                 nextsubs[h + "-0" + str(i) + dom] = True
                 nextsubs[h + "-00" + str(i) + dom] = True
 
-            self.tryHostWrapper(nextsubs.keys(), event)
+            self.tryHostWrapper(nextsubs.keys(), event, wildcard)
 
             # The rest of the module is for handling targets only
             return None
@@ -190,27 +171,16 @@ class sfp_dnsbrute(SpiderFootPlugin):
 
         # Try resolving common names
         self.sf.debug("Iterating through possible sub-domains.")
-        wildcard = self.sf.checkDnsWildcard(eventData)
+        wildcard = self.sf.dnsWildcardAnswers(eventData)
         if self.opts['skipcommonwildcard'] and wildcard:
             self.sf.debug("Wildcard DNS detected.")
             return None
 
         targetList = list()
         for sub in self.sublist:
-            if self.checkForStop():
-                return None
-
-            name = sub + "." + eventData
+            targetList.append(sub + "." + eventData)
 
-            if len(targetList) <= self.opts['_maxthreads']:
-                targetList.append(name)
-            else:
-                self.tryHostWrapper(targetList, event)
-                targetList = list()
-
-        # Scan whatever may be left over.
-        if len(targetList) > 0:
-            self.tryHostWrapper(targetList, event)
+        self.tryHostWrapper(targetList, event, wildcard)
 
         if self.opts['numbersuffix'] and not self.opts['numbersuffixlimit']:
             nextsubs = dict()
@@ -227,13 +197,7 @@ class sfp_dnsbrute(SpiderFootPlugin):
                     nextsubs[s + "-0" + str(i) + dom] = True
                     nextsubs[s + "-00" + str(i) + dom] = True
 
-                if len(nextsubs.keys()) >= self.opts['_maxthreads']:
-                    self.tryHostWrapper(nextsubs.keys(), event)
-                    nextsubs = dict()
-
-            # Scan whatever may be left over.
-            if len(nextsubs) > 0:
-                self.tryHostWrapper(nextsubs.keys(), event)
+            self.tryHostWrapper(nextsubs.keys(), event, wildcard)
 
 
 # End of sfp_dnsbrute class
@@ -196,6 +196,7 @@ class sfp_dnsresolve(SpiderFootPlugin):
                 return None
 
             self.sf.debug("Looking up IPs in owned netblock: " + eventData)
+            ipList = list()
             for ip in IPNetwork(eventData):
                 ipaddr = str(ip)
                 if "::" in ipaddr:
@@ -204,22 +205,20 @@ class sfp_dnsresolve(SpiderFootPlugin):
                     continue
                 if '255' in ipaddr.split("."):
                     continue
+                ipList.append(ipaddr)
 
+            # Reverse-resolve the whole netblock at once, handling each
+            # address as soon as its answer arrives.
+            for ipaddr, addrs in self.sf.resolveIPsBulk(ipList, stopCheck=self.checkForStop):
                 if self.checkForStop():
                     return None
 
-                addrs = self.sf.resolveIP(ipaddr)
-                if addrs:
-                    self.sf.debug("Found a reversed hostname from " + ipaddr +
-                                  " (" + str(addrs) + ")")
-                    for addr in addrs:
-                        # Generate an event for the IP, then
-                        # let the handling by this module take
-                        # care of follow-up processing.
-                        if self.checkForStop():
-                            return None
-
-                        self.processHost(ipaddr, parentEvent, False)
+                self.sf.debug("Found a reversed hostname from " + ipaddr +
+                              " (" + str(addrs) + ")")
+                # Generate an event for the IP, then
+                # let the handling by this module take
+                # care of follow-up processing.
+                self.processHost(ipaddr, parentEvent, False)
             return None
 
         if eventName in ["IP_ADDRESS", "INTERNET_NAME", 
@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 from sflib import SpiderFoot, SpiderFootPlugin, SpiderFootEvent
 
 class sfp_emailrep(SpiderFootPlugin):
@@ -42,12 +41,12 @@ class sfp_emailrep(SpiderFootPlugin):
 
     # https://emailrep.io/docs/
     def query(self, qry):
+        # Documentation does not indicate rate limit
         res = self.sf.fetchUrl('https://emailrep.io/' + qry,
                                useragent='curl', # cURL user-agent appears to be required
-                               timeout=self.opts['_fetchtimeout'])
-
-        # Documentation does not indicate rate limit
-        time.sleep(1)
+                               timeout=self.opts['_fetchtimeout'],
+                               rateLimit=1, retries=3,
+                               stopCheck=self.checkForStop)
 
         if res['content'] is None:
             return None
@@ -16,7 +16,6 @@ try:
 except ImportError as e:
     import re
 
-import time
 import urllib
 from sflib import SpiderFoot, SpiderFootPlugin, SpiderFootEvent
 
@@ -53,9 +52,8 @@ class sfp_fringeproject(SpiderFootPlugin):
 
         res = self.sf.fetchUrl('https://api.fringeproject.com/api/search?' + urllib.urlencode(params),
                                useragent=self.opts['_useragent'],
-                               timeout=self.opts['_fetchtimeout'])
-
-        time.sleep(1)
+                               timeout=self.opts['_fetchtimeout'],
+                               rateLimit=1)
 
         if res['content'] is None:
             return None
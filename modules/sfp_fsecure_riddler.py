@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 from sflib import SpiderFoot, SpiderFootPlugin, SpiderFootEvent
 
 class sfp_fsecure_riddler(SpiderFootPlugin):
@@ -104,9 +103,8 @@ class sfp_fsecure_riddler(SpiderFootPlugin):
                                postData=json.dumps(params),
                                headers=headers,
                                useragent=self.opts['_useragent'],
-                               timeout=self.opts['_fetchtimeout'])
-
-        time.sleep(1)
+                               timeout=self.opts['_fetchtimeout'],
+                               rateLimit=1)
 
         if res['code'] in [ "400", "401", "402", "403" ]:
             self.sf.error('Unexpected HTTP response code: ' + res['code'], False)
@@ -13,7 +13,6 @@
 
 import json
 import hashlib
-import time
 from sflib import SpiderFoot, SpiderFootPlugin, SpiderFootEvent
 
 class sfp_gravatar(SpiderFootPlugin):
@@ -58,9 +57,8 @@ class sfp_gravatar(SpiderFootPlugin):
 
         res = self.sf.fetchUrl("https://secure.gravatar.com/" + email_hash + '.' + output,
                                timeout=self.opts['_fetchtimeout'],
-                               useragent=self.opts['_useragent'])
-
-        time.sleep(1)
+                               useragent=self.opts['_useragent'],
+                               rateLimit=1)
 
         if res['content'] is None:
             self.sf.debug('No response from gravatar.com')
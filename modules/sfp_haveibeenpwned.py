@@ -10,7 +10,6 @@
 #-------------------------------------------------------------------------------
 
 import json
-import time
 from sflib import SpiderFoot, SpiderFootPlugin, SpiderFootEvent
 
 class sfp_haveibeenpwned(SpiderFootPlugin):
@@ -19,12 +18,14 @@ class sfp_haveibeenpwned(SpiderFootPlugin):
 
     # Default options
     opts = { 
-        "api_key": ""
+        "api_key": "",
+        "apicache": 0
     }
 
     # Option descriptions
     optdescs = {
-        "api_key": "HaveIBeenPwned.com API key."
+        "api_key": "HaveIBeenPwned.com API key.",
+        "apicache": "Hours to re-use API responses for, in this and later scans, instead of querying the API again, including for accounts not found in any breach. 0 = always query the API."
     }
 
     # Be sure to completely clear any class variables in setup()
@@ -61,32 +62,24 @@ class sfp_haveibeenpwned(SpiderFootPlugin):
 
         url = "https://haveibeenpwned.com/api/v" + v + "/breachedaccount/" + qry
         hdrs = { "Accept": "application/vnd.haveibeenpwned.v" + v + "+json" }
-        retry = 0
 
         if self.opts['api_key']:
             hdrs['hibp-api-key'] = self.opts['api_key']
             
-        while retry < 2:
-            # https://haveibeenpwned.com/API/v2#RateLimiting
-            time.sleep(1.5)
-            res = self.sf.fetchUrl(url, timeout=self.opts['_fetchtimeout'], 
-                                   useragent="SpiderFoot", headers=hdrs)
-
-            if res['code'] == "200":
-                break
-
-            if res['code'] == "404":
-                return None
-
-            if res['code'] == "429":
-                # Back off a little further
-                time.sleep(2)
-            retry += 1
-
-            if res['code'] == "401":
-                self.sf.error("Failed to authenticate key with HaveIBeenPwned.com.", False)
-                self.errorState = True
-                return None
+        # https://haveibeenpwned.com/API/v2#RateLimiting
+        res = self.sf.fetchUrl(url, timeout=self.opts['_fetchtimeout'], 
+                               useragent="SpiderFoot", headers=hdrs,
+                               cacheHrs=self.opts['apicache'], rateLimit=1.5,
+                               retries=2, stopCheck=self.checkForStop,
+                               cacheCodes=["200", "404"])
+
+        if res['code'] == "404":
+            return None
+
+        if res['code'] == "401":
+            self.sf.error("Failed to authenticate key with HaveIBeenPwned.com.", False)
+            self.errorState = True
+            return None
 
         try:
             ret = json.loads(res['content'])
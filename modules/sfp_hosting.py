@@ -11,6 +11,10 @@
 # Licence:     GPL
 # -------------------------------------------------------------------------------
 
+import json
+import heapq
+from array import array
+from bisect import bisect_right
 from netaddr import IPAddress
 from sflib import SpiderFoot, SpiderFootPlugin, SpiderFootEvent
 
@@ -29,10 +33,12 @@ class sfp_hosting(SpiderFootPlugin):
 
     # Target
     results = None
+    ranges = None
 
     def setup(self, sfc, userOpts=dict()):
         self.sf = sfc
         self.results = self.tempStorage()
+        self.ranges = None
         self.__dataSource__ = "DNS"
 
         for opt in userOpts.keys():
@@ -48,33 +54,99 @@ class sfp_hosting(SpiderFootPlugin):
     def producedEvents(self):
         return ["PROVIDER_HOSTING"]
 
-    def queryAddr(self, qaddr):
-        data = dict()
-        url = "https://raw.githubusercontent.com/client9/ipcat/master/datacenters.csv"
+    # Flatten (start, end, title, url) rows, which may overlap or contain
+    # one another, into sorted and disjoint [start, end, provider] ranges.
+    # Each address goes to the first row in the list covering it, as a
+    # scan through the rows in order would find.
+    def flattenRanges(self, rows):
+        points = sorted(set([row[0] for row in rows] + [row[1] + 1 for row in rows]))
+        byStart = sorted(range(len(rows)), key=lambda i: rows[i][0])
+        # Rows covering the current point, as row numbers; rows that end
+        # before it are only removed once they reach the top.
+        covering = list()
+        flat = list()
+        n = 0
+        for k in range(len(points) - 1):
+            (lo, hi) = (points[k], points[k + 1] - 1)
+            while n < len(byStart) and rows[byStart[n]][0] <= lo:
+                heapq.heappush(covering, byStart[n])
+                n += 1
+            while covering and rows[covering[0]][1] < lo:
+                heapq.heappop(covering)
+            if not covering:
+                continue
 
-        data['content'] = self.sf.cacheGet("sfipcat", 48)
-        if data['content'] is None:
-            data = self.sf.fetchUrl(url, useragent=self.opts['_useragent'])
-            if data['content'] is None:
-                self.sf.error("Unable to fetch " + url, False)
-                return None
+            i = covering[0]
+            if flat and flat[-1][2] == i and flat[-1][1] == lo - 1:
+                flat[-1][1] = hi
             else:
-                self.sf.cachePut("sfipcat", data['content'])
+                flat.append([lo, hi, i])
+
+        return [[lo, hi, [rows[i][2], rows[i][3]]] for (lo, hi, i) in flat]
+
+    # Load the hosting provider IP ranges as (starts, ends, providers), where
+    # starts and ends are arrays of integer addresses of disjoint ranges
+    # sorted by start and providers[i] is the [title, url] of the range at
+    # i. The ranges are cached in that form alongside the raw list so
+    # they're only worked out when the list is fetched.
+    def loadRanges(self):
+        ranges = self.sf.cacheGet("sfipcat_flat", 48)
+        if ranges is not None:
+            try:
+                [starts, ends, providers] = json.loads(ranges)
+                return (array('L', starts), array('L', ends), providers)
+            except BaseException as e:
+                self.sf.debug("Unable to load cached IP ranges: " + str(e))
 
-        for line in data['content'].split('\n'):
+        url = "https://raw.githubusercontent.com/client9/ipcat/master/datacenters.csv"
+        content = self.sf.cacheGetOrPut("sfipcat", 48,
+            lambda: self.sf.fetchUrl(url, useragent=self.opts['_useragent'])['content'])
+        if content is None:
+            self.sf.error("Unable to fetch " + url, False)
+            return None
+
+        rows = list()
+        for line in content.split('\n'):
             if "," not in line:
                 continue
             try:
                 [start,end,title,url] = line.split(",")
+                rows.append((int(IPAddress(start)), int(IPAddress(end)), title, url))
             except BaseException as e:
+                self.sf.debug("Encountered an issue processing an IP range: " + str(e))
                 continue
 
-            try:
-                if IPAddress(qaddr) > IPAddress(start) and IPAddress(qaddr) < IPAddress(end):
-                    return [title, url]
-            except BaseException as e:
-                self.sf.debug("Encountered an issue processing an IP: " + str(e))
-                continue
+        flat = self.flattenRanges(rows)
+        starts = [row[0] for row in flat]
+        ends = [row[1] for row in flat]
+        providers = [row[2] for row in flat]
+        try:
+            ranges = (array('L', starts), array('L', ends), providers)
+        except BaseException as e:
+            self.sf.error("Unable to load IP ranges: " + str(e), False)
+            return None
+
+        self.sf.cachePut("sfipcat_flat", json.dumps([starts, ends, providers]))
+        return ranges
+
+    def queryAddr(self, qaddr):
+        if self.ranges is None:
+            self.ranges = self.loadRanges()
+            if self.ranges is None:
+                return None
+
+        (starts, ends, providers) = self.ranges
+        try:
+            addr = int(IPAddress(qaddr))
+        except BaseException as e:
+            self.sf.debug("Encountered an issue processing an IP: " + str(e))
+            return None
+
+        # The ranges are disjoint, so only the last one starting at or
+        # before the address can hold it
+        i = bisect_right(starts, addr) - 1
+        if i >= 0 and addr <= ends[i]:
+            return providers[i]
 
         return None
 
@@ -79,14 +79,12 @@ class sfp_hostsfilenet(SpiderFootPlugin):
             if id == cid and malchecks[check]['type'] == "list":
                 data = dict()
                 url = malchecks[check]['url']
-                data['content'] = self.sf.cacheGet("sfmal_" + cid, self.opts.get('cacheperiod', 0))
+                data['content'] = self.sf.cacheGetOrPut(
+                    "sfmal_" + cid, self.opts.get('cacheperiod', 0),
+                    lambda: self.sf.fetchUrl(url, timeout=self.opts['_fetchtimeout'], useragent=self.opts['_useragent'])['content'])
                 if data['content'] is None:
-                    data = self.sf.fetchUrl(url, timeout=self.opts['_fetchtimeout'], useragent=self.opts['_useragent'])
-                    if data['content'] is None:
-                        self.sf.error("Unable to fetch " + url, False)
-                        return None
-                    else:
-                        self.sf.cachePut("sfmal_" + cid, data['content'])
+                    self.sf.error("Unable to fetch " + url, False)
+                    return None
 
                 if type(data['content']) != unicode:
                     data['content'] = unicode(data['content'], 'utf-8', errors='replace')
@@ -55,7 +55,8 @@ class sfp_ipinfo(SpiderFootPlugin):
         res = self.sf.fetchUrl("https://ipinfo.io/" + ip + "/json",
                                timeout=self.opts['_fetchtimeout'],
                                useragent=self.opts['_useragent'],
-                               headers=headers)
+                               headers=headers, retries=3,
+                               stopCheck=self.checkForStop)
 
         if res['code'] == "429":
             self.sf.error("You are being rate-limited by ipinfo.io.", False)
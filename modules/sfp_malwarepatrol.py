@@ -53,14 +53,11 @@ class sfp_malwarepatrol(SpiderFootPlugin):
         url = "http://lists.malwarepatrol.net/cgi/getfile?receipt=" + \
               self.opts['api_key'] + "&product=8&list=smoothwall"
 
-        data['content'] = self.sf.cacheGet("sfmalwarepatrol", 72)
+        data['content'] = self.sf.cacheGetOrPut("sfmalwarepatrol", 72,
+            lambda: self.sf.fetchUrl(url, useragent=self.opts['_useragent'])['content'])
         if data['content'] is None:
-            data = self.sf.fetchUrl(url, useragent=self.opts['_useragent'])
-            if data['content'] is None:
-                self.sf.error("Unable to fetch " + url, False)
-                return None
-            else:
-                self.sf.cachePut("sfmalwarepatrol", data['content'])
+            self.sf.error("Unable to fetch " + url, False)
+            return None
 
         for line in data['content'].split('\n'):
             if len(line) < 2 or line.startswith('#'):
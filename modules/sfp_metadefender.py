@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 from sflib import SpiderFoot, SpiderFootPlugin, SpiderFootEvent
 
 class sfp_metadefender(SpiderFootPlugin):
@@ -61,9 +60,9 @@ class sfp_metadefender(SpiderFootPlugin):
         res = self.sf.fetchUrl('https://api.metadefender.com/v4/domain/' + qry,
                                headers=headers,
                                timeout=15,
-                               useragent=self.opts['_useragent'])
-
-        time.sleep(self.opts['delay'])
+                               useragent=self.opts['_useragent'],
+                               rateLimit=self.opts['delay'], retries=3,
+                               stopCheck=self.checkForStop)
 
         return self.parseApiResponse(res)
 
@@ -77,9 +76,9 @@ class sfp_metadefender(SpiderFootPlugin):
         res = self.sf.fetchUrl('https://api.metadefender.com/v4/ip/' + qry,
                                headers=headers,
                                timeout=15,
-                               useragent=self.opts['_useragent'])
-
-        time.sleep(self.opts['delay'])
+                               useragent=self.opts['_useragent'],
+                               rateLimit=self.opts['delay'], retries=3,
+                               stopCheck=self.checkForStop)
 
         return self.parseApiResponse(res)
 
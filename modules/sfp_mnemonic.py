@@ -72,10 +72,9 @@ class sfp_mnemonic(SpiderFootPlugin):
         }
 
         url = 'https://api.mnemonic.no/pdns/v3/' + qry + '?' + urllib.urlencode(params)
-        res = self.sf.fetchUrl(url, timeout=self.opts['timeout'], useragent=self.opts['_useragent'])
-
         # Unauthenticated users are limited to 100 requests per minute, and 1000 requests per day.
-        time.sleep(0.75)
+        res = self.sf.fetchUrl(url, timeout=self.opts['timeout'], useragent=self.opts['_useragent'],
+                               rateLimit=0.75)
 
         if res['content'] is None:
             self.sf.info("No results found for " + qry)
@@ -15,7 +15,6 @@ try:
 except ImportError as e:
     import re
 
-import time
 from sflib import SpiderFoot, SpiderFootPlugin, SpiderFootEvent
 
 class sfp_numpi(SpiderFootPlugin):
@@ -53,9 +52,8 @@ class sfp_numpi(SpiderFootPlugin):
     def query(self, qry):
         res = self.sf.fetchUrl('https://numpi.com/phone-info/' + qry,
                                timeout=self.opts['_fetchtimeout'],
-                               useragent=self.opts['_useragent'])
-
-        time.sleep(1)
+                               useragent=self.opts['_useragent'],
+                               rateLimit=1)
 
         if res['content'] is None:
             self.sf.debug('No response from numpi.com')
@@ -12,7 +12,6 @@
 
 import json
 import urllib
-import time
 from sflib import SpiderFoot, SpiderFootPlugin, SpiderFootEvent
 
 class sfp_numverify(SpiderFootPlugin):
@@ -63,9 +62,8 @@ class sfp_numverify(SpiderFootPlugin):
         # Free API does not support HTTPS for no adequately explained reason
         res = self.sf.fetchUrl("http://apilayer.net/api/validate?" + urllib.urlencode(params),
                                timeout=self.opts['_fetchtimeout'],
-                               useragent=self.opts['_useragent'])
-
-        time.sleep(1)
+                               useragent=self.opts['_useragent'],
+                               rateLimit=1)
 
         if res['content'] is None:
             self.sf.debug('No response from apilayer.net')
@@ -17,7 +17,6 @@ try:
 except ImportError as e:
     import re
 
-import time
 import urllib
 from sflib import SpiderFoot, SpiderFootPlugin, SpiderFootEvent
 
@@ -57,8 +56,10 @@ class sfp_openstreetmap(SpiderFootPlugin):
             'addressdetails': '0'
         }
 
+        # Usage Policy mandates no more than 1 request per second
         res = self.sf.fetchUrl("https://nominatim.openstreetmap.org/search?" + urllib.urlencode(params),
-                               timeout=self.opts['_fetchtimeout'], useragent='SpiderFoot')
+                               timeout=self.opts['_fetchtimeout'], useragent='SpiderFoot',
+                               rateLimit=1)
 
         if res['content'] is None:
             self.sf.info("No location info found for " + qry)
@@ -102,9 +103,6 @@ class sfp_openstreetmap(SpiderFootPlugin):
         # Search for address
         data = self.query(eventData)
 
-        # Usage Policy mandates no more than 1 request per second
-        time.sleep(1)
-
         if data is None:
             self.sf.debug("Found no results for " + eventData)
             return None
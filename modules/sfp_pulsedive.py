@@ -78,9 +78,8 @@ class sfp_pulsedive(SpiderFootPlugin):
         }
 
         url = 'https://pulsedive.com/api/info.php?' + urllib.urlencode(params)
-        res = self.sf.fetchUrl(url, timeout=30, useragent="SpiderFoot")
-
-        time.sleep(self.opts['delay'])
+        res = self.sf.fetchUrl(url, timeout=30, useragent="SpiderFoot",
+                               rateLimit=self.opts['delay'])
 
         if res['code'] == "403":
             self.sf.error("Pulsedive API key seems to have been rejected or you have exceeded usage limits for the month.", False)
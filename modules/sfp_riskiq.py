@@ -24,7 +24,8 @@ class sfp_riskiq(SpiderFootPlugin):
         "api_key_password": "",
         "verify": True,
         "cohostsamedomain": False,
-        'maxcohost': 100
+        'maxcohost': 100,
+        'apicache': 0
     }
 
     # Option descriptions
@@ -33,7 +34,8 @@ class sfp_riskiq(SpiderFootPlugin):
         "api_key_password": "RiskIQ API Key.",
         "verify": "Verify co-hosts are valid by checking if they still resolve to the shared IP.",
         "cohostsamedomain": "Treat co-hosted sites on the same target domain as co-hosting?",
-        'maxcohost': "Stop reporting co-hosted sites after this many are found, as it would likely indicate web hosting."
+        'maxcohost': "Stop reporting co-hosted sites after this many are found, as it would likely indicate web hosting.",
+        'apicache': "Hours to re-use API responses for, in this and later scans, instead of querying the API again. 0 = always query the API."
     }
 
     # Be sure to completely clear any class variables in setup()
@@ -89,7 +91,7 @@ class sfp_riskiq(SpiderFootPlugin):
         # Be more forgiving with the timeout as some queries for subnets can be slow
         res = self.sf.fetchUrl(url , timeout=30, 
                                useragent="SpiderFoot", headers=headers,
-                               postData=post)
+                               postData=post, cacheHrs=self.opts['apicache'])
 
         if res['code'] in [ "400", "429", "500", "403" ]:
             self.sf.error("RiskIQ access seems to have been rejected or you have exceeded usage limits.", False)
@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 from netaddr import IPNetwork
 from sflib import SpiderFoot, SpiderFootPlugin, SpiderFootEvent
 
@@ -105,22 +104,14 @@ class sfp_robtex(SpiderFootPlugin):
             if self.checkForStop():
                 return None
 
-            retry = 0
-            while retry < 2:
-                res = self.sf.fetchUrl("https://freeapi.robtex.com/ipquery/" + ip,
-                                   timeout=self.opts['_fetchtimeout'])
-                if res['code'] == "200":
-                    break
-                if res['code'] == "404":
-                    return None
-                if res['code'] == "429":
-                    # Back off a little further
-                    time.sleep(2)
-                retry += 1
+            res = self.sf.fetchUrl("https://freeapi.robtex.com/ipquery/" + ip,
+                                   timeout=self.opts['_fetchtimeout'], retries=2,
+                                   stopCheck=self.checkForStop)
+            if res['code'] == "404":
+                return None
 
             if res['content'] is None:
                 self.sf.error("Unable to query robtex API.", False)
-                retry += 1
                 continue
 
             try:
@@ -10,7 +10,6 @@
 #-------------------------------------------------------------------------------
 
 import json
-import time
 import urllib
 from sflib import SpiderFoot, SpiderFootPlugin, SpiderFootEvent
 
@@ -64,9 +63,8 @@ class sfp_scylla(SpiderFootPlugin):
         res = self.sf.fetchUrl('https://scylla.sh/search?' + urllib.urlencode(params),
                                headers=headers,
                                timeout=15,
-                               useragent=self.opts['_useragent'])
-
-        time.sleep(self.opts['pause'])
+                               useragent=self.opts['_useragent'],
+                               rateLimit=self.opts['pause'])
 
         if res['code'] != "200":
             self.sf.error("Syclla.sh is having problems.", False)
@@ -11,7 +11,7 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
+import threading
 from sflib import SpiderFoot, SpiderFootPlugin, SpiderFootEvent
 
 class sfp_securitytrails(SpiderFootPlugin):
@@ -22,7 +22,9 @@ class sfp_securitytrails(SpiderFootPlugin):
         "api_key": "",
         "verify": True,
         "cohostsamedomain": False,
-        'maxcohost': 100
+        'maxcohost': 100,
+        'apicache': 0,
+        'maxworkers': 4
     }
 
     # Option descriptions
@@ -30,7 +32,9 @@ class sfp_securitytrails(SpiderFootPlugin):
         "api_key": "SecurityTrails API key.",
         "verify": "Verify co-hosts are valid by checking if they still resolve to the shared IP.",
         "cohostsamedomain": "Treat co-hosted sites on the same target domain as co-hosting?",
-        'maxcohost': "Stop reporting co-hosted sites after this many are found, as it would likely indicate web hosting."
+        'maxcohost': "Stop reporting co-hosted sites after this many are found, as it would likely indicate web hosting.",
+        'apicache': "Hours to re-use API responses for, in this and later scans, instead of querying the API again. 0 = always query the API.",
+        'maxworkers': "Maximum number of events to look up at once, when events are handled on a pool of worker threads."
     }
 
     # Be sure to completely clear any class variables in setup()
@@ -39,11 +43,14 @@ class sfp_securitytrails(SpiderFootPlugin):
     results = None
     errorState = False
     cohostcount = 0
+    # Lookups are independent of each other, so can run concurrently
+    _threadSafe = True
 
     def setup(self, sfc, userOpts=dict()):
         self.sf = sfc
         self.results = self.tempStorage()
         self.cohostcount = 0
+        self.lock = threading.Lock()
 
         # Clear / reset any other class member variables here
         # or you risk them persisting between threads.
@@ -77,9 +84,12 @@ class sfp_securitytrails(SpiderFootPlugin):
             request = '{"filter": { "' + querytype + '": "' + qry + '" } }'
             headers['Content-Type'] = 'application/json'
 
+        # Avoid throttling, allowing about a request a second per worker
+        workers = max(1, self.opts['maxworkers'])
         res = self.sf.fetchUrl(url , timeout=self.opts['_fetchtimeout'], 
                                useragent="SpiderFoot", headers=headers,
-                               postData=request)
+                               postData=request, cacheHrs=self.opts['apicache'],
+                               rateLimit=1.0 / workers, rateBurst=workers)
 
         if res['code'] in [ "400", "429", "500", "403" ]:
             self.sf.error("SecurityTrails API key seems to have been rejected or you have exceeded usage limits for the month.", False)
@@ -96,8 +106,6 @@ class sfp_securitytrails(SpiderFootPlugin):
                 return info.get('subdomains', None)
             if info.get("record_count", 0) > 100:
                 if len(info.get('records', [])) >= 100:
-                    # Avoid throttling
-                    time.sleep(1)
                     if accum:
                         accum.extend(info.get('records'))
                     else:
@@ -130,10 +138,10 @@ class sfp_securitytrails(SpiderFootPlugin):
             return None
 
         # Don't look up stuff twice
-        if eventData in self.results:
-            self.sf.debug("Skipping " + eventData + " as already mapped.")
-            return None
-        else:
+        with self.lock:
+            if eventData in self.results:
+                self.sf.debug("Skipping " + eventData + " as already mapped.")
+                return None
             self.results[eventData] = True
 
         if eventName in [ "IP_ADDRESS", "IPV6_ADDRESS", "NETLBLOCK_OWNER"]:
@@ -166,9 +174,12 @@ class sfp_securitytrails(SpiderFootPlugin):
                                 self.sf.debug("Host " + h + " no longer resolves to our IP.")
                                 continue
                         myres.append(h.lower())
+                        with self.lock:
+                            if self.cohostcount > self.opts['maxcohost']:
+                                continue
+                            self.cohostcount += 1
                         e = SpiderFootEvent("CO_HOSTED_SITE", h, self.__name__, event)
                         self.notifyListeners(e)
-                        self.cohostcount += 1
 
         if eventName in [ "EMAILADDR"]:
             email = eventData
@@ -11,6 +11,7 @@
 # -------------------------------------------------------------------------------
 
 import json
+import threading
 import urllib
 from netaddr import IPNetwork
 from sflib import SpiderFoot, SpiderFootPlugin, SpiderFootEvent
@@ -24,22 +25,29 @@ class sfp_shodan(SpiderFootPlugin):
     opts = {
         'api_key': "",
         'netblocklookup': True,
-        'maxnetblock': 24
+        'maxnetblock': 24,
+        'apicache': 0,
+        'maxworkers': 4
     }
 
     # Option descriptions
     optdescs = {
         "api_key": "SHODAN API Key.",
         'netblocklookup': "Look up all IPs on netblocks deemed to be owned by your target for possible hosts on the same target subdomain/domain?",
-        'maxnetblock': "If looking up owned netblocks, the maximum netblock size to look up all IPs within (CIDR value, 24 = /24, 16 = /16, etc.)"
+        'maxnetblock': "If looking up owned netblocks, the maximum netblock size to look up all IPs within (CIDR value, 24 = /24, 16 = /16, etc.)",
+        'apicache': "Hours to re-use API responses for, in this and later scans, instead of querying the API again. 0 = always query the API.",
+        'maxworkers': "Maximum number of events to look up at once, when events are handled on a pool of worker threads."
     }
 
     results = None
     errorState = False
+    # Lookups are independent of each other, so can run concurrently
+    _threadSafe = True
 
     def setup(self, sfc, userOpts=dict()):
         self.sf = sfc
         self.results = self.tempStorage()
+        self.lock = threading.Lock()
 
         # Clear / reset any other class member variables here
         # or you risk them persisting between threads.
@@ -61,7 +69,8 @@ class sfp_shodan(SpiderFootPlugin):
     def query(self, qry):
         res = self.sf.fetchUrl("https://api.shodan.io/shodan/host/" + qry +
                                "?key=" + self.opts['api_key'],
-                               timeout=self.opts['_fetchtimeout'], useragent="SpiderFoot")
+                               timeout=self.opts['_fetchtimeout'], useragent="SpiderFoot",
+                               cacheHrs=self.opts['apicache'])
         if res['content'] is None:
             self.sf.info("No SHODAN info found for " + qry)
             return None
@@ -77,7 +86,8 @@ class sfp_shodan(SpiderFootPlugin):
     def searchHosts(self, qry):
         res = self.sf.fetchUrl("https://api.shodan.io/shodan/host/search?query=hostname:" + qry +
                                "&key=" + self.opts['api_key'],
-                               timeout=self.opts['_fetchtimeout'], useragent="SpiderFoot")
+                               timeout=self.opts['_fetchtimeout'], useragent="SpiderFoot",
+                               cacheHrs=self.opts['apicache'])
         if res['content'] is None:
             self.sf.info("No SHODAN info found for " + qry)
             return None
@@ -97,7 +107,8 @@ class sfp_shodan(SpiderFootPlugin):
         }
 
         res = self.sf.fetchUrl("https://api.shodan.io/shodan/host/search?" + urllib.urlencode(params),
-                               timeout=self.opts['_fetchtimeout'], useragent="SpiderFoot")
+                               timeout=self.opts['_fetchtimeout'], useragent="SpiderFoot",
+                               cacheHrs=self.opts['apicache'])
         if res['content'] is None:
             self.sf.info("No SHODAN info found for " + qry)
             return None
@@ -127,10 +138,10 @@ class sfp_shodan(SpiderFootPlugin):
             return None
 
         # Don't look up stuff twice
-        if eventData in self.results:
-            self.sf.debug("Skipping " + eventData + " as already mapped.")
-            return None
-        else:
+        with self.lock:
+            if eventData in self.results:
+                self.sf.debug("Skipping " + eventData + " as already mapped.")
+                return None
             self.results[eventData] = True
 
         if eventName == "DOMAIN_NAME":
@@ -175,9 +186,10 @@ class sfp_shodan(SpiderFootPlugin):
 
         qrylist = list()
         if eventName.startswith("NETBLOCK_"):
-            for ipaddr in IPNetwork(eventData):
-                qrylist.append(str(ipaddr))
-                self.results[str(ipaddr)] = True
+            with self.lock:
+                for ipaddr in IPNetwork(eventData):
+                    qrylist.append(str(ipaddr))
+                    self.results[str(ipaddr)] = True
         else:
             qrylist.append(eventData)
 
@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 import urllib
 from sflib import SpiderFoot, SpiderFootPlugin, SpiderFootEvent
 
@@ -67,9 +66,8 @@ class sfp_ssltools(SpiderFootPlugin):
                                postData=urllib.urlencode(params),
                                headers=headers,
                                timeout=self.opts['_fetchtimeout'],
-                               useragent=self.opts['_useragent'])
-
-        time.sleep(1)
+                               useragent=self.opts['_useragent'],
+                               rateLimit=1)
 
         if res['content'] is None:
             self.sf.debug('No response from SSLTools.com')
@@ -98,9 +96,8 @@ class sfp_ssltools(SpiderFootPlugin):
                                postData=urllib.urlencode(params),
                                headers=headers,
                                timeout=self.opts['_fetchtimeout'],
-                               useragent=self.opts['_useragent'])
-
-        time.sleep(1)
+                               useragent=self.opts['_useragent'],
+                               rateLimit=1)
 
         if res['content'] is None:
             self.sf.debug('No response from SSLTools.com')
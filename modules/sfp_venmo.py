@@ -10,7 +10,6 @@
 #-------------------------------------------------------------------------------
 
 import json
-import time
 from sflib import SpiderFoot, SpiderFootPlugin, SpiderFootEvent
 
 class sfp_venmo(SpiderFootPlugin):
@@ -45,9 +44,8 @@ class sfp_venmo(SpiderFootPlugin):
     def query(self, qry):
         res = self.sf.fetchUrl('https://api.venmo.com/v1/users/' + qry,
                                timeout=self.opts['_fetchtimeout'], 
-                               useragent=self.opts['_useragent'])
-
-        time.sleep(1)
+                               useragent=self.opts['_useragent'],
+                               rateLimit=1)
 
         if res['content'] is None:
             self.sf.debug('No response from api.venmo.com')
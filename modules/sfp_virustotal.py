@@ -11,7 +11,6 @@
 # -------------------------------------------------------------------------------
 
 import json
-import time
 from netaddr import IPNetwork
 from sflib import SpiderFoot, SpiderFootPlugin, SpiderFootEvent
 
@@ -30,7 +29,8 @@ class sfp_virustotal(SpiderFootPlugin):
         'netblocklookup': True,
         'maxnetblock': 24,
         'subnetlookup': True,
-        'maxsubnet': 24
+        'maxsubnet': 24,
+        'apicache': 0
     }
 
     # Option descriptions
@@ -43,7 +43,8 @@ class sfp_virustotal(SpiderFootPlugin):
         'maxnetblock': 'If looking up owned netblocks, the maximum netblock size to look up all IPs within (CIDR value, 24 = /24, 16 = /16, etc.)',
         'subnetlookup': 'Look up all IPs on subnets which your target is a part of?',
         'maxsubnet': 'If looking up subnets, the maximum subnet size to look up all the IPs within (CIDR value, 24 = /24, 16 = /16, etc.)',
-        'verify': 'Verify that any hostnames found on the target domain still resolve?'
+        'verify': 'Verify that any hostnames found on the target domain still resolve?',
+        'apicache': 'Hours to re-use API responses for, in this and later scans, instead of querying the API again. 0 = always query the API.'
     }
 
     # Be sure to completely clear any class variables in setup()
@@ -84,12 +85,15 @@ class sfp_virustotal(SpiderFootPlugin):
         else:
             url = "https://www.virustotal.com/vtapi/v2/domain/report?domain=" + qry
 
-        res = self.sf.fetchUrl(url + "&apikey=" + self.opts['api_key'],
-                               timeout=self.opts['_fetchtimeout'], useragent="SpiderFoot")
-
         # Public API is limited to 4 queries per minute
         if self.opts['publicapi']:
-            time.sleep(15)
+            delay = 15
+        else:
+            delay = 0
+
+        res = self.sf.fetchUrl(url + "&apikey=" + self.opts['api_key'],
+                               timeout=self.opts['_fetchtimeout'], useragent="SpiderFoot",
+                               cacheHrs=self.opts['apicache'], rateLimit=delay)
 
         if res['content'] is None:
             self.sf.info("No VirusTotal info found for " + qry)
@@ -12,7 +12,6 @@
 
 import json
 import urllib
-import time
 from sflib import SpiderFoot, SpiderFootPlugin, SpiderFootEvent
 
 class sfp_whatcms(SpiderFootPlugin):
@@ -68,9 +67,8 @@ class sfp_whatcms(SpiderFootPlugin):
 
         res = self.sf.fetchUrl('https://whatcms.org/APIEndpoint/Detect?' + urllib.urlencode(params),
                                timeout=self.opts['timeout'],
-                               useragent=self.opts['_useragent'])
-
-        time.sleep(self.opts['delay'])
+                               useragent=self.opts['_useragent'],
+                               rateLimit=self.opts['delay'])
 
         return self.parseApiResponse(res)
 
@@ -84,9 +82,8 @@ class sfp_whatcms(SpiderFootPlugin):
 
         res = self.sf.fetchUrl('https://whatcms.org/APIEndpoint/Technology?' + urllib.urlencode(params),
                                timeout=self.opts['timeout'],
-                               useragent=self.opts['_useragent'])
-
-        time.sleep(self.opts['delay'])
+                               useragent=self.opts['_useragent'],
+                               rateLimit=self.opts['delay'])
 
         return self.parseApiResponse(res)
 
@@ -117,16 +117,12 @@ class sfp_zoneh(SpiderFootPlugin):
             return None
 
         url = "https://www.zone-h.org/rss/specialdefacements"
-        content = self.sf.cacheGet("sfzoneh", 48)
+        content = self.sf.cacheGetOrPut("sfzoneh", 48,
+            lambda: self.sf.fetchUrl(url, useragent=self.opts['_useragent'])['content'])
         if content is None:
-            data = self.sf.fetchUrl(url, useragent=self.opts['_useragent'])
-            if data['content'] is None:
-                self.sf.error("Unable to fetch " + url, False)
-                self.errorState = True
-                return None
-            else:
-                self.sf.cachePut("sfzoneh", data['content'])
-                content = data['content']
+            self.sf.error("Unable to fetch " + url, False)
+            self.errorState = True
+            return None
 
         ret = self.lookupItem(eventData, content)
         if ret:
@@ -92,6 +92,12 @@ sfConfig = {
     '_socks5pwd': '',
     '_socks6dns': True,
     '_torctlport': 9051,
+    '_eventbus': False,
+    '_eventbusworkers': 10,
+    '_dnscachettl': 300,
+    '_dnscachenegttl': 60,
+    '_cachesize': 500,
+    '_releasesource': 0,
     '__logstdout': False
 }
 
@@ -110,6 +116,12 @@ sfOptdescs = {
     '_socks6dns': "Resolve DNS through the SOCKS proxy? When SOCKS/TOR is used this will always be True when resolving to fetch web content. Otherwise, all other DNS resolution goes to your configured DNS server.",
     '_torctlport': "The port TOR is taking control commands on. This is necessary for SpiderFoot to tell TOR to re-circuit when it suspects anonymity is compromised.",
     '_fatalerrors': "Abort the scan when modules encounter exceptions.",
+    '_eventbus': "Queue events for modules and handle them on a pool of worker threads, rather than one module at a time on the scan thread?",
+    '_eventbusworkers': "Number of worker threads handling queued events, if the above is enabled.",
+    '_dnscachettl': "Number of seconds to re-use the result of resolving a host name or IP address for, at most. Names resolved in bulk are re-used for no longer than the TTL of their DNS records. Set to 0 to always resolve again.",
+    '_dnscachenegttl': "Number of seconds to remember that a host name or IP address did not resolve for. Set to 0 to always try again.",
+    '_cachesize': "Maximum size in MB of the cache of downloaded data such as threat feeds. The least recently used data is removed once it grows beyond this.",
+    '_releasesource': "Once all modules have handled an event, keep only this many bytes of the data it was found in, so large data such as web content can be freed sooner. Reduces memory use on big scans. Set to 0 to keep it all.",
     '_modulesenabled': "Modules enabled for the scan."  # This is a hack to get a description for an option not actually available.
 }
 
@@ -13,6 +13,8 @@
 import sqlite3
 import re
 import time
+import threading
+import Queue
 from sflib import SpiderFoot
 
 # SQLite doesn't support regex queries, so we create
@@ -30,6 +32,21 @@ class SpiderFootDb:
     sf = None
     dbh = None
     conn = None
+    # Serialises writes when the handle is shared between scan threads
+    lock = None
+    # Background writers for scan results and logs, when batching
+    writer = None
+    logWriter = None
+
+    # Queries for storing scan results and log messages
+    resultInsertQry = "INSERT INTO tbl_scan_results \
+        (scan_instance_id, hash, type, generated, confidence, \
+        visibility, risk, module, data, source_event_hash) \
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+    logInsertQry = "INSERT INTO tbl_scan_log \
+        (scan_instance_id, generated, component, type, message) \
+        VALUES (?, ?, ?, ?, ?)"
 
     # Queries for creating the SpiderFoot database
     createSchemaQueries = [
@@ -240,11 +257,17 @@ class SpiderFootDb:
         # connect() will create the database file if it doesn't exist, but
         # at least we can use this opportunity to ensure we have permissions to
         # read and write to such a file.
-        dbh = sqlite3.connect(self.sf.myPath() + "/" + opts['__database'], timeout=10)
+        # The handle may be used by event bus worker threads and the
+        # batch writer threads as well as the thread that created it, and
+        # they all share one cursor, so every method using the cursor or
+        # connection after setup must hold self.lock.
+        dbh = sqlite3.connect(self.sf.myPath() + "/" + opts['__database'], timeout=10,
+                              check_same_thread=False)
         if dbh is None:
             self.sf.fatal("Could not connect to internal database, and couldn't create " + opts['__database'])
         dbh.text_factory = str
 
+        self.lock = threading.RLock()
         self.conn = dbh
         self.dbh = dbh.cursor()
 
@@ -291,7 +314,8 @@ class SpiderFootDb:
 
     # Close the database handle
     def close(self):
-        self.dbh.close()
+        with self.lock:
+            self.dbh.close()
 
     # Search results
     # criteria is search criteria such as:
@@ -337,59 +361,102 @@ class SpiderFootDb:
 
         qry += " ORDER BY c.data"
 
-        try:
-            #print(qry)
-            #print(str(qvars))
-            self.dbh.execute(qry, qvars)
-            return self.dbh.fetchall()
-        except sqlite3.Error as e:
-            self.sf.error("SQL error encountered when fetching search results: " + e.args[0])
+        with self.lock:
+            try:
+                #print(qry)
+                #print(str(qvars))
+                self.dbh.execute(qry, qvars)
+                return self.dbh.fetchall()
+            except sqlite3.Error as e:
+                self.sf.error("SQL error encountered when fetching search results: " + e.args[0])
 
     # Get event types
     def eventTypes(self):
         qry = "SELECT event_descr, event, event_raw, event_type FROM tbl_event_types"
-        try:
-            self.dbh.execute(qry)
-            return self.dbh.fetchall()
-        except sqlite3.Error as e:
-            self.sf.error("SQL error encountered when retreiving event types:" + e.args[0])
+        with self.lock:
+            try:
+                self.dbh.execute(qry)
+                return self.dbh.fetchall()
+            except sqlite3.Error as e:
+                self.sf.error("SQL error encountered when retreiving event types:" + e.args[0])
 
     # Log an event to the database
     def scanLogEvent(self, instanceId, classification, message, component=None):
         if component is None:
             component = "SpiderFoot"
 
-        qry = "INSERT INTO tbl_scan_log \
-            (scan_instance_id, generated, component, type, message) \
-            VALUES (?, ?, ?, ?, ?)"
+        row = (instanceId, time.time() * 1000, component, classification, message)
+
+        # Leave it to the background writer if batching
+        if self.logWriter is not None:
+            self.logWriter.put(row)
+            return True
+
+        return self.scanLogEventMany([row])
+
+    # Run qry for each of rows in a single transaction. While another
+    # connection has the database locked, try again after a growing delay,
+    # up to attempts times. Raises the sqlite3.Error of the last attempt
+    # if it still fails.
+    def executeMany(self, qry, rows, attempts=6):
+        for attempt in range(attempts):
+            with self.lock:
+                try:
+                    self.dbh.executemany(qry, rows)
+                    self.conn.commit()
+                    return
+                except sqlite3.Error as e:
+                    self.conn.rollback()
+                    if "locked" not in e.args[0] or attempt == attempts - 1:
+                        raise
+            time.sleep(0.1 * 2 ** attempt)
+
+    # Log a list of events to the database in a single transaction
+    def scanLogEventMany(self, rows):
         try:
-            self.dbh.execute(qry, (
-                instanceId, time.time() * 1000, component, classification, message
-            ))
-            self.conn.commit()
+            self.executeMany(self.logInsertQry, rows)
         except sqlite3.Error as e:
             if "locked" in e.args[0]:
-                # TODO: Do something smarter here to handle locked databases
                 print("Couldn't log due to locking issue.")
-                #self.sf.fatal("Unable to log event in DB due to lock: " + e.args[0])
             else:
                 print("Couldn't log due to: " + str(e.args[0]))
-                #self.sf.fatal("Unable to log event in DB: " + e.args[0])
 
         return True
 
+    # Have scanLogEvent() queue log messages for a background thread to
+    # write every maxMs milliseconds. Should the queue fill up, or the
+    # database stay locked, messages are dropped rather than holding up
+    # the scan.
+    def scanLogBatchStart(self, maxRows=1000, maxMs=500, maxQueue=10000):
+        if self.logWriter is not None:
+            return
+        self.logWriter = SpiderFootDbWriter(lambda rows: self.executeMany(self.logInsertQry, rows),
+                                            maxRows, maxMs, maxQueue, dropWhenFull=True)
+        self.logWriter.start()
+
+    # Write any queued log messages and go back to writing them as they
+    # are logged. Returns the number of messages that had to be dropped.
+    def scanLogBatchStop(self):
+        if self.logWriter is None:
+            return 0
+        writer = self.logWriter
+        self.logWriter = None
+        writer.stop()
+        return writer.dropped
+
     # Store a scan instance
     def scanInstanceCreate(self, instanceId, scanName, scanTarget):
         qry = "INSERT INTO tbl_scan_instance \
             (guid, name, seed_target, created, status) \
             VALUES (?, ?, ?, ?, ?)"
-        try:
-            self.dbh.execute(qry, (
-                instanceId, scanName, scanTarget, time.time() * 1000, 'CREATED'
-            ))
-            self.conn.commit()
-        except sqlite3.Error as e:
-            self.sf.fatal("Unable to create instance in DB: " + e.args[0])
+        with self.lock:
+            try:
+                self.dbh.execute(qry, (
+                    instanceId, scanName, scanTarget, time.time() * 1000, 'CREATED'
+                ))
+                self.conn.commit()
+            except sqlite3.Error as e:
+                self.sf.fatal("Unable to create instance in DB: " + e.args[0])
 
         return True
 
@@ -415,8 +482,9 @@ class SpiderFootDb:
         qvars.append(instanceId)
 
         try:
-            self.dbh.execute(qry, qvars)
-            self.conn.commit()
+            with self.lock:
+                self.dbh.execute(qry, qvars)
+                self.conn.commit()
         except sqlite3.Error:
             self.sf.fatal("Unable to set information for the scan instance.")
 
@@ -427,11 +495,12 @@ class SpiderFootDb:
             ROUND(started/1000) AS started, ROUND(ended/1000) AS ended, status \
             FROM tbl_scan_instance WHERE guid = ?"
         qvars = [instanceId]
-        try:
-            self.dbh.execute(qry, qvars)
-            return self.dbh.fetchone()
-        except sqlite3.Error as e:
-            self.sf.error("SQL error encountered when retreiving scan instance:" + e.args[0])
+        with self.lock:
+            try:
+                self.dbh.execute(qry, qvars)
+                return self.dbh.fetchone()
+            except sqlite3.Error as e:
+                self.sf.error("SQL error encountered when retreiving scan instance:" + e.args[0])
 
     # Obtain a summary of the results per event type
     def scanResultSummary(self, instanceId, by="type"):
@@ -456,11 +525,12 @@ class SpiderFootDb:
                 GROUP BY r.data, e.event_descr ORDER BY total DESC limit 50"
 
         qvars = [instanceId]
-        try:
-            self.dbh.execute(qry, qvars)
-            return self.dbh.fetchall()
-        except sqlite3.Error as e:
-            self.sf.error("SQL error encountered when fetching result summary: " + e.args[0])
+        with self.lock:
+            try:
+                self.dbh.execute(qry, qvars)
+                return self.dbh.fetchall()
+            except sqlite3.Error as e:
+                self.sf.error("SQL error encountered when fetching result summary: " + e.args[0])
 
     # Obtain the data for a scan and event type
     def scanResultEvent(self, instanceId, eventType='ALL', filterFp=False):
@@ -485,11 +555,12 @@ class SpiderFootDb:
 
         qry += " ORDER BY c.data"
 
-        try:
-            self.dbh.execute(qry, qvars)
-            return self.dbh.fetchall()
-        except sqlite3.Error as e:
-            self.sf.error("SQL error encountered when fetching result events: " + e.args[0])
+        with self.lock:
+            try:
+                self.dbh.execute(qry, qvars)
+                return self.dbh.fetchall()
+            except sqlite3.Error as e:
+                self.sf.error("SQL error encountered when fetching result events: " + e.args[0])
 
     # Obtain a unique list of elements
     def scanResultEventUnique(self, instanceId, eventType='ALL', filterFp=False):
@@ -506,11 +577,12 @@ class SpiderFootDb:
 
         qry += " GROUP BY type, data ORDER BY COUNT(*)"
 
-        try:
-            self.dbh.execute(qry, qvars)
-            return self.dbh.fetchall()
-        except sqlite3.Error as e:
-            self.sf.error("SQL error encountered when fetching unique result events: " + e.args[0])
+        with self.lock:
+            try:
+                self.dbh.execute(qry, qvars)
+                return self.dbh.fetchall()
+            except sqlite3.Error as e:
+                self.sf.error("SQL error encountered when fetching unique result events: " + e.args[0])
 
     # Get scan logs
     def scanLogs(self, instanceId, limit=None, fromRowId=None, reverse=False):
@@ -533,11 +605,12 @@ class SpiderFootDb:
             qry += " LIMIT ?"
             qvars.append(limit)
 
-        try:
-            self.dbh.execute(qry, qvars)
-            return self.dbh.fetchall()
-        except sqlite3.Error as e:
-            self.sf.error("SQL error encountered when fetching scan logs: " + e.args[0])
+        with self.lock:
+            try:
+                self.dbh.execute(qry, qvars)
+                return self.dbh.fetchall()
+            except sqlite3.Error as e:
+                self.sf.error("SQL error encountered when fetching scan logs: " + e.args[0])
 
     # Get scan errors
     def scanErrors(self, instanceId, limit=None):
@@ -550,11 +623,12 @@ class SpiderFootDb:
             qry += " LIMIT ?"
             qvars.append(limit)
 
-        try:
-            self.dbh.execute(qry, qvars)
-            return self.dbh.fetchall()
-        except sqlite3.Error as e:
-            self.sf.error("SQL error encountered when fetching scan errors: " + e.args[0])
+        with self.lock:
+            try:
+                self.dbh.execute(qry, qvars)
+                return self.dbh.fetchall()
+            except sqlite3.Error as e:
+                self.sf.error("SQL error encountered when fetching scan errors: " + e.args[0])
 
     # Delete a scan instance
     def scanInstanceDelete(self, instanceId):
@@ -563,112 +637,119 @@ class SpiderFootDb:
         qry3 = "DELETE FROM tbl_scan_results WHERE scan_instance_id = ?"
         qry4 = "DELETE FROM tbl_scan_log WHERE scan_instance_id = ?"
         qvars = [instanceId]
-        try:
-            self.dbh.execute(qry1, qvars)
-            self.dbh.execute(qry2, qvars)
-            self.dbh.execute(qry3, qvars)
-            self.dbh.execute(qry4, qvars)
-            self.conn.commit()
-        except sqlite3.Error as e:
-            self.sf.error("SQL error encountered when deleting scan: " + e.args[0])
+        with self.lock:
+            try:
+                self.dbh.execute(qry1, qvars)
+                self.dbh.execute(qry2, qvars)
+                self.dbh.execute(qry3, qvars)
+                self.dbh.execute(qry4, qvars)
+                self.conn.commit()
+            except sqlite3.Error as e:
+                self.sf.error("SQL error encountered when deleting scan: " + e.args[0])
 
     # Set the false positive flag for a result
     def scanResultsUpdateFP(self, instanceId, resultHashes, fpFlag):
-        for resultHash in resultHashes:
-            qry = "UPDATE tbl_scan_results SET false_positive = ? WHERE \
-                scan_instance_id = ? AND hash = ?"
-            qvars = [fpFlag, instanceId, resultHash]
-            try:
-                self.dbh.execute(qry, qvars)
-            except sqlite3.Error as e:
-                self.sf.error("SQL error encountered when updating F/P: " + e.args[0], False)
-                return False
+        with self.lock:
+            for resultHash in resultHashes:
+                qry = "UPDATE tbl_scan_results SET false_positive = ? WHERE \
+                    scan_instance_id = ? AND hash = ?"
+                qvars = [fpFlag, instanceId, resultHash]
+                try:
+                    self.dbh.execute(qry, qvars)
+                except sqlite3.Error as e:
+                    self.sf.error("SQL error encountered when updating F/P: " + e.args[0], False)
+                    return False
 
-        self.conn.commit()
-        return True
+            self.conn.commit()
+            return True
 
     # Store the default configuration
     def configSet(self, optMap=dict()):
         qry = "REPLACE INTO tbl_config (scope, opt, val) VALUES (?, ?, ?)"
-        for opt in optMap.keys():
-            # Module option
-            if ":" in opt:
-                parts = opt.split(':')
-                qvals = [parts[0], parts[1], optMap[opt]]
-            else:
-                # Global option
-                qvals = ["GLOBAL", opt, optMap[opt]]
+        with self.lock:
+            for opt in optMap.keys():
+                # Module option
+                if ":" in opt:
+                    parts = opt.split(':')
+                    qvals = [parts[0], parts[1], optMap[opt]]
+                else:
+                    # Global option
+                    qvals = ["GLOBAL", opt, optMap[opt]]
 
-            try:
-                self.dbh.execute(qry, qvals)
-            except sqlite3.Error as e:
-                self.sf.error("SQL error encountered when storing config, aborting: " + e.args[0])
+                try:
+                    self.dbh.execute(qry, qvals)
+                except sqlite3.Error as e:
+                    self.sf.error("SQL error encountered when storing config, aborting: " + e.args[0])
 
-            self.conn.commit()
+                self.conn.commit()
 
     # Retreive the config from the database
     def configGet(self):
         qry = "SELECT scope, opt, val FROM tbl_config"
-        try:
-            retval = dict()
-            self.dbh.execute(qry)
-            for [scope, opt, val] in self.dbh.fetchall():
-                if scope == "GLOBAL":
-                    retval[opt] = val
-                else:
-                    retval[scope + ":" + opt] = val
+        with self.lock:
+            try:
+                retval = dict()
+                self.dbh.execute(qry)
+                for [scope, opt, val] in self.dbh.fetchall():
+                    if scope == "GLOBAL":
+                        retval[opt] = val
+                    else:
+                        retval[scope + ":" + opt] = val
 
-            return retval
-        except sqlite3.Error as e:
-            self.sf.error("SQL error encountered when fetching configuration: " + e.args[0])
+                return retval
+            except sqlite3.Error as e:
+                self.sf.error("SQL error encountered when fetching configuration: " + e.args[0])
 
     # Reset the config to default (clear it from the DB and let the hard-coded
     # settings in the code take effect.)
     def configClear(self):
         qry = "DELETE from tbl_config"
-        try:
-            self.dbh.execute(qry)
-            self.conn.commit()
-        except sqlite3.Error as e:
-            self.sf.error("Unable to clear configuration from the database: " + e.args[0])
+        with self.lock:
+            try:
+                self.dbh.execute(qry)
+                self.conn.commit()
+            except sqlite3.Error as e:
+                self.sf.error("Unable to clear configuration from the database: " + e.args[0])
 
     # Store a configuration value for a scan
     def scanConfigSet(self, id, optMap=dict()):
         qry = "REPLACE INTO tbl_scan_config \
                 (scan_instance_id, component, opt, val) VALUES (?, ?, ?, ?)"
 
-        for opt in optMap.keys():
-            # Module option
-            if ":" in opt:
-                parts = opt.split(':')
-                qvals = [id, parts[0], parts[1], optMap[opt]]
-            else:
-                # Global option
-                qvals = [id, "GLOBAL", opt, optMap[opt]]
+        with self.lock:
+            for opt in optMap.keys():
+                # Module option
+                if ":" in opt:
+                    parts = opt.split(':')
+                    qvals = [id, parts[0], parts[1], optMap[opt]]
+                else:
+                    # Global option
+                    qvals = [id, "GLOBAL", opt, optMap[opt]]
 
-            try:
-                self.dbh.execute(qry, qvals)
-            except sqlite3.Error as e:
-                self.sf.error("SQL error encountered when storing config, aborting: " + e.args[0])
+                try:
+                    self.dbh.execute(qry, qvals)
+                except sqlite3.Error as e:
+                    self.sf.error("SQL error encountered when storing config, aborting: " + e.args[0])
 
-            self.conn.commit()
+                self.conn.commit()
 
     # Retreive configuration data for a scan component
     def scanConfigGet(self, instanceId):
         qry = "SELECT component, opt, val FROM tbl_scan_config \
                 WHERE scan_instance_id = ? ORDER BY component, opt"
         qvars = [instanceId]
-        try:
-            retval = dict()
-            self.dbh.execute(qry, qvars)
-            for [component, opt, val] in self.dbh.fetchall():
-                if component == "GLOBAL":
-                    retval[opt] = val
-                else:
-                    retval[component + ":" + opt] = val
-            return retval
-        except sqlite3.Error as e:
-            self.sf.error("SQL error encountered when fetching configuration: " + e.args[0])
+        with self.lock:
+            try:
+                retval = dict()
+                self.dbh.execute(qry, qvars)
+                for [component, opt, val] in self.dbh.fetchall():
+                    if component == "GLOBAL":
+                        retval[opt] = val
+                    else:
+                        retval[component + ":" + opt] = val
+                return retval
+            except sqlite3.Error as e:
+                self.sf.error("SQL error encountered when fetching configuration: " + e.args[0])
 
     # Store an event
     # eventData is a SpiderFootEvent object with the following variables:
@@ -703,23 +784,53 @@ class SpiderFootDb:
         if sfEvent.sourceEventHash in ["", None]:
             self.sf.fatal("UNABLE TO CREATE RECORD WITH EMPTY SOURCE EVENT HASH!")
 
-        qry = "INSERT INTO tbl_scan_results \
-            (scan_instance_id, hash, type, generated, confidence, \
-            visibility, risk, module, data, source_event_hash) \
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
         qvals = [instanceId, sfEvent.getHash(), sfEvent.eventType, sfEvent.generated,
                  sfEvent.confidence, sfEvent.visibility, sfEvent.risk,
                  sfEvent.module, storeData, sfEvent.sourceEventHash]
 
         #print("STORING: " + str(qvals))
 
+        # Leave it to the background writer if batching
+        if self.writer is not None:
+            self.writer.put(qvals)
+            return None
+
+        self.scanEventStoreMany([qvals])
+
+    # Store a list of scan results in a single transaction. Each row is
+    # the list of values scanEventStore() builds for an event.
+    def scanEventStoreMany(self, rows):
         try:
-            self.dbh.execute(qry, qvals)
-            self.conn.commit()
+            self.executeMany(self.resultInsertQry, rows)
             return None
         except sqlite3.Error as e:
             self.sf.fatal("SQL error encountered when storing event data (" + str(self.dbh) + ": " + e.args[0])
 
+    # Have scanEventStore() queue results for a background thread to
+    # write, committing every maxRows rows or maxMs milliseconds,
+    # whichever comes first. Results that fail to be written are kept
+    # and tried again with later ones.
+    def scanEventBatchStart(self, maxRows=500, maxMs=1000):
+        if self.writer is not None:
+            return
+        self.writer = SpiderFootDbWriter(lambda rows: self.executeMany(self.resultInsertQry, rows),
+                                         maxRows, maxMs, maxRows * 10)
+        self.writer.start()
+
+    # Write any queued results and go back to writing them as they are
+    # stored. Must be called when a scan finishes or is aborted. Returns
+    # the number of results that could not be written, having logged why.
+    def scanEventBatchStop(self):
+        if self.writer is None:
+            return 0
+        writer = self.writer
+        self.writer = None
+        writer.stop()
+        if writer.unwritten > 0:
+            self.sf.error("Unable to store " + str(writer.unwritten) + \
+                          " results: " + str(writer.error), False)
+        return writer.unwritten
+
     # List of all previously run scans
     def scanInstanceList(self):
         # SQLite doesn't support OUTER JOINs, so we need a work-around that
@@ -735,11 +846,12 @@ class SpiderFootDb:
             FROM tbl_scan_instance i  WHERE i.guid NOT IN ( \
             SELECT distinct scan_instance_id FROM tbl_scan_results WHERE type <> 'ROOT') \
             ORDER BY started DESC"
-        try:
-            self.dbh.execute(qry)
-            return self.dbh.fetchall()
-        except sqlite3.Error as e:
-            self.sf.error("SQL error encountered when fetching scan list: " + e.args[0])
+        with self.lock:
+            try:
+                self.dbh.execute(qry)
+                return self.dbh.fetchall()
+            except sqlite3.Error as e:
+                self.sf.error("SQL error encountered when fetching scan list: " + e.args[0])
 
     # History of data from the scan
     def scanResultHistory(self, instanceId):
@@ -747,11 +859,12 @@ class SpiderFootDb:
                 type, COUNT(*) FROM tbl_scan_results \
                 WHERE scan_instance_id = ? GROUP BY hourmin, type"
         qvars = [instanceId]
-        try:
-            self.dbh.execute(qry, qvars)
-            return self.dbh.fetchall()
-        except sqlite3.Error as e:
-            self.sf.error("SQL error encountered when fetching scan history: " + e.args[0])
+        with self.lock:
+            try:
+                self.dbh.execute(qry, qvars)
+                return self.dbh.fetchall()
+            except sqlite3.Error as e:
+                self.sf.error("SQL error encountered when fetching scan history: " + e.args[0])
 
 
     # Get the source IDs, types and data for a set of IDs
@@ -773,11 +886,12 @@ class SpiderFootDb:
             qry = qry + "'" + hashId + "',"
         qry += "'')"
 
-        try:
-            self.dbh.execute(qry, qvars)
-            return self.dbh.fetchall()
-        except sqlite3.Error as e:
-            self.sf.error("SQL error encountered when getting source element IDs: " + e.args[0])
+        with self.lock:
+            try:
+                self.dbh.execute(qry, qvars)
+                return self.dbh.fetchall()
+            except sqlite3.Error as e:
+                self.sf.error("SQL error encountered when getting source element IDs: " + e.args[0])
 
     # Get the child IDs, types and data for a set of IDs
     def scanElementChildrenDirect(self, instanceId, elementIdList):
@@ -798,11 +912,12 @@ class SpiderFootDb:
             qry = qry + "'" + hashId + "',"
         qry += "'')"
 
-        try:
-            self.dbh.execute(qry, qvars)
-            return self.dbh.fetchall()
-        except sqlite3.Error as e:
-            self.sf.error("SQL error encountered when getting child element IDs: " + e.args[0])
+        with self.lock:
+            try:
+                self.dbh.execute(qry, qvars)
+                return self.dbh.fetchall()
+            except sqlite3.Error as e:
+                self.sf.error("SQL error encountered when getting child element IDs: " + e.args[0])
 
     # Get the full set of upstream IDs which are parents to the 
     # supplied set of IDs.
@@ -886,3 +1001,91 @@ class SpiderFootDb:
                 nextIds.append(row[8])
 
         return datamap
+
+
+# Writes rows queued by SpiderFootDb.scanEventStore() or scanLogEvent()
+# in batches, so that each row doesn't cost a commit of its own. store
+# is called with each batch of rows to be written. Should it raise an
+# exception, the batch is dropped if dropWhenFull is set, and otherwise
+# kept and tried again along with later rows after retryMs milliseconds.
+class SpiderFootDbWriter(threading.Thread):
+    def __init__(self, store, maxRows, maxMs, maxQueue, dropWhenFull=False,
+                 retryMs=5000):
+        threading.Thread.__init__(self, name="SF_dbwriter")
+        self.daemon = True
+        self.store = store
+        self.maxRows = max(1, int(maxRows))
+        self.maxWait = max(0, int(maxMs)) / 1000.0
+        self.retryWait = max(0, int(retryMs)) / 1000.0
+        # The queue is bounded, so that a slow disk either holds producers
+        # up or, if dropWhenFull is set, causes rows to be dropped rather
+        # than piling up in memory.
+        self.queue = Queue.Queue(maxQueue)
+        self.dropWhenFull = dropWhenFull
+        self.dropped = 0
+        # Exception from the last failed write, and the number of rows
+        # still not written when the thread exited
+        self.error = None
+        self.unwritten = 0
+
+    # Queue a row for writing
+    def put(self, row):
+        if not self.dropWhenFull:
+            self.queue.put(row)
+            return
+
+        try:
+            self.queue.put_nowait(row)
+        except Queue.Full:
+            self.dropped += 1
+
+    # Write everything queued so far and wait for the thread to exit
+    def stop(self):
+        self.queue.put(None)
+        self.join()
+
+    # Write rows, returning those that still need writing
+    def _write(self, rows):
+        try:
+            self.store(rows)
+            return list()
+        except Exception as e:
+            self.error = e
+            if self.dropWhenFull:
+                self.dropped += len(rows)
+                return list()
+            return rows
+
+    def run(self):
+        rows = list()
+        deadline = None
+
+        while True:
+            try:
+                if rows:
+                    row = self.queue.get(True, max(0, deadline - time.time()))
+                else:
+                    row = self.queue.get()
+            except Queue.Empty:
+                row = False
+
+            if row:
+                if not rows:
+                    deadline = time.time() + self.maxWait
+                rows.append(row)
+                # Once a write has failed, wait out the retry delay even
+                # if more than maxRows rows build up.
+                if (len(rows) < self.maxRows or self.error is not None) and \
+                        time.time() < deadline:
+                    continue
+
+            if rows:
+                rows = self._write(rows)
+                if rows:
+                    deadline = time.time() + self.retryWait
+                else:
+                    self.error = None
+
+            if row is None:
+                self.unwritten = len(rows)
+                return
@@ -14,8 +14,12 @@
 from stem import Signal
 from stem.control import Controller
 import inspect
+import base64
 import hashlib
+import marshal
+import mmap
 import urllib
+import urlparse
 import binascii
 import gzip
 import gexf
@@ -25,19 +29,33 @@ import os
 import random
 import requests
 import socket
+import sqlite3
 import ssl
+import struct
 import sys
 import time
 import netaddr
 import urllib2
+import cookielib
+import email.utils
 import StringIO
+import Queue
 import threading
 import traceback
 import OpenSSL
 import cryptography
 import dns.resolver
+import dns.message
+import dns.name
+import dns.rcode
+import dns.rdatatype
+import dns.reversename
+import errno
+import select
+from bisect import bisect_left, bisect_right
 from datetime import datetime
 from bs4 import BeautifulSoup, SoupStrainer
+from collections import deque, OrderedDict
 from copy import deepcopy, copy
 
 # For hiding the SSL warnings coming from the requests lib
@@ -49,6 +67,11 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 class SpiderFoot:
     dbh = None
     GUID = None
+    # Name of the component (usually a module) log messages are
+    # attributed to. See forComponent().
+    component = None
+    # Cache directories known to exist
+    _cachePaths = set()
     savedsock = socket
     urllib2.savedsock = urllib2.socket
 
@@ -59,6 +82,8 @@ class SpiderFoot:
     def __init__(self, options, handle=None):
         self.handle = handle
         self.opts = deepcopy(options)
+        # Shared with the copies forComponent() makes for a scan's modules
+        self.stats = SpiderFootScanStats()
         # This is ugly but we don't want any fetches to fail - we expect
         # to encounter unverified SSL certs!
         if sys.version_info >= (2, 7, 9):
@@ -67,6 +92,8 @@ class SpiderFoot:
         if self.opts.get('_dnsserver', "") != "":
             res = dns.resolver.Resolver()
             res.nameservers = [self.opts['_dnsserver']]
+            # dnspython caches answers for as long as their TTLs allow
+            res.cache = dns.resolver.LRUCache()
             dns.resolver.override_system_resolver(res)
 
     # Bit of a hack to support SOCKS because of the loading order of
@@ -302,7 +329,18 @@ class SpiderFoot:
         hashStr = "%08X" % int(binascii.crc32(rstr) & 0xffffffff)
         return hashStr
 
+    # Return a handle sharing everything with this one, except that log
+    # messages are attributed to the named component. Modules are given
+    # one of these in setup() so that logging needn't inspect the stack
+    # to work out who is calling.
+    def forComponent(self, component):
+        sf = copy(self)
+        sf.component = component
+        return sf
+
     def _dblog(self, level, message, component=None):
+        if component is None:
+            component = self.component
         #print(str(self.GUID) + ":" + str(level) + ":" + str(message) + ":" + str(component))
         return self.dbh.scanLogEvent(self.GUID, level, message, component)
 
@@ -338,59 +376,38 @@ class SpiderFoot:
         if self.opts.get('__logstdout'):
             print("[*] " + message)
 
-    def info(self, message):
+    # Messages may contain %-style placeholders for args, in which case
+    # they are only formatted once the message is known to be wanted.
+    def info(self, message, *args):
         if not self.opts['__logging']:
             return None
 
-        frm = inspect.stack()[1]
-        mod = inspect.getmodule(frm[0])
-
-        if mod is None:
-            modName = "Unknown"
-        else:
-            if mod.__name__ == "sflib":
-                frm = inspect.stack()[2]
-                mod = inspect.getmodule(frm[0])
-                if mod is None:
-                    modName = "Unknown"
-                else:
-                    modName = mod.__name__
-            else:
-                modName = mod.__name__
+        if args:
+            message = message % args
+        modName = self.component or "SpiderFoot"
 
         if self.dbh is None:
             print('[' + modName + '] ' + message)
         else:
-            self._dblog("INFO", message, modName)
+            self._dblog("INFO", message)
         if self.opts.get('__logstdout'):
             print("[*] " + message)
         return
 
-    def debug(self, message):
+    def debug(self, message, *args):
         if not self.opts['_debug']:
             return
         if not self.opts['__logging']:
             return None
-        frm = inspect.stack()[1]
-        mod = inspect.getmodule(frm[0])
 
-        if mod is None:
-            modName = "Unknown"
-        else:
-            if mod.__name__ == "sflib":
-                frm = inspect.stack()[2]
-                mod = inspect.getmodule(frm[0])
-                if mod is None:
-                    modName = "Unknown"
-                else:
-                    modName = mod.__name__
-            else:
-                modName = mod.__name__
+        if args:
+            message = message % args
+        modName = self.component or "SpiderFoot"
 
         if self.dbh is None:
             print('[' + modName + '] ' + message)
         else:
-            self._dblog("DEBUG", message, modName)
+            self._dblog("DEBUG", message)
         if self.opts.get('__logstdout'):
             print("[d:" + modName +"] " + message)
         return
@@ -419,43 +436,92 @@ class SpiderFoot:
     # Return the cache path
     def cachePath(self):
         path = self.myPath() + '/cache'
-        if not os.path.isdir(path):
-            os.mkdir(path)
+        if path not in self._cachePaths:
+            if not os.path.isdir(path):
+                os.mkdir(path)
+            self._cachePaths.add(path)
         return path
 
+    def _cache(self):
+        return SpiderFootCache.open(self.cachePath() + "/cache.db",
+                                    self.opts.get('_cachesize', 500) * 1024 * 1024)
+
     # Store data to the cache
     def cachePut(self, label, data):
-        pathLabel = hashlib.sha224(label).hexdigest()
-        cacheFile = self.cachePath() + "/" + pathLabel
-        fp = file(cacheFile, "w")
         if type(data) is list:
-            for line in data:
-                fp.write(line + '\n')
-        else:
+            data = ''.join([line + '\n' for line in data])
+        if type(data) == unicode:
             data = data.encode('utf-8')
-            fp.write(data)
-        fp.close()
+        self._cache().put(label, data)
 
     # Retreive data from the cache
     def cacheGet(self, label, timeoutHrs):
-        pathLabel = hashlib.sha224(label).hexdigest()
-        cacheFile = self.cachePath() + "/" + pathLabel
         try:
-            (m, i, d, n, u, g, sz, atime, mtime, ctime) = os.stat(cacheFile)
+            return self._cache().get(label, timeoutHrs)
+        except BaseException as e:
+            self.debug("Unable to read %s from the cache: %s", label, e)
+            return None
 
-            if sz == 0:
-                return None
+    # Retrieve data from the cache, or if it isn't there, call fill() to
+    # get it and store what it returns unless that's None. When several
+    # threads miss on the same label at once, such as modules in
+    # concurrent scans wanting the same feed, only the first calls fill()
+    # and the rest wait for and return its result.
+    def cacheGetOrPut(self, label, timeoutHrs, fill):
+        data = self.cacheGet(label, timeoutHrs)
+        if data is not None:
+            return data
+
+        def fillAndPut():
+            # It may have been filled while we were waiting to
+            data = self.cacheGet(label, timeoutHrs)
+            if data is not None:
+                return data
+
+            data = fill()
+            if data is not None:
+                self.cachePut(label, data)
+            return data
+
+        return globalCacheFills.do(label, fillAndPut)
+
+    def _feedIndexPath(self, feedId, timeoutHrs, regex):
+        label = u"feedindex_" + feedId + u"_" + unicode(timeoutHrs) + u"_" + unicode(regex)
+        pathLabel = hashlib.sha224(label.encode('utf-8')).hexdigest()
+        return self.cachePath() + "/" + pathLabel
+
+    # Retrieve the index of a threat feed stored by feedIndexPut() less
+    # than timeoutHrs hours ago (or at any time if timeoutHrs is 0), or
+    # None if there isn't one and the feed needs fetching again.
+    def feedIndexGet(self, feedId, timeoutHrs, regex=None):
+        path = self._feedIndexPath(feedId, timeoutHrs, regex)
+        index = globalFeedIndexes.get(path)
+        if index is not None and index.fresh(timeoutHrs):
+            return index
+
+        # Another scan or process may have stored a newer one
+        try:
+            index = SpiderFootFeedIndex.load(path)
+        except BaseException:
+            return None
 
-            if mtime > time.time() - timeoutHrs * 3600 or timeoutHrs == 0:
-                fp = file(cacheFile, "r")
-                fileContents = fp.read()
-                fp.close()
-                fileContents = fileContents.decode('utf-8')
-                return fileContents
-            else:
-                return None
-        except BaseException as e:
+        if not index.fresh(timeoutHrs):
             return None
+        globalFeedIndexes.put(path, index)
+        return index
+
+    # Index the contents of a threat feed and store the index in the cache.
+    # See SpiderFootFeedIndex for how regex is used.
+    def feedIndexPut(self, feedId, timeoutHrs, content, regex=None):
+        path = self._feedIndexPath(feedId, timeoutHrs, regex)
+
+        def build():
+            index = SpiderFootFeedIndex.build(path, content, regex)
+            globalFeedIndexes.put(path, index)
+            return index
+
+        # Only build it once if several threads are indexing the same feed
+        return globalCacheFills.do(path, build)
 
     #
     # Configuration process
@@ -763,16 +829,14 @@ class SpiderFoot:
     # Obtain the domain name for a supplied hostname
     # tldList needs to be an array based on the Mozilla public list
     def hostDomain(self, hostname, tldList):
-        ps = PublicSuffixList(tldList)
-        return ps.get_public_suffix(hostname)
+        return globalSuffixLists.getPublicSuffix(hostname, tldList)
 
     # Given a possible hostname, check if it's a domain name
     # By checking whether it rests atop a TLD.
     # e.g. www.example.com = False because tld of hostname is com,
     # and www.example has a . in it.
     def isDomain(self, hostname, tldList):
-        ps = PublicSuffixList(tldList)
-        suffix = ps.get_public_suffix(hostname)
+        suffix = globalSuffixLists.getPublicSuffix(hostname, tldList)
         return hostname == suffix
 
     # Simple way to verify IPv4 addresses.
@@ -913,6 +977,59 @@ class SpiderFoot:
     # General helper functions to automate many common tasks between modules
     #
 
+    # Errors that mean a name or address has no records, as opposed to
+    # the lookup having failed, and so can be cached.
+    _dnsNotFound = {
+        socket.gaierror: [socket.EAI_NONAME, getattr(socket, 'EAI_NODATA', None)],
+        socket.herror: [1, 4]  # HOST_NOT_FOUND, NO_DATA
+    }
+
+    # Key for name in the DNS cache. The configured DNS server is part of
+    # it, as scans using different resolvers may well get different answers.
+    def _dnsCacheKey(self, kind, name):
+        return (kind, self.opts.get('_dnsserver', ''), name.lower())
+
+    # Look key up in the DNS cache, counting the hit or miss for the scan
+    def _dnsCacheGet(self, key):
+        entry = globalDnsCache.get(key)
+        if entry is None:
+            self.stats.add("dnsMisses")
+        else:
+            self.stats.add("dnsHits")
+        return entry
+
+    # Resolve through the scan-wide DNS cache. lookup() is only called
+    # when there's no unexpired answer cached for (kind, name), and what
+    # it returns is cached for _dnscachettl seconds, or for _dnscachenegttl
+    # seconds if the name didn't resolve.
+    def _resolveCached(self, kind, name, lookup):
+        ttl = self.opts.get('_dnscachettl', 300)
+        if ttl <= 0:
+            return lookup()
+
+        key = self._dnsCacheKey(kind, name)
+        entry = self._dnsCacheGet(key)
+        if entry is not None:
+            if entry[1] is None:
+                return None
+            return list(entry[1])
+
+        negttl = self.opts.get('_dnscachenegttl', 60)
+        try:
+            addrs = lookup()
+        except (socket.gaierror, socket.herror) as e:
+            if negttl > 0 and len(e.args) > 0 and e.args[0] in self._dnsNotFound.get(type(e), []):
+                globalDnsCache.put(key, None, negttl)
+            raise
+
+        if addrs is None:
+            if negttl > 0:
+                globalDnsCache.put(key, None, negttl)
+            return None
+
+        globalDnsCache.put(key, tuple(addrs), ttl)
+        return list(addrs)
+
     # Return a normalised resolution or None if not resolved.
     def resolveHost(self, host):
         try:
@@ -922,43 +1039,163 @@ class SpiderFoot:
             else:
                 host = host.encode("idna")
 
-            addrs = self.normalizeDNS(socket.gethostbyname_ex(host))
-            if len(addrs) > 0:
-                return list(set(addrs))
-            return None
+            def lookup():
+                addrs = self.normalizeDNS(socket.gethostbyname_ex(host))
+                if len(addrs) > 0:
+                    return list(set(addrs))
+                return None
+
+            return self._resolveCached("A", host, lookup)
         except BaseException as e:
-            self.debug("Unable to resolve " + host + ": " + str(e))
+            self.debug("Unable to resolve %s: %s", host, e)
             return None
 
     # Return a normalised resolution of an IPv4 address or None if not resolved.
     def resolveIP(self, ipaddr):
-        self.debug("Performing reverse-resolve of " + ipaddr)
+        self.debug("Performing reverse-resolve of %s", ipaddr)
 
         try:
-            addrs = self.normalizeDNS(socket.gethostbyaddr(ipaddr))
-            if len(addrs) > 0:
-                return list(set(addrs))
-            return None
+            def lookup():
+                addrs = self.normalizeDNS(socket.gethostbyaddr(ipaddr))
+                if len(addrs) > 0:
+                    return list(set(addrs))
+                return None
+
+            return self._resolveCached("PTR", ipaddr, lookup)
         except BaseException as e:
-            self.debug("Unable to resolve " + ipaddr + " (" + str(e) + ")")
+            self.debug("Unable to resolve %s (%s)", ipaddr, e)
             return None
 
     # Return a normalised resolution of an IPv6 address or None if not resolved.
     def resolveHost6(self, hostname):
         try:
-            addrs = list()
-            res = socket.getaddrinfo(hostname, None, socket.AF_INET6)
-            for addr in res:
-                if addr[4][0] not in addrs:
-                    addrs.append(addr[4][0])
-            if len(addrs) < 1:
+            def lookup():
+                addrs = list()
+                res = socket.getaddrinfo(hostname, None, socket.AF_INET6)
+                for addr in res:
+                    if addr[4][0] not in addrs:
+                        addrs.append(addr[4][0])
+                if len(addrs) < 1:
+                    return None
+                return list(set(addrs))
+
+            addrs = self._resolveCached("AAAA", hostname, lookup)
+            if addrs is None:
                 return None
-            self.debug("Resolved " + hostname + " to IPv6: " + str(addrs))
-            return list(set(addrs))
+            self.debug("Resolved %s to IPv6: %s", hostname, addrs)
+            return addrs
         except BaseException as e:
-            self.debug("Unable to IPv6 resolve " + hostname + " (" + str(e) + ")")
+            self.debug("Unable to IPv6 resolve %s (%s)", hostname, e)
             return None
 
+    # The DNS servers to send queries to directly, or an empty list if
+    # they can't be determined.
+    def _bulkNameservers(self):
+        if self.opts.get('_dnsserver', "") != "":
+            return [self.opts['_dnsserver']]
+
+        try:
+            return dns.resolver.get_default_resolver().nameservers
+        except BaseException as e:
+            self.debug("Unable to determine DNS servers for bulk resolution: %s", e)
+            return list()
+
+    # Resolve many host names at once, returning a dict of the names that
+    # resolved to a list of their addresses. Rather than resolving each name
+    # in turn, queries go straight to the DNS server(s) with many in flight
+    # at once. stopCheck, if supplied, is called periodically and resolution
+    # ends early if it returns True.
+    def resolveHostsBulk(self, hostList, rate=500, retries=2, maxInFlight=1000,
+                         timeout=2, stopCheck=None):
+        nameservers = self._bulkNameservers()
+
+        # Without any servers to query, resolve through the system one at a time
+        if len(nameservers) == 0:
+            ret = dict()
+            for host in hostList:
+                if stopCheck and stopCheck():
+                    break
+                addrs = self.resolveHost(host)
+                if addrs:
+                    ret[host] = addrs
+            return ret
+
+        # Answers are cached in the form resolveHost() returns, which
+        # includes the name itself and any aliases, for no longer than
+        # their records' TTL.
+        ttl = self.opts.get('_dnscachettl', 300)
+        negttl = self.opts.get('_dnscachenegttl', 60)
+        resolver = SpiderFootDnsBulkResolver(nameservers, rate, retries,
+                                             maxInFlight, timeout)
+        ret = dict()
+        for (host, addrs, aliases, rrttl) in resolver.iterate(hostList, "A", stopCheck,
+                                                              aliases=True, ttls=True):
+            if addrs:
+                ret[host] = addrs
+
+            if ttl <= 0:
+                continue
+            if type(host) == unicode:
+                name = host.encode("idna")
+            else:
+                name = host
+            key = self._dnsCacheKey("A", name)
+            if addrs:
+                globalDnsCache.put(key, tuple(self.normalizeDNS([name, aliases, addrs])),
+                                   min(rrttl, ttl))
+            elif negttl > 0:
+                globalDnsCache.put(key, None, negttl)
+
+        if resolver.unanswered > 0:
+            self.debug("%d host names went unanswered after %d retries", resolver.unanswered, retries)
+        return ret
+
+    # Reverse-resolve many IPv4 addresses at once, yielding (address, names)
+    # for each address with PTR records as the answers arrive, in no
+    # particular order. Answers are also cached for later resolveIP() calls,
+    # for no longer than their records' TTL.
+    def resolveIPsBulk(self, ipList, rate=500, retries=2, maxInFlight=1000,
+                       timeout=2, stopCheck=None):
+        nameservers = self._bulkNameservers()
+
+        if len(nameservers) == 0:
+            for ipaddr in ipList:
+                if stopCheck and stopCheck():
+                    return
+                names = self.resolveIP(ipaddr)
+                if names:
+                    yield (ipaddr, names)
+            return
+
+        ptrNames = dict()
+        for ipaddr in ipList:
+            try:
+                ptrNames[dns.reversename.from_address(ipaddr).to_text()] = ipaddr
+            except BaseException as e:
+                self.debug("Unable to reverse-resolve %s (%s)", ipaddr, e)
+
+        ttl = self.opts.get('_dnscachettl', 300)
+        negttl = self.opts.get('_dnscachenegttl', 60)
+        resolver = SpiderFootDnsBulkResolver(nameservers, rate, retries,
+                                             maxInFlight, timeout)
+        for (ptr, names, rrttl) in resolver.iterate(ptrNames.keys(), "PTR", stopCheck,
+                                                    ttls=True):
+            ipaddr = ptrNames[ptr]
+            if not names:
+                if ttl > 0 and negttl > 0:
+                    globalDnsCache.put(self._dnsCacheKey("PTR", ipaddr), None, negttl)
+                continue
+
+            # Cached in the form resolveIP() returns, which includes the address
+            names = [unicode(name, 'utf-8', errors='replace') for name in names]
+            if ttl > 0:
+                globalDnsCache.put(self._dnsCacheKey("PTR", ipaddr),
+                                   tuple(set(names + [unicode(ipaddr)])), min(rrttl, ttl))
+            yield (ipaddr, names)
+
+        if resolver.unanswered > 0:
+            self.debug("%d addresses went unanswered after %d retries", resolver.unanswered, retries)
+
     # Verify a host resolves to a given IP
     def validateIP(self, host, ip):
         addrs = self.resolveHost(host)
@@ -987,24 +1224,30 @@ class SpiderFoot:
             if r:
                 ret.extend(r)
         if t == "NETBLOCK_OWNER":
+            ipList = list()
             for addr in netaddr.IPNetwork(v):
                 ipaddr = str(addr)
                 if ipaddr.split(".")[3] in ['255', '0']:
                     continue
                 if '255' in ipaddr.split("."):
                     continue
-                ret.append(ipaddr)
-
-                # Add the reverse-resolved hostnames as aliases too..
-                names = self.resolveIP(ipaddr)
-                if names:
-                    if validateReverse:
-                        for host in names:
-                            chk = self.resolveHost(host)
-                            if ipaddr in chk:
-                                ret.append(host)
-                    else:
-                        ret.extend(names)
+                ipList.append(ipaddr)
+            ret.extend(ipList)
+
+            # Add the reverse-resolved hostnames as aliases too..
+            reverse = dict(self.resolveIPsBulk(ipList))
+            if validateReverse:
+                hosts = set()
+                for names in reverse.values():
+                    hosts.update(names)
+                forward = self.resolveHostsBulk(list(hosts))
+                for ipaddr in reverse:
+                    for host in reverse[ipaddr]:
+                        if ipaddr in forward.get(host, []):
+                            ret.append(host)
+            else:
+                for names in reverse.values():
+                    ret.extend(names)
         if len(ret) > 0:
             return list(set(ret))
         return None
@@ -1291,16 +1534,16 @@ class SpiderFoot:
             # URL found in Javascript code (character is part of some logic)
             if link[len(link) - 1] == '.' or link[0] == '+' or \
                             'javascript:' in linkl or '()' in link:
-                self.debug('unlikely link: ' + link)
+                self.debug('unlikely link: %s', link)
                 continue
             # Filter in-page links
             if re.match('.*#.[^/]+', link):
-                self.debug('in-page link: ' + link)
+                self.debug('in-page link: %s', link)
                 continue
 
             # Ignore mail links
             if 'mailto:' in linkl:
-                self.debug("Ignoring mail link: " + link)
+                self.debug("Ignoring mail link: %s", link)
                 continue
 
             # URL decode links
@@ -1337,22 +1580,8 @@ class SpiderFoot:
     def urlEncodeUnicode(self, url):
         return re.sub('[\x80-\xFF]', lambda c: '%%%02x' % ord(c.group(0)), url)
 
-    # Fetch a URL, return the response object
-    def fetchUrl(self, url, fatal=False, cookies=None, timeout=30,
-                 useragent="SpiderFoot", headers=None, noLog=False,
-                 postData=None, dontMangle=False, sizeLimit=None,
-                 headOnly=False, verify=False):
-        result = {
-            'code': None,
-            'status': None,
-            'content': None,
-            'headers': None,
-            'realurl': url
-        }
-
-        if url is None:
-            return None
-
+    # Work out the proxies to fetch a URL through, if any
+    def _fetchProxies(self, url):
         proxies = dict()
         if self.opts['_socks1type']:
             neverProxyNames = [ self.opts['_socks2addr'] ]
@@ -1378,63 +1607,336 @@ class SpiderFoot:
                     proxy = False
 
             if proxy:
-                self.debug("Using proxy for " + host)
-                self.debug("Proxy set to " + self.opts['_socks2addr'] + ":" + str(self.opts['_socks3port']))
+                self.debug("Using proxy for %s", host)
+                self.debug("Proxy set to %s:%s", self.opts['_socks2addr'], self.opts['_socks3port'])
                 proxies = {
                     'http': 'socks5h://' + self.opts['_socks2addr'] + ":" + str(self.opts['_socks3port']),
                     'https': 'socks5h://' + self.opts['_socks2addr'] + ":" + str(self.opts['_socks3port'])
                 }
             else:
-                self.debug("Not using proxy for " + host)
+                self.debug("Not using proxy for %s", host)
 
-        try:
-            header = dict()
-            btime = time.time()
-            if type(useragent) is list:
-                header['User-Agent'] = random.SystemRandom().choice(useragent)
+        return proxies
+
+    # Build the headers to send with a request
+    def _fetchHeaders(self, useragent, headers):
+        header = dict()
+        if type(useragent) is list:
+            header['User-Agent'] = random.SystemRandom().choice(useragent)
+        else:
+            header['User-Agent'] = useragent
+
+        # Add custom headers
+        if headers is not None:
+            for k in headers.keys():
+                if type(headers[k]) != unicode:
+                    header[k] = unicode(headers[k], 'utf-8', errors='replace')
+                else:
+                    header[k] = headers[k]
+
+        return header
+
+    # Return a response's headers as a dictionary of lowercase, unicode
+    # header names to unicode values
+    def _responseHeaders(self, res):
+        ret = dict()
+        for h in res.headers:
+            if type(h) != unicode:
+                hu = unicode(h, 'utf-8', errors='replace')
+            else:
+                hu = h
+            v = res.headers.get(h)
+            if type(v) != unicode:
+                vu = unicode(v, 'utf-8', errors='replace')
             else:
-                header['User-Agent'] = useragent
+                vu = v
+            ret[hu.lower()] = vu
+        return ret
 
-            # Add custom headers
-            if headers is not None:
-                for k in headers.keys():
-                    if type(headers[k]) != unicode:
-                        header[k] = unicode(headers[k], 'utf-8', errors='replace')
-                    else:
-                        header[k] = headers[k]
+    # Read the body of a streamed response, giving up and returning None
+    # as soon as it turns out to be bigger than sizeLimit bytes. The limit
+    # applies to the body after decompression.
+    def _readLimited(self, res, sizeLimit):
+        try:
+            if int(res.headers.get('content-length', 0)) > sizeLimit:
+                return None
+        except ValueError:
+            pass
+
+        chunks = list()
+        size = 0
+        for chunk in res.iter_content(65536):
+            size += len(chunk)
+            if size > sizeLimit:
+                return None
+            chunks.append(chunk)
+        return ''.join(chunks)
+
+    # Query string and POST body parameters carrying credentials, which
+    # are left out when working out the cache label of an API response.
+    # Only names that are never used for anything else belong here, as
+    # requests that differ only in these parameters share a label.
+    _fetchCacheSecrets = frozenset(['key', 'apikey', 'api_key', 'api-key',
+                                    'token', 'access_token', 'secret',
+                                    'password', 'passwd'])
+
+    # Drop credential parameters from a list of (name, value) pairs
+    def _fetchCacheParams(self, params):
+        return sorted([(k, v) for k, v in params
+                       if k.lower() not in self._fetchCacheSecrets])
+
+    # Cache label for the response to a request, made from the URL with
+    # the scheme and host in lower case, any user info and credential
+    # parameters removed and the query parameters sorted, plus the POST
+    # body treated the same way. Request headers are not part of it, so
+    # that responses are shared between API keys.
+    def _fetchCacheLabel(self, url, postData):
+        parts = urlparse.urlsplit(url)
+        netloc = (parts.hostname or "").lower()
+        if parts.port:
+            netloc += ":" + str(parts.port)
+        query = self._fetchCacheParams(urlparse.parse_qsl(parts.query, True))
+        norm = urlparse.urlunsplit((parts.scheme.lower(), netloc, parts.path or "/",
+                                    urllib.urlencode(query), ""))
+
+        body = ""
+        if type(postData) == dict:
+            body = urllib.urlencode(self._fetchCacheParams(postData.items()))
+        elif postData:
+            if type(postData) == unicode:
+                postData = postData.encode('utf-8')
+            try:
+                data = json.loads(postData)
+                if type(data) == dict:
+                    data = dict(self._fetchCacheParams(data.items()))
+                body = json.dumps(data, sort_keys=True)
+            except ValueError:
+                body = postData
+
+        if type(norm) == unicode:
+            norm = norm.encode('utf-8')
+        return "fetch_" + hashlib.sha256(norm + "\n" + body).hexdigest()
+
+    # Return a fetchUrl() result from the cache, or None if there is no
+    # usable entry. Cached results have 'cached' set to True.
+    def _fetchCacheGet(self, label, cacheHrs, dontMangle):
+        data = self.cacheGet(label, cacheHrs)
+        if not data:
+            return None
+
+        try:
+            entry = json.loads(data)
+            content = base64.b64decode(entry['content'])
+        except Exception as e:
+            self.debug("Ignoring unreadable cached response: " + str(e))
+            return None
+
+        if not dontMangle:
+            content = unicode(content, 'utf-8', errors='replace')
+        return {
+            'code': entry['code'],
+            'status': None,
+            'content': content,
+            'headers': entry['headers'],
+            'realurl': entry['realurl'],
+            'cached': True
+        }
 
-            if sizeLimit or headOnly:
+    # HTTP response codes of fetchUrl() results cached unless the caller
+    # asks for others
+    _fetchCacheCodes = ["200"]
+
+    # Store a fetchUrl() result in the cache, if its response code is one
+    # of cacheCodes.
+    def _fetchCachePut(self, label, result, cacheCodes):
+        if result['code'] not in cacheCodes or result['content'] is None:
+            return
+
+        content = result['content']
+        if type(content) == unicode:
+            content = content.encode('utf-8')
+        self.cachePut(label, json.dumps({
+            'code': result['code'],
+            'headers': result['headers'],
+            'realurl': result['realurl'],
+            'content': base64.b64encode(content)
+        }))
+
+    # HTTP response codes for which a request is worth retrying, as the
+    # server may well answer it if asked again a little later
+    _fetchRetryCodes = ["429", "500", "502", "503", "504"]
+
+    # HTTP response codes meaning the server wants fewer requests
+    _fetchThrottleCodes = ["429", "503"]
+
+    # Longest time to wait before retrying a request, in seconds
+    _fetchRetryMaxWait = 60
+
+    # Seconds a fetchUrl() result's Retry-After header asks to wait for,
+    # whether given as a number of seconds or a date, or None if there
+    # isn't one.
+    def _retryAfter(self, result):
+        value = (result['headers'] or {}).get('retry-after')
+        if not value:
+            return None
+
+        value = value.strip()
+        if value.isdigit():
+            return int(value)
+
+        date = email.utils.parsedate_tz(value)
+        if date is None:
+            return None
+        return max(0, email.utils.mktime_tz(date) - time.time())
+
+    # Whether a request to host that failed with exception x is worth
+    # retrying, which is only if connecting failed or the connection broke
+    # off while reading the response. Timeouts aren't retried, and nor are
+    # failures to resolve host, which requests doesn't tell apart from
+    # other connection errors, so host is looked up to check.
+    def _fetchRetryable(self, x, host):
+        if isinstance(x, (requests.exceptions.Timeout, requests.exceptions.SSLError)):
+            return False
+        if isinstance(x, requests.exceptions.ChunkedEncodingError):
+            return True
+        if not isinstance(x, requests.exceptions.ConnectionError):
+            return False
+        if self.validIP(host) or self.validIP6(host):
+            return True
+        return self.resolveHost(host) is not None
+
+    # Seconds to wait before retrying a request that got the given
+    # fetchUrl() result, or None if it shouldn't be retried. Requests
+    # that failed with a retryable error (see _fetchRetryable()) or got
+    # one of the codes in _fetchRetryCodes are retried, honouring any
+    # Retry-After header unless it asks for longer than _fetchRetryMaxWait,
+    # and otherwise after an exponentially growing, jittered delay.
+    def _fetchRetryDelay(self, result, attempt):
+        if result['code'] is None:
+            if not result.get('retryable'):
+                return None
+        elif result['code'] not in self._fetchRetryCodes:
+            return None
+
+        retryAfter = self._retryAfter(result)
+        if retryAfter is not None:
+            if retryAfter > self._fetchRetryMaxWait:
+                return None
+            return retryAfter
+
+        backoff = min(self._fetchRetryMaxWait, 2 ** attempt)
+        return backoff / 2.0 + random.uniform(0, backoff / 2.0)
+
+    # Fetch a URL, return the response object. If cacheHrs is set, a
+    # successful response to the same request from up to cacheHrs hours
+    # ago (in this or an earlier scan) is returned instead of fetching
+    # the URL again. Only 200 responses are cached, unless cacheCodes
+    # lists the codes to cache, e.g. for APIs answering 404 when there
+    # is nothing to report. If rateLimit is set, the request is held back until
+    # at least rateLimit seconds have passed since the last one to the
+    # same host, from any module or scan, though up to rateBurst requests
+    # may be made together after a quiet spell. If retries is set, failed
+    # requests are retried up to that many times (see _fetchRetryDelay()),
+    # and while the server is asking for fewer requests, other requests
+    # to it with rateLimit or retries set are held back too. With fatal
+    # set, a failure is only fatal once there are no retries left, and
+    # no more are made once stopCheck, if given, returns True.
+    def fetchUrl(self, url, fatal=False, cookies=None, timeout=30,
+                 useragent="SpiderFoot", headers=None, noLog=False,
+                 postData=None, dontMangle=False, sizeLimit=None,
+                 headOnly=False, verify=False, cacheHrs=0, rateLimit=0,
+                 rateBurst=1, retries=0, stopCheck=None, cacheCodes=None):
+        if url is None:
+            return None
+
+        cacheLabel = None
+        if cacheHrs > 0 and not headOnly:
+            cacheLabel = self._fetchCacheLabel(url, postData)
+            cached = self._fetchCacheGet(cacheLabel, cacheHrs, dontMangle)
+            if cached is not None:
+                if not noLog:
+                    self.info("Using cached response for: " + url)
+                return cached
+
+        host = (urlparse.urlsplit(url).hostname or "").lower()
+        attempt = 0
+        while True:
+            if rateLimit or retries:
+                waited = globalRateLimiter.acquire(host, rateLimit, rateBurst)
+                if waited > 0:
+                    self.stats.add("rateWaits")
+                    self.stats.add("rateWaited", waited)
+                    self.debug("Waited %.2fs to stay within the request rate for %s", waited, host)
+
+            # Failures are dealt with below when they may be retried
+            result = self._fetchUrl(url, fatal and not retries, cookies,
+                                    timeout, useragent, headers, noLog,
+                                    postData, dontMangle, sizeLimit,
+                                    headOnly, verify, host)
+
+            delay = self._fetchRetryDelay(result, attempt)
+            if delay is None:
+                break
+
+            if result['code'] in self._fetchThrottleCodes:
+                globalRateLimiter.hold(host, delay)
+
+            if attempt >= retries:
+                break
+
+            attempt += 1
+            self.info("Retrying %s in %.1fs after %s (attempt %d of %d)", url, delay,
+                      result['code'] or result['status'], attempt, retries)
+
+            # Throttled hosts are waited on in globalRateLimiter.acquire()
+            if result['code'] in self._fetchThrottleCodes:
+                delay = 0
+            until = time.time() + delay
+            while not (stopCheck and stopCheck()) and time.time() < until:
+                time.sleep(min(1, until - time.time()))
+            if stopCheck and stopCheck():
+                self.debug("Not retrying " + url + " as the scan is stopping")
+                return result
+
+        if fatal and retries and (result['code'] is None or int(result['code']) >= 400):
+            self.fatal('URL could not be fetched (' + (result['code'] or result['status']) + ')')
+
+        if cacheLabel:
+            self._fetchCachePut(cacheLabel, result, cacheCodes or self._fetchCacheCodes)
+        return result
+
+    # Make a single request for fetchUrl()
+    def _fetchUrl(self, url, fatal, cookies, timeout, useragent, headers,
+                  noLog, postData, dontMangle, sizeLimit, headOnly, verify,
+                  host):
+        result = {
+            'code': None,
+            'status': None,
+            'content': None,
+            'headers': None,
+            'realurl': url
+        }
+
+        proxies = self._fetchProxies(url)
+        res = None
+
+        try:
+            btime = time.time()
+            header = self._fetchHeaders(useragent, headers)
+            session = globalSessionPool.getSession(proxies)
+
+            if headOnly:
                 if not noLog:
                     self.info("Fetching (HEAD only): " + url + \
                           " [user-agent: " + header['User-Agent'] + "] [timeout: " + \
                           str(timeout) + "]")
 
-                hdr = requests.head(url, headers=header, proxies=proxies,
+                hdr = session.head(url, headers=header, proxies=proxies,
                                     verify=False, timeout=timeout)
-                size = int(hdr.headers.get('content-length', 0))
                 result['realurl'] = hdr.headers.get('location', url)
                 result['code'] = str(hdr.status_code)
+                return result
 
-                if headOnly:
-                    return result
-
-                if size > sizeLimit:
-                    return result
-
-                if result['realurl'] != url:
-                    if not noLog:
-                       self.info("Fetching (HEAD only): " + url + \
-                              " [user-agent: " + header['User-Agent'] + "] [timeout: " + \
-                              str(timeout) + "]")
-
-                    hdr = requests.head(result['realurl'], headers=header, proxies=proxies,
-                                        verify=False, timeout=timeout)
-                    size = int(hdr.headers.get('content-length', 0))
-                    result['realurl'] = hdr.headers.get('location', result['realurl'])
-                    result['code'] = str(hdr.status_code)
-
-                    if size > sizeLimit:
-                        return result
             if cookies is not None:
                 #req.add_header('cookie', cookies)
                 if not noLog:
@@ -1449,32 +1951,29 @@ class SpiderFoot:
             #
             # MAKE THE REQUEST
             # 
+            # With a size limit, the body is streamed so that reading can
+            # stop as soon as the limit is exceeded.
+            stream = bool(sizeLimit)
             if postData:
-                res = requests.post(url, data=postData, headers=header, proxies=proxies,
-                                    cookies=cookies, timeout=timeout, verify=False)
+                res = session.post(url, data=postData, headers=header, proxies=proxies,
+                                    cookies=cookies, timeout=timeout, verify=False,
+                                    stream=stream)
             else:
-                res = requests.get(url, headers=header, proxies=proxies,
-                                   cookies=cookies, timeout=timeout, verify=False)
-
-            result['headers'] = dict()
-            for h in res.headers:
-                if type(h) != unicode:
-                    hu = unicode(h, 'utf-8', errors='replace')
-                else:
-                    hu = h
-                v = res.headers.get(h)
-                if type(v) != unicode:
-                    vu = unicode(v, 'utf-8', errors='replace')
-                else:
-                    vu = v
-                result['headers'][hu.lower()] = vu
-
-            # Sometimes content exceeds the size limit after decompression
-            if sizeLimit and len(res.content) > sizeLimit:
-                self.debug("Content exceeded size limit, so returning no data just headers")
-                result['realurl'] = res.url
-                result['code'] = str(res.status_code)
-                return result
+                res = session.get(url, headers=header, proxies=proxies,
+                                   cookies=cookies, timeout=timeout, verify=False,
+                                   stream=stream)
+
+            result['headers'] = self._responseHeaders(res)
+
+            if sizeLimit:
+                content = self._readLimited(res, sizeLimit)
+                if content is None:
+                    self.debug("Content exceeded size limit, so returning no data just headers")
+                    result['realurl'] = res.url
+                    result['code'] = str(res.status_code)
+                    return result
+            else:
+                content = res.content
 
             if 'refresh' in result['headers']:
                 try:
@@ -1492,13 +1991,13 @@ class SpiderFoot:
             result['realurl'] = res.url
             result['code'] = str(res.status_code)
             if dontMangle:
-                result['content'] = res.content
+                result['content'] = content
             else:
-                result['content'] = unicode(res.content, 'utf-8', errors='replace')
+                result['content'] = unicode(content, 'utf-8', errors='replace')
             if fatal:
                 res.raise_for_status()
         except requests.exceptions.HTTPError as h:
-            self.fatal('URL could not be fetched (' + str(res.status_code) + ' / ' + res.content + ')')
+            self.fatal('URL could not be fetched (' + str(res.status_code) + ' / ' + result['content'] + ')')
         except Exception as x:
             if not noLog:
                 try:
@@ -1508,26 +2007,107 @@ class SpiderFoot:
                     return result
             result['content'] = None
             result['status'] = str(x)
+            result['retryable'] = self._fetchRetryable(x, host)
             if fatal:
                 self.fatal('URL could not be fetched (' + str(x) + ')')
+        finally:
+            # Streamed responses hold their connection until closed
+            if res is not None:
+                res.close()
 
-        frm = inspect.stack()[1]
-        mod = inspect.getmodule(frm[0])
-        m = mod.__name__
         atime = time.time()
-        t = str(atime - btime)
-        self.info("Fetched data: " + str(len(result['content'] or '')) + " (" + url + "), took " + t + "s")
+        self.info("Fetched data: %d (%s), took %ss", len(result['content'] or ''),
+                  url, atime - btime)
+        return result
+
+    # Fetch a URL without reading the body up front. Returns the same
+    # dictionary as fetchUrl(), except that 'content' is an iterator over
+    # the raw (undecoded) body in byte strings of up to chunkSize bytes,
+    # which ends after sizeLimit bytes if set. Only as much of the body as
+    # is consumed gets downloaded; call close() on the iterator if not
+    # consuming all of it, to free up the connection.
+    def fetchUrlStream(self, url, cookies=None, timeout=30, useragent="SpiderFoot",
+                       headers=None, noLog=False, sizeLimit=None, chunkSize=65536):
+        result = {
+            'code': None,
+            'status': None,
+            'content': None,
+            'headers': None,
+            'realurl': url
+        }
+
+        if url is None:
+            return None
+
+        proxies = self._fetchProxies(url)
+
+        try:
+            header = self._fetchHeaders(useragent, headers)
+            session = globalSessionPool.getSession(proxies)
+
+            if not noLog:
+                self.info("Fetching (streamed): " + url + " [user-agent: " + \
+                          header['User-Agent'] + "] [timeout: " + str(timeout) + "]")
+
+            res = session.get(url, headers=header, proxies=proxies,
+                              cookies=cookies, timeout=timeout, verify=False,
+                              stream=True)
+        except Exception as x:
+            if not noLog:
+                self.error("Unexpected exception (" + str(x) + ") occurred fetching: " + url, False)
+            result['status'] = str(x)
+            return result
+
+        try:
+            result['headers'] = self._responseHeaders(res)
+            result['realurl'] = res.url
+            result['code'] = str(res.status_code)
+            result['content'] = SpiderFootResponseBody(self, res, sizeLimit, chunkSize)
+        except BaseException:
+            res.close()
+            raise
         return result
 
     # Check if wildcard DNS is enabled by looking up a random hostname
     def checkDnsWildcard(self, target):
+        return len(self.dnsWildcardAnswers(target)) > 0
+
+    # Return the set of addresses that random names under target resolve
+    # to, which is empty unless the zone has wildcard DNS. Several random
+    # names are tried and the zone is only taken to have wildcard DNS if
+    # most of them resolve, so that a single odd answer can't decide it.
+    # The result is cached like any other DNS resolution, so modules can
+    # check the same zones as often as they need to.
+    def dnsWildcardAnswers(self, target, probes=3):
+        ttl = self.opts.get('_dnscachettl', 300)
+        key = self._dnsCacheKey("WILDCARD", target)
+        if ttl > 0:
+            entry = self._dnsCacheGet(key)
+            if entry is not None:
+                return entry[1]
+
         randpool = 'bcdfghjklmnpqrstvwxyz3456789'
-        randhost = ''.join([random.SystemRandom().choice(randpool) for x in range(10)])
+        resolved = 0
+        answers = set()
+        for i in range(probes):
+            randhost = ''.join([random.SystemRandom().choice(randpool) for x in range(10)])
+            addrs = self.resolveHost(randhost + "." + target)
+            if addrs is None:
+                continue
+            resolved += 1
+            for addr in addrs:
+                if self.validIP(addr) or self.validIP6(addr):
+                    answers.add(addr)
 
-        if self.resolveHost(randhost + "." + target) is None:
-            return False
+        if resolved * 2 <= probes:
+            answers = frozenset()
+        else:
+            answers = frozenset(answers)
+            self.debug("Wildcard DNS detected on %s, resolving to %s", target, list(answers))
 
-        return True
+        if ttl > 0:
+            globalDnsCache.put(key, answers, ttl)
+        return answers
 
     # Request search results from the Google API. Will return a dict:
     # {
@@ -1642,6 +2222,10 @@ class SpiderFootPlugin(object):
     _stopScanning = False
     # Modules that will be notified when this module produces events
     _listenerModules = list()
+    # Listener modules by the event types they watch, and those watching
+    # all event types. Built by indexListeners().
+    _listenerIndex = None
+    _wildcardListeners = None
     # Current event being processed
     _currentEvent = None
     # Target currently being acted against
@@ -1657,6 +2241,21 @@ class SpiderFootPlugin(object):
     __dataSource__ = None
     # If set, events not matching this list are dropped
     __outputFilter__ = None
+    # If set, events are queued on this bus rather than handed
+    # directly to listeners (see SpiderFootEventBus)
+    _eventBus = None
+    # Set to True by modules whose handleEvent() can safely run on
+    # several threads at once. Calls to all other modules are serialised.
+    _threadSafe = False
+    # Held around handleEvent() for modules that aren't thread-safe. It
+    # is re-entrant, as without an event bus a module handling an event
+    # may be handed another one on the same thread, e.g. when it listens
+    # to its own events.
+    _handlerLock = None
+    # If set, events this module produces let go of their source once
+    # all listeners have handled them, keeping this many bytes of its
+    # data (see SpiderFootEvent.releaseSource())
+    _releaseSource = 0
 
     # Not really needed in most cases.
     def __init__(self):
@@ -1672,7 +2271,10 @@ class SpiderFootPlugin(object):
     # Python seems to cache local variables even between threads.
     def clearListeners(self):
         self._listenerModules = list()
+        self._listenerIndex = None
+        self._wildcardListeners = None
         self._stopScanning = False
+        self._handlerLock = threading.RLock()
 
     # Will always be overriden by the implementer.
     def setup(self, sf, userOpts=dict()):
@@ -1711,17 +2313,56 @@ class SpiderFootPlugin(object):
     # work with.
     def registerListener(self, listener):
         self._listenerModules.append(listener)
+        self._listenerIndex = None
+
+    # Build the lookup of which listeners to notify for each event type,
+    # so notifyListeners() needn't ask every listener what it watches.
+    # Called by the scanner once all listeners are registered, and again
+    # lazily if more are registered afterwards.
+    def indexListeners(self):
+        index = dict()
+        wildcard = list()
+
+        for listener in sorted(self._listenerModules, key=lambda l: l.__name__):
+            watched = listener.watchedEvents()
+            if '*' in watched:
+                wildcard.append(listener)
+                continue
+            for eventName in set(watched):
+                index.setdefault(eventName, list()).append(listener)
+
+        # Every event type also goes to the wildcard listeners, so merge
+        # them in, keeping listeners in name order.
+        for eventName in index:
+            index[eventName] = sorted(index[eventName] + wildcard,
+                                      key=lambda l: l.__name__)
+
+        self._wildcardListeners = wildcard
+        self._listenerIndex = index
 
     def setOutputFilter(self, types):
         self.__outputFilter__ = types
 
+    # Set the event bus notifications are to be queued on. None means
+    # listeners are called directly from within notifyListeners().
+    def setEventBus(self, bus):
+        self._eventBus = bus
+
+    # Have events this module produces release their source event once
+    # all listeners have handled them, keeping maxData bytes of its data.
+    # 0 means events hold on to their source.
+    def setReleaseSource(self, maxData):
+        self._releaseSource = maxData
+
     # For SpiderFoot HX compatability of modules
     def tempStorage(self):
         return dict()
 
     # Call the handleEvent() method of every other plug-in listening for
     # events from this plug-in. Remember that those plug-ins will be called
-    # within the same execution context of this thread, not on their own.
+    # within the same execution context of this thread, not on their own,
+    # unless an event bus has been set, in which case the event is queued
+    # for each listener and handled by the bus' worker threads.
     def notifyListeners(self, sfEvent):
         eventName = sfEvent.eventType
 
@@ -1759,45 +2400,62 @@ class SpiderFootPlugin(object):
         # from dest, as we are already operating on dest's original
         # notification from one of the upstream events.
 
-        prevEvent = sfEvent.sourceEvent
-        while prevEvent is not None:
-            if prevEvent.sourceEvent is not None:
-                if prevEvent.sourceEvent.eventType == sfEvent.eventType and \
-                                prevEvent.sourceEvent.data.lower() == sfEvent.data.lower():
-                    #print("Skipping notification of " + sfEvent.eventType + " / " + sfEvent.data)
-                    storeOnly = True
-                    break
-            prevEvent = prevEvent.sourceEvent
+        # The immediate source is deliberately not considered, only the
+        # events above it, which the source carries in its ancestry.
+        if sfEvent.sourceEvent is not None and \
+                sfEvent.dataKey() in sfEvent.sourceEvent.ancestry:
+            #print("Skipping notification of " + sfEvent.eventType + " / " + sfEvent.data)
+            storeOnly = True
 
-        self._listenerModules.sort()
-        for listener in self._listenerModules:
-            #print(listener.__module__ + ": " + listener.watchedEvents().__str__())
-            if eventName not in listener.watchedEvents() and '*' not in listener.watchedEvents():
-                #print(listener.__module__ + " not listening for " + eventName)
-                continue
+        if self._listenerIndex is None:
+            self.indexListeners()
 
+        listeners = list()
+        for listener in self._listenerIndex.get(eventName, self._wildcardListeners):
             if storeOnly and "__stor" not in listener.__module__:
                 #print("Storing only for " + sfEvent.eventType + " / " + sfEvent.data)
                 continue
+            listeners.append(listener)
 
-            #print("Notifying " + eventName + " to " + listener.__module__)
-            listener._currentEvent = sfEvent
+        if self._eventBus is not None:
+            done = None
+            if self._releaseSource:
+                done = lambda: sfEvent.releaseSource(self._releaseSource)
+            self._eventBus.post(listeners, sfEvent, done)
+            return None
 
+        for listener in listeners:
             # Check if we've been asked to stop in the meantime, so that
             # notifications stop triggering module activity.
             if self.checkForStop():
                 return None
 
-            #print("EVENT: " + str(sfEvent))
-            try:
-                listener.handleEvent(sfEvent)
-            except BaseException as e:
-                f = open("sferror.log", "a")
-                f.write("Module (" + listener.__module__ + ") encountered an error: " + str(e) + "\n")
+            #print("Notifying " + eventName + " to " + listener.__module__)
+            listener.processEvent(sfEvent)
+
+        if self._releaseSource:
+            sfEvent.releaseSource(self._releaseSource)
+
+    # Hand an event to this module's handleEvent(), logging rather than
+    # propagating any exception so one broken module can't take down
+    # the modules that notified it.
+    def processEvent(self, sfEvent):
+        self._currentEvent = sfEvent
+
+        #print("EVENT: " + str(sfEvent))
+        try:
+            if self._threadSafe or self._handlerLock is None:
+                self.handleEvent(sfEvent)
+            else:
+                with self._handlerLock:
+                    self.handleEvent(sfEvent)
+        except BaseException as e:
+            f = open("sferror.log", "a")
+            f.write("Module (" + self.__module__ + ") encountered an error: " + str(e) + "\n")
 
-                exc_type, exc_value, exc_traceback = sys.exc_info()
-                f.write(repr(traceback.format_exception(exc_type, exc_value, exc_traceback)))
-                f.close()
+            exc_type, exc_value, exc_traceback = sys.exc_info()
+            f.write(repr(traceback.format_exception(exc_type, exc_value, exc_traceback)))
+            f.close()
 
     # For modules to use to check for when they should give back control
     def checkForStop(self):
@@ -1846,6 +2504,9 @@ class SpiderFootTarget(object):
     targetValue = None
     targetAliases = list()
 
+    # Marks the end of a name in the _nameTrie
+    _nameEnd = None
+
     def __init__(self, targetValue, typeName):
         if typeName in self._validTypes:
             self.targetType = typeName
@@ -1858,6 +2519,50 @@ class SpiderFootTarget(object):
             print("Internal Error: Invalid target type.")
             sys.exit(-1)
 
+        # Index of the target and its aliases for matches(), kept up to
+        # date by setAlias(): names are held in a set and in a trie of
+        # their labels in reverse order (com -> example -> www), and
+        # addresses as integers, alongside the (first, last) integer
+        # range of a netblock target.
+        self._aliasKeys = set()
+        self._names = list()
+        self._nameSet = set()
+        self._nameTrie = dict()
+        self._addresses = list()
+        self._addressInts = set()
+        self._addressRanges = list()
+
+        if self.targetType == "INTERNET_NAME":
+            self._indexName(self.targetValue.lower())
+        if self.targetType == "IP_ADDRESS":
+            self._indexAddress(self.targetValue)
+        if self.targetType == "NETBLOCK_OWNER":
+            try:
+                net = netaddr.IPNetwork(self.targetValue)
+                if net.version == 4:
+                    self._addressRanges.append((net.first, net.last))
+            except BaseException:
+                pass
+
+    def _indexName(self, name):
+        if name in self._nameSet:
+            return
+        self._names.append(name)
+        self._nameSet.add(name)
+
+        node = self._nameTrie
+        for label in reversed(name.split(".")):
+            node = node.setdefault(label, dict())
+        node[self._nameEnd] = True
+
+    def _indexAddress(self, address):
+        self._addresses.append(address)
+        try:
+            if netaddr.valid_ipv4(address):
+                self._addressInts.add(int(netaddr.IPAddress(address)))
+        except BaseException:
+            pass
+
     def getType(self):
         return self.targetType
 
@@ -1871,36 +2576,30 @@ class SpiderFootTarget(object):
     # Or, if a user searched for an IP address, a module
     # might supply the hostname as an alias.
     def setAlias(self, value, typeName):
-        if {'type': typeName, 'value': value} in self.targetAliases:
+        value = value.lower()
+        if (typeName, value) in self._aliasKeys:
             return None
+        self._aliasKeys.add((typeName, value))
 
         self.targetAliases.append(
-            {'type': typeName, 'value': value.lower()}
+            {'type': typeName, 'value': value}
         )
 
+        if typeName == "INTERNET_NAME":
+            self._indexName(value)
+        if typeName == "IP_ADDRESS":
+            self._indexAddress(value)
+
     def getAliases(self):
         return self.targetAliases
 
-    def _getEquivalents(self, typeName):
-        ret = list()
-        for item in self.targetAliases:
-            if item['type'] == typeName:
-                ret.append(item['value'].lower())
-        return ret
-
     # Get all domains associated with the target
     def getNames(self):
-        e = self._getEquivalents("INTERNET_NAME")
-        if self.targetType == "INTERNET_NAME" and self.targetValue.lower() not in e:
-            e.append(self.targetValue.lower())
-        return e
+        return list(self._names)
 
     # Get all IP Subnets or IP Addresses associated with the target
     def getAddresses(self):
-        e = self._getEquivalents("IP_ADDRESS")
-        if self.targetType == "IP_ADDRESS":
-            e.append(self.targetValue)
-        return e
+        return list(self._addresses)
 
     # Check whether the supplied value is "tightly" related
     # to the original target.
@@ -1930,46 +2629,51 @@ class SpiderFootTarget(object):
             return True
 
         if netaddr.valid_ipv4(value):
+            address = int(netaddr.IPAddress(value))
             # 1.1
-            if value in self.getAddresses():
+            if address in self._addressInts:
                 return True
             # 1.2
-            if self.targetType == "NETBLOCK_OWNER":
-                if netaddr.IPAddress(value) in netaddr.IPNetwork(self.targetValue):
-                    return True
-            if self.targetType == "IP_ADDRESS":
-                if netaddr.IPAddress(value) in \
-                        netaddr.IPNetwork(netaddr.IPAddress(self.targetValue)):
+            for (first, last) in self._addressRanges:
+                if first <= address <= last:
                     return True
         else:
-            for name in self.getNames():
-                # 2.1
-                if value == name:
-                    return True
-                # 2.2
-                if includeParents and name.endswith("." + value):
-                    return True
-                # 2.3
-                if includeChildren and value.endswith("." + name):
+            # 2.1
+            if value in self._nameSet:
+                return True
+
+            if not includeParents and not includeChildren:
+                return None
+
+            node = self._nameTrie
+            labels = value.split(".")
+            for i in range(len(labels) - 1, -1, -1):
+                node = node.get(labels[i])
+                if node is None:
+                    return None
+                # 2.3, a name ends here and value has more labels
+                if includeChildren and i > 0 and self._nameEnd in node:
                     return True
 
+            # 2.2, names continue on from value
+            if includeParents and len(node) > (self._nameEnd in node):
+                return True
+
         return None
 
 
 # Class for SpiderFoot Events
 class SpiderFootEvent(object):
-    generated = None
-    eventType = None
-    confidence = None
-    visibility = None
-    risk = None
-    module = None
-    data = None
-    sourceEvent = None
-    sourceEventHash = None
-    moduleDataSource = None
-    actualSource = None
-    __id = None
+    # Scans can hold hundreds of thousands of events, so keep them
+    # free of a per-instance __dict__.
+    __slots__ = ('generated', 'eventType', 'confidence', 'visibility', 'risk',
+                 'module', 'data', 'sourceEvent', 'sourceEventHash',
+                 'moduleDataSource', 'actualSource', 'ancestry',
+                 '__hash', '__dataKey', '__detached')
+
+    # Guards the lazily created hash and detached copy, as event bus
+    # workers may ask for them on the same event at the same time.
+    _lock = threading.Lock()
 
     def __init__(self, eventType, data, module, sourceEvent,
                  confidence=100, visibility=100, risk=0):
@@ -1980,6 +2684,11 @@ class SpiderFootEvent(object):
         self.risk = risk
         self.module = module
         self.sourceEvent = sourceEvent
+        self.moduleDataSource = None
+        self.actualSource = None
+        self.__hash = None
+        self.__dataKey = None
+        self.__detached = None
 
         if type(data) in [ list, dict ]:
             print("FATAL: Only string events are accepted, not lists or dicts.")
@@ -1992,15 +2701,22 @@ class SpiderFootEvent(object):
         else:
             self.data = data
 
+        # dataKey() of every event above this one in the chain, inherited
+        # from the source so that checking whether this event repeats one
+        # further up the chain is a single lookup.
+        if sourceEvent is not None:
+            self.ancestry = sourceEvent.ancestry | frozenset([sourceEvent.dataKey()])
+        else:
+            self.ancestry = frozenset()
+
         # "ROOT" is a special "hash" reserved for elements with no
         # actual parent (e.g. the first page spidered.)
         if eventType == "ROOT":
             self.sourceEventHash = "ROOT"
+            self.__hash = "ROOT"
             return
 
         self.sourceEventHash = sourceEvent.getHash()
-        self.__id = self.eventType + str(self.generated) + self.module + \
-                    str(random.SystemRandom().randint(0, 99999999))
 
     def asDict(self):
         return {
@@ -2011,12 +2727,70 @@ class SpiderFootEvent(object):
             'source': self.sourceEvent.data
         }
 
-    # Unique hash of this event
+    # Unique hash of this event, calculated on first use
     def getHash(self):
-        if self.eventType == "ROOT":
-            return "ROOT"
-        digestStr = self.__id.encode('raw_unicode_escape')
-        return hashlib.sha256(digestStr).hexdigest()
+        if self.__hash is None:
+            with SpiderFootEvent._lock:
+                if self.__hash is None:
+                    digestStr = self.eventType + str(self.generated) + self.module + \
+                                str(random.SystemRandom().randint(0, 99999999))
+                    self.__hash = hashlib.sha256(digestStr.encode('raw_unicode_escape')).hexdigest()
+        return self.__hash
+
+    # Identifies the type and (case-insensitive) data of this event, to
+    # find events repeating the same data further down the chain.
+    def dataKey(self):
+        if self.__dataKey is None:
+            data = (self.data or u'').lower()
+            if type(data) == unicode:
+                data = data.encode('utf-8', 'replace')
+            self.__dataKey = (self.eventType, hashlib.sha1(data).digest())
+        return self.__dataKey
+
+    # Swap the reference to the source event for a detached copy of it,
+    # so that the source and everything above it can be garbage collected
+    # once nothing else refers to them. Only to be called once everything
+    # interested in this event has handled it.
+    def releaseSource(self, maxData=0):
+        src = self.sourceEvent
+        if src is None or src.sourceEvent is None:
+            return
+        self.sourceEvent = src.detached(maxData)
+
+    # Copy of this event with no source of its own, which if maxData is
+    # set only keeps that much of the data. It is made once and shared by
+    # all the events this one is the source of.
+    def detached(self, maxData=0):
+        if self.__detached is not None:
+            return self.__detached
+
+        # Worked out first, as getHash() takes the lock too
+        evtHash = self.getHash()
+        dataKey = self.dataKey()
+
+        with SpiderFootEvent._lock:
+            if self.__detached is None:
+                evt = SpiderFootEvent.__new__(SpiderFootEvent)
+                evt.generated = self.generated
+                evt.eventType = self.eventType
+                evt.confidence = self.confidence
+                evt.visibility = self.visibility
+                evt.risk = self.risk
+                evt.module = self.module
+                evt.sourceEvent = None
+                evt.sourceEventHash = self.sourceEventHash
+                evt.moduleDataSource = self.moduleDataSource
+                evt.actualSource = self.actualSource
+                evt.ancestry = self.ancestry
+                evt.__hash = evtHash
+                evt.__dataKey = dataKey
+                evt.__detached = None
+                if maxData > 0 and self.data is not None:
+                    evt.data = self.data[0:maxData]
+                else:
+                    evt.data = self.data
+                self.__detached = evt
+            return self.__detached
 
     # Update variables as new information becomes available
     def setConfidence(self, confidence):
@@ -2140,6 +2914,1103 @@ class PublicSuffixList(object):
                 return '.'.join(parts[i:])
 
 
+# Thread-safe dictionary holding at most maxItems entries, evicting
+# the least recently used when full.
+class SpiderFootLRUCache(object):
+    def __init__(self, maxItems):
+        self.maxItems = maxItems
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            try:
+                value = self.items.pop(key)
+            except KeyError:
+                return default
+            # Re-inserting makes it the most recently used
+            self.items[key] = value
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.items.pop(key, None)
+            self.items[key] = value
+            while len(self.items) > self.maxItems:
+                self.items.popitem(last=False)
+
+    def __len__(self):
+        return len(self.items)
+
+
+# DNS resolutions shared by everything in the process, so that the many
+# modules resolving the same names during a scan only look each one up
+# once. Entries expire after the TTL they were stored with.
+class SpiderFootDnsCache(object):
+    def __init__(self, maxItems=100000):
+        self.cache = SpiderFootLRUCache(maxItems)
+
+    # Returns an (expiry time, value) tuple, or None if there's no
+    # unexpired entry for key.
+    def get(self, key):
+        entry = self.cache.get(key)
+        if entry is not None and entry[0] > time.time():
+            return entry
+        return None
+
+    def put(self, key, value, ttl):
+        self.cache.put(key, (time.time() + ttl, value))
+
+
+# Resolves large numbers of names by keeping many UDP queries in flight
+# at once over one socket per DNS server. Each server is sent at most
+# 'rate' queries a second (no limit if 0), and queries that time out or
+# fail with an error other than NXDOMAIN are retried up to 'retries'
+# times, on the next server if there is more than one. Names that still
+# fail after that are left out of the results, and counted in
+# 'unanswered'. Queries are made from a thread of their own, so that
+# callers taking their time over each answer don't hold up the rest.
+class SpiderFootDnsBulkResolver(object):
+    def __init__(self, nameservers, rate=500, retries=2, maxInFlight=1000, timeout=2):
+        self.nameservers = list(nameservers)
+        self.rate = max(0.0, float(rate))
+        self.retries = retries
+        self.maxInFlight = maxInFlight
+        self.timeout = timeout
+        self.unanswered = 0
+
+    # Returns a dict of the names that resolved to a list of their answers
+    def resolve(self, names, qtype="A", stopCheck=None):
+        ret = dict()
+        for (name, answers) in self.iterate(names, qtype, stopCheck):
+            if answers:
+                ret[name] = answers
+        return ret
+
+    # Yields (name, answers) for each name as its answer arrives, where
+    # answers is a list of addresses, or of host names for PTR and other
+    # name records, or None if the name doesn't exist (NXDOMAIN). With
+    # aliases set, the CNAME targets the answers were found through are
+    # yielded after them, and with ttls set, the lowest TTL of the
+    # records making up the answer (None without any), in that order.
+    def iterate(self, names, qtype="A", stopCheck=None, aliases=False, ttls=False):
+        results = Queue.Queue()
+        stop = threading.Event()
+        failure = list()
+
+        def check():
+            return stop.is_set() or (stopCheck is not None and stopCheck())
+
+        def run():
+            try:
+                self._run(names, qtype, check, results)
+            except BaseException as e:
+                failure.append(e)
+            finally:
+                results.put(None)
+
+        t = threading.Thread(name="SF_dnsbulk", target=run)
+        t.daemon = True
+        t.start()
+        try:
+            while True:
+                result = results.get()
+                if result is None:
+                    break
+                ret = result[0:2]
+                if aliases:
+                    ret += result[2:3]
+                if ttls:
+                    ret += result[3:4]
+                yield ret
+        finally:
+            stop.set()
+
+        if failure:
+            raise failure[0]
+
+    # Resolve names, putting (name, answers, aliases, ttl) on the results
+    # queue for each as it is answered.
+    def _run(self, names, qtype, stopCheck, results):
+        rdtype = dns.rdatatype.from_text(qtype)
+        self.unanswered = 0
+        todo = deque((name, 0) for name in names)
+        # (server, query id) -> (name, attempt, deadline)
+        inflight = dict()
+        # Deadlines are added in increasing order, so the earliest is first
+        deadlines = deque()
+        servers = len(self.nameservers)
+        tokens = [self.rate] * servers
+        nextServer = 0
+
+        socks = list()
+        for ns in self.nameservers:
+            if ":" in ns:
+                sock = socket.socket(socket.AF_INET6, socket.SOCK_DGRAM)
+            else:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setblocking(0)
+            socks.append(sock)
+
+        def retry(name, attempt):
+            if attempt < self.retries:
+                todo.append((name, attempt + 1))
+            else:
+                self.unanswered += 1
+
+        try:
+            last = time.time()
+            while len(todo) > 0 or len(inflight) > 0:
+                if stopCheck and stopCheck():
+                    break
+
+                now = time.time()
+                if self.rate > 0:
+                    for i in range(servers):
+                        tokens[i] = min(self.rate, tokens[i] + (now - last) * self.rate)
+                last = now
+
+                # Send as many queries as the rate limits allow
+                while len(todo) > 0 and len(inflight) < self.maxInFlight:
+                    for n in range(servers):
+                        i = (nextServer + n) % servers
+                        if self.rate == 0 or tokens[i] >= 1:
+                            break
+                    else:
+                        break
+                    nextServer = (i + 1) % servers
+
+                    (name, attempt) = todo.popleft()
+                    try:
+                        query = dns.message.make_query(name, rdtype)
+                    except BaseException:
+                        continue
+                    while (i, query.id) in inflight:
+                        query.id = random.randint(0, 65535)
+
+                    try:
+                        socks[i].sendto(query.to_wire(), (self.nameservers[i], 53))
+                    except socket.error as e:
+                        if e.args[0] in [errno.EAGAIN, errno.EWOULDBLOCK, errno.ENOBUFS]:
+                            todo.appendleft((name, attempt))
+                            break
+                        retry(name, attempt)
+                        continue
+
+                    tokens[i] -= 1
+                    deadline = now + self.timeout
+                    inflight[(i, query.id)] = (name, attempt, deadline)
+                    deadlines.append((deadline, (i, query.id)))
+
+                # Wait for replies, but no longer than until the next query
+                # times out or another can be sent.
+                wait = 0.1
+                if len(deadlines) > 0:
+                    wait = min(wait, max(0, deadlines[0][0] - now))
+                if len(todo) > 0 and len(inflight) < self.maxInFlight:
+                    if self.rate > 0:
+                        wait = min(wait, 1.0 / self.rate)
+                    else:
+                        wait = 0
+
+                readable = select.select(socks, [], [], wait)[0]
+                for sock in readable:
+                    i = socks.index(sock)
+                    while True:
+                        try:
+                            (wire, addr) = sock.recvfrom(65535)
+                        except socket.error:
+                            break
+
+                        if addr[0] != self.nameservers[i]:
+                            continue
+
+                        try:
+                            res = dns.message.from_wire(wire)
+                        except BaseException:
+                            continue
+
+                        entry = inflight.get((i, res.id))
+                        if entry is None:
+                            continue
+                        (name, attempt, deadline) = entry
+                        if len(res.question) != 1 or \
+                                res.question[0].name != dns.name.from_text(name):
+                            continue
+                        del inflight[(i, res.id)]
+
+                        rcode = res.rcode()
+                        if rcode == dns.rcode.NXDOMAIN:
+                            results.put((name, None, None, None))
+                            continue
+                        if rcode != dns.rcode.NOERROR:
+                            retry(name, attempt)
+                            continue
+
+                        answers = list()
+                        cnames = list()
+                        ttl = None
+                        for rrset in res.answer:
+                            if rrset.rdtype == dns.rdatatype.CNAME and rdtype != dns.rdatatype.CNAME:
+                                for rr in rrset:
+                                    cnames.append(rr.target.to_text(omit_final_dot=True))
+                                ttl = rrset.ttl if ttl is None else min(ttl, rrset.ttl)
+                                continue
+                            if rrset.rdtype != rdtype:
+                                continue
+                            ttl = rrset.ttl if ttl is None else min(ttl, rrset.ttl)
+                            for rr in rrset:
+                                if hasattr(rr, 'address'):
+                                    answer = rr.address
+                                else:
+                                    answer = rr.target.to_text(omit_final_dot=True)
+                                if answer not in answers:
+                                    answers.append(answer)
+                        if not answers:
+                            ttl = None
+                        results.put((name, answers, cnames, ttl))
+
+                # Retry queries that have gone unanswered for too long
+                now = time.time()
+                while len(deadlines) > 0 and deadlines[0][0] <= now:
+                    (deadline, key) = deadlines.popleft()
+                    entry = inflight.get(key)
+                    # The id may since have been re-used for another query
+                    if entry is None or entry[2] != deadline:
+                        continue
+                    del inflight[key]
+                    retry(entry[0], entry[1])
+        finally:
+            for sock in socks:
+                sock.close()
+
+
+# Public suffix lists built once per process, so that hostDomain() and
+# isDomain() don't parse the whole TLD list on every call. Lists are
+# shared by all holders of the same list contents, and each keeps an
+# LRU cache of the lookups made against it. Once preload() has been
+# given a cache directory, built lists are also saved there so that
+# later processes can load them rather than parse the list again.
+class SpiderFootSuffixLists(object):
+    _missing = object()
+    # Bump if the layout of PublicSuffixList.root changes
+    snapshotVersion = 1
+
+    def __init__(self, maxLists=4, maxLookups=10000):
+        self.maxLookups = maxLookups
+        self.cacheDir = None
+        # id() of each TLD list seen -> (list, digest of its contents). The
+        # list is kept so that its id can't be re-used by another list
+        # while the entry exists. Scans give all their modules the same
+        # list, so there are only ever a few of these.
+        self.digests = SpiderFootLRUCache(256)
+        # Digest -> (PublicSuffixList, LRU cache of lookups)
+        self.lists = SpiderFootLRUCache(maxLists)
+        self.lock = threading.Lock()
+
+    def _digest(self, tldList):
+        entry = self.digests.get(id(tldList))
+        if entry is not None and entry[0] is tldList:
+            return entry[1]
+
+        h = hashlib.sha1()
+        for line in tldList:
+            if type(line) == unicode:
+                line = line.encode('utf-8')
+            h.update(line + '\n')
+        digest = h.hexdigest()
+
+        self.digests.put(id(tldList), (tldList, digest))
+        return digest
+
+    # Return the PublicSuffixList and lookup cache for a TLD list,
+    # building them if this is the first time the list has been seen.
+    def _getList(self, tldList):
+        digest = self._digest(tldList)
+        entry = self.lists.get(digest)
+        if entry is not None:
+            return entry
+
+        with self.lock:
+            entry = self.lists.get(digest)
+            if entry is None:
+                psl = self._loadSnapshot(digest)
+                if psl is None:
+                    psl = PublicSuffixList(tldList)
+                    self._saveSnapshot(digest, psl)
+                entry = (psl, SpiderFootLRUCache(self.maxLookups))
+                self.lists.put(digest, entry)
+        return entry
+
+    def _snapshotPath(self, digest):
+        return os.path.join(self.cacheDir, "psl-" + digest)
+
+    # Load a previously built list, or return None if there isn't one
+    # or it can't be read.
+    def _loadSnapshot(self, digest):
+        if self.cacheDir is None:
+            return None
+
+        try:
+            with open(self._snapshotPath(digest), "rb") as f:
+                (version, root) = marshal.load(f)
+        except BaseException:
+            return None
+
+        if version != self.snapshotVersion:
+            return None
+
+        psl = PublicSuffixList.__new__(PublicSuffixList)
+        psl.root = root
+        return psl
+
+    # Save a built list, replacing snapshots of any other list contents.
+    def _saveSnapshot(self, digest, psl):
+        if self.cacheDir is None:
+            return
+
+        path = self._snapshotPath(digest)
+        try:
+            # Write to a temporary file first so that a concurrent reader
+            # never sees a partial snapshot.
+            tmp = path + "." + str(os.getpid()) + "." + str(threading.current_thread().ident)
+            with open(tmp, "wb") as f:
+                marshal.dump((self.snapshotVersion, psl.root), f)
+            if os.path.exists(path):
+                os.remove(path)
+            os.rename(tmp, path)
+
+            for name in os.listdir(self.cacheDir):
+                if name.startswith("psl-") and name != "psl-" + digest and "." not in name:
+                    os.remove(os.path.join(self.cacheDir, name))
+        except BaseException:
+            # Only means the list will be built again next time
+            return
+
+    # Make the list ready for use, loading it from a snapshot in cacheDir
+    # if one was saved for the same list contents, and save lists built
+    # from now on to cacheDir.
+    def preload(self, tldList, cacheDir):
+        self.cacheDir = cacheDir
+        self._getList(tldList)
+
+    # Equivalent to PublicSuffixList(tldList).get_public_suffix(hostname)
+    def getPublicSuffix(self, hostname, tldList):
+        (psl, lookups) = self._getList(tldList)
+
+        key = hostname.lower()
+        ret = lookups.get(key, self._missing)
+        if ret is self._missing:
+            ret = psl.get_public_suffix(hostname)
+            lookups.put(key, ret)
+        return ret
+
+
+# Queue-based event dispatch, used in place of the recursive calls
+# notifyListeners() otherwise makes when the _eventbus option is set.
+# Every listener module gets its own input queue and a pool of worker
+# threads pulls events off those queues. Unless registered with a
+# higher limit, a module is only ever handed to one worker at a time,
+# so events reach it in the order they were produced and its code
+# needn't be thread-safe.
+class SpiderFootEventBus(object):
+    def __init__(self, scanId, workers=10):
+        self.scanId = scanId
+        self.numWorkers = max(1, int(workers))
+        # Events waiting to be handled, per listener module
+        self.queues = dict()
+        # Modules with queued events that are waiting for a worker. A
+        # module appears here once for every worker it may use.
+        self.ready = Queue.Queue()
+        # Number of workers each module may use at once
+        self.limits = dict()
+        # Number of times each module is in self.ready or being worked on
+        self.active = dict()
+        # Events queued or in the middle of being handled
+        self.pending = 0
+        # [listeners yet to handle it, function to call once they all
+        # have] for events posted with one
+        self.callbacks = dict()
+        self.lock = threading.Condition()
+        self.workers = list()
+        self.stopped = False
+
+    # Start the worker threads
+    def start(self):
+        for i in range(self.numWorkers):
+            t = threading.Thread(name="SF_" + self.scanId + "_worker" + str(i),
+                                 target=self._work)
+            t.daemon = True
+            t.start()
+            self.workers.append(t)
+
+    # Set how many workers may handle events for a listener module at
+    # once. Modules that aren't thread-safe are always limited to one.
+    def register(self, listener, maxWorkers=1):
+        if not listener._threadSafe:
+            maxWorkers = 1
+        with self.lock:
+            self.limits[listener] = max(1, int(maxWorkers))
+
+    # Queue an event for delivery to listener modules. If set, done() is
+    # called once all of them have handled it.
+    def post(self, listeners, sfEvent, done=None):
+        if not listeners:
+            if done is not None:
+                done()
+            return
+
+        with self.lock:
+            if done is not None:
+                self.callbacks[sfEvent] = [len(listeners), done]
+            for listener in listeners:
+                if listener not in self.queues:
+                    self.queues[listener] = deque()
+                    self.active[listener] = 0
+                self.queues[listener].append(sfEvent)
+                self.pending += 1
+                if self.active[listener] < self.limits.get(listener, 1):
+                    self.active[listener] += 1
+                    self.ready.put(listener)
+
+    def _work(self):
+        while True:
+            listener = self.ready.get()
+            if listener is None:
+                return
+
+            with self.lock:
+                # Another worker on the same module may have emptied the
+                # queue already.
+                if not self.queues[listener]:
+                    self.active[listener] -= 1
+                    continue
+                sfEvent = self.queues[listener].popleft()
+
+            try:
+                # Once stopped or an abort has been requested, just drain
+                # the queues.
+                if not self.stopped and \
+                        globalScanStatus.getStatus(self.scanId) != "ABORT-REQUESTED":
+                    listener.processEvent(sfEvent)
+            finally:
+                done = None
+                with self.lock:
+                    callback = self.callbacks.get(sfEvent)
+                    if callback is not None:
+                        callback[0] -= 1
+                        if callback[0] == 0:
+                            del self.callbacks[sfEvent]
+                            done = callback[1]
+                    self.pending -= 1
+                    # Put the module to the back of the line if it has more
+                    # events waiting, so busy modules don't starve others.
+                    if self.queues[listener]:
+                        self.ready.put(listener)
+                    else:
+                        self.active[listener] -= 1
+                    if self.pending == 0:
+                        self.lock.notify_all()
+                if done is not None:
+                    done()
+
+    # Number of events queued or being handled
+    def pendingCount(self):
+        with self.lock:
+            return self.pending
+
+    # Block until all queues are empty and all workers are idle, which
+    # is the point at which a scan has completed.
+    def waitForIdle(self):
+        with self.lock:
+            while self.pending > 0:
+                self.lock.wait(1)
+
+    # Stop the worker threads. Anything still queued is discarded.
+    def shutdown(self):
+        self.stopped = True
+        for t in self.workers:
+            self.ready.put(None)
+        for t in self.workers:
+            if t is not threading.current_thread():
+                t.join()
+        self.workers = list()
+
+
+# Pooled HTTP connections for fetchUrl(), so that repeated requests to
+# the same host re-use kept-alive connections rather than each opening
+# a new one. Connection pools are shared by every thread using the same
+# proxy settings, while each thread gets its own requests.Session on
+# top of them, as sessions themselves aren't thread-safe.
+class SpiderFootSessionPool(object):
+    def __init__(self, maxPerHost=10, maxHosts=100):
+        self.maxPerHost = maxPerHost
+        self.maxHosts = maxHosts
+        # Transport adapters (holding the connection pools) by proxy
+        self.adapters = dict()
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    # Get this thread's session for the supplied proxy settings
+    def getSession(self, proxies):
+        key = (proxies.get('http'), proxies.get('https'))
+
+        if not hasattr(self.local, 'sessions'):
+            self.local.sessions = dict()
+        if key in self.local.sessions:
+            return self.local.sessions[key]
+
+        with self.lock:
+            if key not in self.adapters:
+                # Up to maxPerHost connections to a host are kept alive;
+                # requests beyond that get a connection of their own which
+                # is closed afterwards, rather than waiting for one.
+                self.adapters[key] = requests.adapters.HTTPAdapter(
+                    pool_connections=self.maxHosts, pool_maxsize=self.maxPerHost)
+            adapter = self.adapters[key]
+
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        # Don't carry cookies from one request over to the next, each
+        # request only gets those explicitly passed to fetchUrl().
+        session.cookies.set_policy(cookielib.DefaultCookiePolicy(allowed_domains=[]))
+        self.local.sessions[key] = session
+        return session
+
+
+# Iterator over the body of a streamed response, in byte strings of up
+# to chunkSize bytes, ending after sizeLimit bytes if set. The response
+# is closed once the body has been read, reading it fails or close() is
+# called, whether or not anything was read from it first.
+class SpiderFootResponseBody(object):
+    def __init__(self, sf, res, sizeLimit, chunkSize):
+        self.sf = sf
+        self.res = res
+        self.sizeLimit = sizeLimit
+        self.size = 0
+        self.chunks = res.iter_content(chunkSize)
+
+    def __iter__(self):
+        return self
+
+    def next(self):
+        while self.res is not None:
+            try:
+                chunk = next(self.chunks)
+            except StopIteration:
+                break
+            except Exception as e:
+                self.sf.debug("Stopped reading from %s: %s", self.res.url, e)
+                break
+
+            if self.sizeLimit and self.size + len(chunk) > self.sizeLimit:
+                chunk = chunk[0:self.sizeLimit - self.size]
+            self.size += len(chunk)
+            if self.sizeLimit and self.size >= self.sizeLimit:
+                self.close()
+            if chunk:
+                return chunk
+
+        self.close()
+        raise StopIteration
+
+    def close(self):
+        if self.res is not None:
+            self.res.close()
+            self.res = None
+
+
+# Cache of labelled data such as downloaded threat feeds, used through
+# SpiderFoot.cacheGet() and cachePut(). Entries are kept in an SQLite
+# database, so each write is atomic, and the least recently used are
+# evicted when the total size goes over maxBytes. The most recently used
+# are also held in memory, up to maxMemoryBytes (of UTF-8 encoded data),
+# so that modules reading the same entry for every event don't go to disk
+# each time. Reads from memory are recorded in the database every
+# _touchInterval seconds rather than each time.
+class SpiderFootCache(object):
+    _caches = dict()
+    _cachesLock = threading.Lock()
+    _touchInterval = 60
+    # Names of the files entries used to be kept in, one per entry named
+    # after the SHA-224 hash of its label
+    _flatFileName = re.compile("^[0-9a-f]{56}$")
+
+    # Return the cache stored at path, shared by everything in the process
+    @classmethod
+    def open(cls, path, maxBytes, maxMemoryBytes=64 * 1024 * 1024):
+        with cls._cachesLock:
+            cache = cls._caches.get(path)
+            if cache is None:
+                cache = cls(path, maxBytes, maxMemoryBytes)
+                cls._caches[path] = cache
+            return cache
+
+    def __init__(self, path, maxBytes, maxMemoryBytes):
+        self.maxBytes = maxBytes
+        self.maxMemoryBytes = maxMemoryBytes
+        # label -> (stored, expires, data, size of data encoded)
+        self.memory = OrderedDict()
+        self.memoryBytes = 0
+        # label -> time last read from memory, not yet in the database
+        self.touched = dict()
+        self.touchedFlushed = time.time()
+        self.lock = threading.RLock()
+
+        opened = time.time()
+        isNew = not os.path.exists(path)
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.text_factory = str
+        with self.lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS tbl_cache ( \
+                label       VARCHAR NOT NULL PRIMARY KEY, \
+                data        BLOB NOT NULL, \
+                stored      REAL NOT NULL, \
+                expires     REAL NOT NULL, \
+                accessed    REAL NOT NULL, \
+                size        INT NOT NULL \
+            )")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON tbl_cache (accessed)")
+            self.conn.commit()
+
+        if isNew:
+            self._removeFlatFiles(os.path.dirname(path) or ".", opened)
+
+    # Remove the files entries were kept in before there was a database,
+    # as their labels can't be recovered from the file names to move
+    # them into it. Only files from before the database was created are
+    # removed, so that other files named the same way, such as feed
+    # indexes, written since are kept.
+    def _removeFlatFiles(self, directory, before):
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return
+
+        for name in names:
+            if not self._flatFileName.match(name):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                if os.path.isfile(path) and os.path.getmtime(path) < before:
+                    os.remove(path)
+            except OSError:
+                continue
+
+    def _remember(self, label, entry):
+        self._forget(label)
+        self.memory[label] = entry
+        self.memoryBytes += entry[3]
+        while self.memoryBytes > self.maxMemoryBytes and len(self.memory) > 1:
+            (oldLabel, oldEntry) = self.memory.popitem(last=False)
+            self.memoryBytes -= oldEntry[3]
+
+    def _forget(self, label):
+        entry = self.memory.pop(label, None)
+        if entry is not None:
+            self.memoryBytes -= entry[3]
+
+    # Record when the entries read from memory were last accessed
+    def _flushTouched(self, now):
+        if len(self.touched) > 0:
+            self.conn.executemany("UPDATE tbl_cache SET accessed = ? WHERE label = ?",
+                                  [[accessed, label] for (label, accessed) in self.touched.items()])
+            self.conn.commit()
+            self.touched = dict()
+        self.touchedFlushed = now
+
+    # Return the data stored under label as unicode, or None if there
+    # isn't any, it was stored more than timeoutHrs hours ago (unless
+    # timeoutHrs is 0) or it has expired.
+    def get(self, label, timeoutHrs):
+        now = time.time()
+        with self.lock:
+            entry = self.memory.get(label)
+            if entry is None:
+                row = self.conn.execute("SELECT stored, expires, data FROM tbl_cache \
+                    WHERE label = ?", [label]).fetchone()
+                if row is None:
+                    return None
+                entry = (row[0], row[1], str(row[2]).decode('utf-8'), len(row[2]))
+                self.conn.execute("UPDATE tbl_cache SET accessed = ? WHERE label = ?",
+                                  [now, label])
+                self.conn.commit()
+            else:
+                self.touched[label] = now
+                if now - self.touchedFlushed >= self._touchInterval:
+                    self._flushTouched(now)
+            self._remember(label, entry)
+
+        (stored, expires, data, size) = entry
+        if len(data) == 0:
+            return None
+        if expires > 0 and expires <= now:
+            return None
+        if timeoutHrs != 0 and stored <= now - timeoutHrs * 3600:
+            return None
+        return data
+
+    # Store data (UTF-8 encoded) under label, to expire after expiryHrs
+    # hours if that's not 0.
+    def put(self, label, data, expiryHrs=0):
+        now = time.time()
+        expires = 0
+        if expiryHrs > 0:
+            expires = now + expiryHrs * 3600
+
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO tbl_cache \
+                (label, data, stored, expires, accessed, size) VALUES (?, ?, ?, ?, ?, ?)",
+                [label, sqlite3.Binary(data), now, expires, now, len(data)])
+            self.conn.commit()
+            self.touched.pop(label, None)
+            self._remember(label, (now, expires, data.decode('utf-8'), len(data)))
+            self._evict(now)
+
+    # Remove expired entries and then the least recently used until the
+    # cache is comfortably under maxBytes.
+    def _evict(self, now):
+        self._flushTouched(now)
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM tbl_cache").fetchone()[0]
+        if total <= self.maxBytes:
+            return
+
+        for (label, size) in self.conn.execute("SELECT label, size FROM tbl_cache \
+                WHERE expires > 0 AND expires <= ?", [now]).fetchall():
+            self.conn.execute("DELETE FROM tbl_cache WHERE label = ?", [label])
+            self._forget(label)
+            total -= size
+
+        target = self.maxBytes * 0.9
+        for (label, size) in self.conn.execute("SELECT label, size FROM tbl_cache \
+                ORDER BY accessed").fetchall():
+            if total <= target:
+                break
+            self.conn.execute("DELETE FROM tbl_cache WHERE label = ?", [label])
+            self._forget(label)
+            total -= size
+
+        self.conn.commit()
+
+
+# Runs a function once for all the threads asking for the same key at
+# the same time: the first caller runs it and the rest wait for and get
+# its result, or None if it raised an exception.
+class SpiderFootSingleFlight(object):
+    def __init__(self):
+        self.lock = threading.Lock()
+        # key -> [Event set when done, result]
+        self.flights = dict()
+
+    def do(self, key, fn):
+        with self.lock:
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = [threading.Event(), None]
+                self.flights[key] = flight
+
+        if not leader:
+            flight[0].wait()
+            return flight[1]
+
+        try:
+            flight[1] = fn()
+        finally:
+            with self.lock:
+                del self.flights[key]
+            flight[0].set()
+        return flight[1]
+
+
+# Spaces out requests to the same host (or other key) across all modules
+# and scans. Each key has a token bucket holding up to 'burst' requests,
+# refilled at one per 'interval' seconds, so a caller only waits once
+# the bucket is empty. Callers reserve their slot before sleeping, so
+# concurrent callers queue up behind each other rather than all going
+# at once.
+class SpiderFootRateLimiter(object):
+    def __init__(self):
+        self.lock = threading.Lock()
+        # key -> [tokens, time tokens was last updated]
+        self.buckets = dict()
+        # key -> time before which no requests may be made
+        self.holds = dict()
+
+    # Wait until a request to key may be made, allowing one every
+    # interval seconds (if set) with up to burst at once, and none before
+    # any hold on key ends. Returns the number of seconds waited.
+    def acquire(self, key, interval, burst=1):
+        burst = max(1, burst)
+        with self.lock:
+            now = time.time()
+            wait = 0
+            if interval > 0:
+                bucket = self.buckets.get(key)
+                if bucket is None:
+                    tokens = float(burst)
+                else:
+                    tokens = min(float(burst), bucket[0] + (now - bucket[1]) / interval)
+                tokens -= 1
+                self.buckets[key] = [tokens, now]
+                if tokens < 0:
+                    wait = -tokens * interval
+
+            hold = self.holds.get(key)
+            if hold is not None:
+                if hold > now:
+                    wait = max(wait, hold - now)
+                else:
+                    del self.holds[key]
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    # Hold back all requests to key for the next 'seconds' seconds, such
+    # as when the server has asked for fewer requests.
+    def hold(self, key, seconds):
+        with self.lock:
+            self.holds[key] = max(self.holds.get(key, 0), time.time() + seconds)
+
+
+# Counters kept for a scan by everything working on it, such as how long
+# requests were held back by rate limits, for reporting once it ends.
+class SpiderFootScanStats(object):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = dict()
+
+    def add(self, name, amount=1):
+        with self.lock:
+            self.counts[name] = self.counts.get(name, 0) + amount
+
+    def get(self, name):
+        with self.lock:
+            return self.counts.get(name, 0)
+
+
+# Read-only sequence view of count packed values of the given struct
+# format, starting at offset within data (a string, mmap, etc.), so that
+# the likes of bisect can search it without the values being unpacked
+# into a list first.
+class SpiderFootPackedArray(object):
+    def __init__(self, data, offset, count, fmt):
+        self.data = data
+        self.offset = offset
+        self.count = count
+        self.fmt = fmt
+        self.size = struct.calcsize(fmt)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if i < 0 or i >= self.count:
+            raise IndexError("SpiderFootPackedArray index out of range")
+        return struct.unpack_from(self.fmt, self.data, self.offset + i * self.size)[0]
+
+
+# Set of IPv4 addresses held as a sorted sequence of integers, so that
+# whether any of them fall within a netblock takes two binary searches
+# rather than testing each address in turn. Anything checking netblocks
+# against a list of addresses should use this.
+class SpiderFootAddressSet(object):
+    # addresses must already be sorted integers, see toInt()
+    def __init__(self, addresses):
+        self.addresses = addresses
+
+    # Return a dotted IPv4 address as an integer, or None
+    @staticmethod
+    def toInt(address):
+        octets = address.split(".")
+        if len(octets) != 4:
+            return None
+
+        value = 0
+        for octet in octets:
+            if not octet.isdigit() or int(octet) > 255:
+                return None
+            value = (value << 8) | int(octet)
+        return value
+
+    def __len__(self):
+        return len(self.addresses)
+
+    # Number of addresses within netblock (a CIDR string or IPNetwork)
+    def countIn(self, netblock):
+        try:
+            net = netaddr.IPNetwork(netblock)
+        except BaseException:
+            return 0
+
+        if net.version != 4:
+            return 0
+
+        return bisect_right(self.addresses, net.last) - \
+            bisect_left(self.addresses, net.first)
+
+    def anyIn(self, netblock):
+        return self.countIn(netblock) > 0
+
+
+# Index of the items listed in a threat feed, so that modules can check
+# whether something is listed without scanning the whole feed for every
+# event. Items are held as a sorted array of 64-bit hashes and IPv4
+# addresses as a sorted array of integers, so that lookups are a binary
+# search. Indexes are saved to a file and memory-mapped when loaded.
+#
+# Without a regex, each line of the feed is an item. Otherwise regex is
+# the pattern feed modules match lines against, with {0} where the item
+# appears. A pattern allowing the item to be preceded by sub-domains,
+# as in '\w+://(.*\.)?[^a-zA-Z0-9]?{0}.*', has the parent domains of
+# each host indexed too. A pattern starting with '.*' lets the item appear
+# anywhere on the line, so every place it could match is indexed, as
+# matching each line against the pattern for every item would find. The
+# addresses checked against netblocks are, as modules used to find them,
+# the first on each line matching the pattern anywhere within it.
+class SpiderFootFeedIndex(object):
+    magic = "SFFI"
+    version = 2
+    _header = struct.Struct("<4sIII")
+    _itemRegex = "(?P<item>[^\\s,;\"'/:#<>|]+)"
+    _addressRegex = "(?P<address>\\d+\\.\\d+\\.\\d+\\.\\d+)"
+    _subdomainRegexes = ["(.*\\.)?[^a-zA-Z0-9]?", "(.*\\.)?"]
+
+    def __init__(self, data, mtime):
+        (magic, version, self.items, self.addresses) = self._header.unpack_from(data, 0)
+        if magic != self.magic or version != self.version:
+            raise ValueError("Not a feed index.")
+
+        self.itemsOffset = self._header.size
+        self.addressesOffset = self.itemsOffset + self.items * 8
+        if len(data) != self.addressesOffset + self.addresses * 4:
+            raise ValueError("Truncated feed index.")
+
+        self.data = data
+        self.mtime = mtime
+        self.itemHashes = SpiderFootPackedArray(data, self.itemsOffset, self.items, "<Q")
+        self.addressSet = SpiderFootAddressSet(
+            SpiderFootPackedArray(data, self.addressesOffset, self.addresses, "<I"))
+
+    @classmethod
+    def load(cls, path):
+        fp = open(path, "rb")
+        try:
+            data = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        finally:
+            fp.close()
+        return cls(data, os.path.getmtime(path))
+
+    @classmethod
+    def build(cls, path, content, regex=None):
+        items = set()
+        addresses = set()
+
+        pattern = None
+        addressPattern = None
+        subdomains = False
+        anywhere = False
+        if regex is not None:
+            for rx in cls._subdomainRegexes:
+                if rx in regex:
+                    regex = regex.replace(rx, "")
+                    subdomains = True
+            addressPattern = re.compile(regex.replace("{0}", cls._addressRegex),
+                                        re.IGNORECASE)
+            regex = regex.replace("{0}", cls._itemRegex)
+            # A lookahead finds overlapping matches, one at every offset
+            # the rest of the pattern matches from.
+            if regex.startswith(".*"):
+                regex = "(?=" + regex[2:] + ")"
+                anywhere = True
+            pattern = re.compile(regex, re.IGNORECASE)
+
+        if type(content) == unicode:
+            content = content.encode('utf-8')
+
+        for line in content.split("\n"):
+            if addressPattern is not None:
+                m = addressPattern.search(line)
+                if m is not None:
+                    address = SpiderFootAddressSet.toInt(m.group('address'))
+                    if address is not None:
+                        addresses.add(address)
+
+            if pattern is None:
+                lineItems = [line.strip()]
+            elif anywhere:
+                lineItems = [m.group('item') for m in pattern.finditer(line)]
+            else:
+                m = pattern.match(line)
+                if m is None:
+                    continue
+                lineItems = [m.group('item')]
+
+            for item in lineItems:
+                if len(item) == 0 or item.startswith("#"):
+                    continue
+                item = item.lower()
+
+                items.add(cls._hash(item))
+                address = SpiderFootAddressSet.toInt(item)
+                if address is not None:
+                    if pattern is None:
+                        addresses.add(address)
+                elif subdomains:
+                    labels = item.split(".")
+                    for i in range(1, len(labels)):
+                        items.add(cls._hash(".".join(labels[i:])))
+
+        data = cls._header.pack(cls.magic, cls.version, len(items), len(addresses)) + \
+            struct.pack("<%dQ" % len(items), *sorted(items)) + \
+            struct.pack("<%dI" % len(addresses), *sorted(addresses))
+
+        try:
+            # Write to a temporary file first so that readers never
+            # see a partial index.
+            tmp = path + "." + str(os.getpid()) + "." + str(threading.current_thread().ident)
+            fp = open(tmp, "wb")
+            fp.write(data)
+            fp.close()
+            if os.path.exists(path):
+                os.remove(path)
+            os.rename(tmp, path)
+            return cls.load(path)
+        except BaseException:
+            # Still usable, just not saved for next time
+            return cls(data, time.time())
+
+    @staticmethod
+    def _hash(item):
+        if type(item) == unicode:
+            item = item.lower().encode('utf-8')
+        else:
+            item = item.lower()
+        return struct.unpack("<Q", hashlib.sha1(item).digest()[:8])[0]
+
+    # Was the index built in the last timeoutHrs hours (or is timeoutHrs 0)?
+    def fresh(self, timeoutHrs):
+        return timeoutHrs == 0 or self.mtime > time.time() - timeoutHrs * 3600
+
+    # Is item (a host name, IP address, etc.) listed in the feed?
+    def contains(self, item):
+        if item is None or len(item) == 0:
+            return False
+
+        value = self._hash(item)
+        i = bisect_left(self.itemHashes, value)
+        return i < len(self.itemHashes) and self.itemHashes[i] == value
+
+    # Is any IPv4 address within netblock listed in the feed?
+    def hasAddressIn(self, netblock):
+        return self.addressSet.anyIn(netblock)
+
+
 # Class for tracking the status of all running scans. Thread safe.
 class SpiderFootScanStatus:
     statusTable = dict()
@@ -2163,3 +4034,20 @@ class SpiderFootScanStatus:
 # running scans.
 globalScanStatus = SpiderFootScanStatus()
 
+# HTTP connections shared by all scans
+globalSessionPool = SpiderFootSessionPool()
+
+# Public suffix lists shared by all scans
+globalSuffixLists = SpiderFootSuffixLists()
+
+# Shared DNS resolution cache
+globalDnsCache = SpiderFootDnsCache()
+
+# Threat feed indexes loaded by all scans
+globalFeedIndexes = SpiderFootLRUCache(100)
+
+# Cache fills and feed index builds in progress
+globalCacheFills = SpiderFootSingleFlight()
+
+# Request rate limits per host, shared by all scans
+globalRateLimiter = SpiderFootRateLimiter()
@@ -20,7 +20,7 @@ import random
 from copy import deepcopy, copy
 from sfdb import SpiderFootDb
 from sflib import SpiderFoot, SpiderFootEvent, SpiderFootTarget, \
-    SpiderFootPlugin, globalScanStatus
+    SpiderFootPlugin, SpiderFootEventBus, globalScanStatus, globalSuffixLists
 
 # Eventually change this to be able to control multiple scan instances
 class SpiderFootScanner(threading.Thread):
@@ -81,9 +81,14 @@ class SpiderFootScanner(threading.Thread):
         self.ts.modconfig = dict()
         self.ts.scanName = self.temp['scanName']
         self.ts.scanId = self.temp['scanId']
+        self.ts.eventBus = None
         aborted = False
         self.ts.sf.setDbh(self.ts.dbh)
 
+        # Write log messages in batches from a background thread rather
+        # than committing each one as it is logged.
+        self.ts.dbh.scanLogBatchStart()
+
         # Create a unique ID for this scan and create it in the back-end DB.
         self.ts.sf.setGUID(self.ts.scanId)
         self.ts.dbh.scanInstanceCreate(self.ts.scanId,
@@ -171,6 +176,8 @@ class SpiderFootScanner(threading.Thread):
             if self.ts.config['_dnsserver'] != "":
                 res = dns.resolver.Resolver()
                 res.nameservers = [self.ts.config['_dnsserver']]
+                # dnspython caches answers for as long as their TTLs allow
+                res.cache = dns.resolver.LRUCache()
                 dns.resolver.override_system_resolver(res)
             else:
                 dns.resolver.restore_system_resolver()
@@ -180,15 +187,19 @@ class SpiderFootScanner(threading.Thread):
                 self.ts.config['_useragent'])
 
             # Get internet TLDs
-            tlddata = self.ts.sf.cacheGet("internet_tlds",
-                                          self.ts.config['_internettlds_cache'])
-            # If it wasn't loadable from cache, load it from scratch
-            if tlddata is None:
-                self.ts.config['_internettlds'] = self.ts.sf.optValueToData(
-                    self.ts.config['_internettlds'])
-                self.ts.sf.cachePut("internet_tlds", self.ts.config['_internettlds'])
-            else:
-                self.ts.config["_internettlds"] = tlddata.splitlines()
+            # If it wasn't loadable from cache, load it from scratch. Scans
+            # starting at the same time share the one download.
+            tlddata = self.ts.sf.cacheGetOrPut("internet_tlds",
+                                               self.ts.config['_internettlds_cache'],
+                                               lambda: self.ts.sf.optValueToData(
+                                                   self.ts.config['_internettlds'],
+                                                   splitLines=False))
+            self.ts.config["_internettlds"] = tlddata.splitlines()
+
+            # Have the suffix list for the TLDs ready before modules need it,
+            # loading the one built by a previous scan if it's unchanged.
+            globalSuffixLists.preload(self.ts.config['_internettlds'],
+                                      self.ts.sf.cachePath())
 
             for modName in self.ts.moduleList:
                 if modName == '':
@@ -213,9 +224,14 @@ class SpiderFootScanner(threading.Thread):
                 self.ts.modconfig[modName] = deepcopy(self.ts.config['__modules__'][modName]['opts'])
                 for opt in self.ts.config.keys():
                     self.ts.modconfig[modName][opt] = deepcopy(self.ts.config[opt])
+                # Modules only read the TLD list, so they can all share the
+                # one the suffix list was built from rather than each
+                # having a copy to be hashed again when first used.
+                self.ts.modconfig[modName]['_internettlds'] = self.ts.config['_internettlds']
 
                 mod.clearListeners()  # clear any listener relationships from the past
-                mod.setup(self.ts.sf, self.ts.modconfig[modName])
+                mod.setup(self.ts.sf.forComponent("modules." + modName),
+                          self.ts.modconfig[modName])
                 mod.setDbh(self.ts.dbh)
                 mod.setScanId(self.ts.scanId)
 
@@ -237,10 +253,21 @@ class SpiderFootScanner(threading.Thread):
 
                 self.ts.sf.status(modName + " module loaded.")
 
+            # If requested, queue events on a bus serviced by a pool of
+            # worker threads instead of calling modules directly.
+            if self.ts.config.get('_eventbus'):
+                self.ts.eventBus = SpiderFootEventBus(self.ts.scanId,
+                                                      self.ts.config['_eventbusworkers'])
+
             # Register listener modules and then start all modules sequentially
             for module in self.ts.moduleInstances.values():
                 # Register the target with the module
                 module.setTarget(target)
+                module.setEventBus(self.ts.eventBus)
+                module.setReleaseSource(self.ts.config.get('_releasesource', 0))
+                if self.ts.eventBus:
+                    self.ts.eventBus.register(module,
+                        self.ts.modconfig[module.__name__].get('maxworkers', 1))
 
                 for listenerModule in self.ts.moduleInstances.values():
                     # Careful not to register twice or you will get duplicate events
@@ -252,6 +279,8 @@ class SpiderFootScanner(threading.Thread):
                     if listenerModule.watchedEvents() is not None:
                         module.registerListener(listenerModule)
 
+                module.indexListeners()
+
             # Now we are ready to roll..
             self.setStatus("RUNNING")
 
@@ -260,9 +289,14 @@ class SpiderFootScanner(threading.Thread):
             psMod.__name__ = "SpiderFoot UI"
             psMod.setTarget(target)
             psMod.clearListeners()
+            psMod.setEventBus(self.ts.eventBus)
             for mod in self.ts.moduleInstances.values():
                 if mod.watchedEvents() is not None:
                     psMod.registerListener(mod)
+            psMod.indexListeners()
+
+            if self.ts.eventBus:
+                self.ts.eventBus.start()
 
             # Create the "ROOT" event which un-triggered modules will link events to
             rootEvent = SpiderFootEvent("ROOT", self.ts.targetValue, "", None)
@@ -278,6 +312,12 @@ class SpiderFootScanner(threading.Thread):
                                                  "SpiderFoot UI", rootEvent)
                     psMod.notifyListeners(firstEvent)
 
+            # With an event bus, the above only queued the initial events,
+            # so wait for the queues to be drained.
+            if self.ts.eventBus:
+                self.ts.eventBus.waitForIdle()
+                self.ts.eventBus.shutdown()
+
             # If in interactive mode, loop through this shared global variable
             # waiting for inputs, and process them until my status is set to
             # FINISHED.
@@ -290,9 +330,16 @@ class SpiderFootScanner(threading.Thread):
                     aborted = True
                     break
 
+            # Write out any results still queued for storage
+            unstored = self.ts.dbh.scanEventBatchStop()
+
             if aborted:
                 self.ts.sf.status("Scan [" + self.ts.scanId + "] aborted.")
                 self.setStatus("ABORTED", None, time.time() * 1000)
+            elif unstored > 0:
+                self.ts.sf.status("Scan [" + self.ts.scanId + "] failed: " + \
+                                  str(unstored) + " results could not be stored.")
+                self.setStatus("ERROR-FAILED", None, time.time() * 1000)
             else:
                 self.ts.sf.status("Scan [" + self.ts.scanId + "] completed.")
                 self.setStatus("FINISHED", None, time.time() * 1000)
@@ -301,9 +348,22 @@ class SpiderFootScanner(threading.Thread):
             self.ts.sf.error("Unhandled exception (" + e.__class__.__name__ + ") " + \
                              "encountered during scan. Please report this as a bug: " + \
                              repr(traceback.format_exception(exc_type, exc_value, exc_traceback)), False)
+            if self.ts.eventBus:
+                self.ts.eventBus.shutdown()
+            self.ts.dbh.scanEventBatchStop()
             self.ts.sf.status("Scan [" + self.ts.scanId + "] failed: " + str(e))
             self.setStatus("ERROR-FAILED", None, time.time() * 1000)
 
+        self.ts.sf.info("DNS cache: %d hits, %d misses.",
+                        self.ts.sf.stats.get("dnsHits"), self.ts.sf.stats.get("dnsMisses"))
+        self.ts.sf.info("Request rate limits: waited %.1fs over %d requests.",
+                        self.ts.sf.stats.get("rateWaited"), self.ts.sf.stats.get("rateWaits"))
+
+        dropped = self.ts.dbh.scanLogBatchStop()
+        if dropped > 0:
+            self.ts.sf.status(str(dropped) + " log messages were dropped during the scan " + \
+                              "as they could not be stored quickly enough, or at all.")
+
         self.ts.dbh.close()
         del self.ts
         del self.temp
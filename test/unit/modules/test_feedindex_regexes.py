@@ -0,0 +1,249 @@
+# test_feedindex_regexes.py
+import importlib
+import os
+import re
+import shutil
+import tempfile
+import unittest
+
+from netaddr import IPAddress, IPNetwork
+
+from sflib import SpiderFootFeedIndex
+
+
+# Sample feed lines for each list check with a regex, and what to look
+# up in them. Targets are host names and addresses, not fragments of
+# them: the old line matching also flagged fragments ('evil.co' for a
+# listed 'evil.com'), which the index deliberately doesn't.
+samples = {
+    'sfp_abusech': {
+        'abusesslblip': (["# Firstseen,DstIP,DstPort", "1.2.3.4,443,Dridex",
+                          "2019-01-01 10:00:00,5.6.7.8,443"],
+                         ['1.2.3.4', '5.6.7.8', '9.9.9.9'],
+                         ['1.2.3.0/24', '5.6.7.0/24', '9.9.9.0/24']),
+        'abuseurlhaus': (['"1","2019-01-01","http://evil.com/path/x.exe","online"',
+                          'http://1.2.3.4/a/b.exe', 'https://bad.org:8080/x'],
+                         ['evil.com', 'path', '1.2.3.4', 'bad.org', 'good.com'],
+                         []),
+        'abuseransomdom': (["# comment", "evil.com", "bad.org "],
+                           ['evil.com', 'bad.org', 'good.com'],
+                           [])
+    },
+    'sfp_alienvaultiprep': {
+        '_alienvault': (["1.2.3.4 # Scanning Host", "5.6.7.8 #Malicious Host",
+                         "9.9.9.9"],
+                        ['1.2.3.4', '5.6.7.8', '9.9.9.9'],
+                        ['1.2.3.0/24', '5.6.0.0/16', '9.9.9.0/24'])
+    },
+    'sfp_badipscom': {
+        '_badips': (["1.2.3.4", "5.6.7.8 ", "# comment"],
+                    ['1.2.3.4', '5.6.7.8', '9.9.9.9'],
+                    [])
+    },
+    'sfp_bambenek': {
+        'bambip': (["## Master feed", "1.2.3.4,IP used by x C&C,2019-01-01,http://x"],
+                   ['1.2.3.4', '5.6.7.8'],
+                   ['1.2.3.0/24', '5.6.7.0/24']),
+        'bambdom': (["evil.com,Domain used by x,2019-01-01,http://x"],
+                    ['evil.com', 'good.com'],
+                    [])
+    },
+    'sfp_cleantalk': {
+        '_cleantalk': (["# ipset", "1.2.3.4", "5.6.7.0/24"],
+                       ['1.2.3.4', '5.6.7.8'],
+                       ['1.2.3.0/24', '5.6.7.0/24'])
+    },
+    'sfp_coinblocker': {
+        'coinip': (["1.2.3.4", "# comment"],
+                   ['1.2.3.4', '5.6.7.8'],
+                   ['1.2.3.0/24', '5.6.7.0/24']),
+        'coindom': (["evil.com", "pool.bad.org"],
+                    ['evil.com', 'pool.bad.org', 'bad.org'],
+                    [])
+    },
+    'sfp_cryptoioc': {
+        'cryptoioc': (['2019-01-01,"miner","1.2.3.4","x"',
+                       '"5.6.7.8",2019-01-01,"pool"'],
+                      ['1.2.3.4', 'miner', '5.6.7.8', '9.9.9.9'],
+                      ['1.2.3.0/24', '5.6.7.0/24'])
+    },
+    'sfp_customfeed': {
+        '_customfeed': (["1.2.3.4", "evil.com"],
+                        ['1.2.3.4', 'evil.com', 'good.com'],
+                        ['1.2.3.0/24', '5.6.7.0/24'])
+    },
+    'sfp_cybercrimetracker': {
+        '_cybercrime': (["evil.com/panel/login.php", "1.2.3.4/x/gate.php", "bad.org"],
+                        ['evil.com', '1.2.3.4', 'bad.org'],
+                        [])
+    },
+    'sfp_malwaredomainlist': {
+        'malwaredomainlistdomain': (["127.0.0.1  evil.com ", "127.0.0.1\tbad.org\t#x",
+                                     "127.0.0.1 end.com"],
+                                    ['evil.com', 'bad.org', 'end.com', '127.0.0.1'],
+                                    [])
+    },
+    'sfp_malwaredomains': {
+        '_malwaredomains': (["evil.com", "## comment"],
+                            ['evil.com', 'good.com'],
+                            [])
+    },
+    'sfp_multiproxy': {
+        '_multiproxy': (["1.2.3.4:8080", "5.6.7.8"],
+                        ['1.2.3.4', '5.6.7.8'],
+                        [])
+    },
+    'sfp_openphish': {
+        '_openphish': (["http://www.evil.com/login", "https://bad.org",
+                        "http://1.2.3.4/x"],
+                       ['evil.com', 'www.evil.com', 'com', 'bad.org', '1.2.3.4',
+                        'good.com'],
+                       [])
+    },
+    'sfp_phishtank': {
+        '_phishtank': (["phish_id,url,phish_detail_url",
+                        "123,http://www.evil.com/x,http://www.phishtank.com/phish_detail.php?phish_id=123,yes"],
+                       ['evil.com', 'www.evil.com', 'good.com'],
+                       [])
+    },
+    'sfp_torexits': {
+        '_torexits': (["ExitNode 0011BD2485AD45D984EC4159C88FC066E5E3300E",
+                       "ExitAddress 1.2.3.4 2019-01-01 00:00:00"],
+                      ['1.2.3.4', '5.6.7.8'],
+                      ['1.2.3.0/24', '5.6.7.0/24'])
+    },
+    'sfp_voipbl': {
+        '_voipbl': (["# VoIPBL", "1.2.3.4/32", "5.6.7.0/24"],
+                    ['1.2.3.4', '5.6.7.0', '9.9.9.9'],
+                    ['1.2.3.0/24', '5.6.0.0/16', '9.9.9.0/24'])
+    },
+    'sfp_vxvault': {
+        '_vxvault': (["VX Vault last 100 Links", "http://evil.com/path/file.exe",
+                      "http://1.2.3.4/a/b.exe", "https://bad.org:8080/c.exe"],
+                     ['evil.com', 'path', '1.2.3.4', 'bad.org', 'good.com'],
+                     ['1.2.3.0/24', '5.6.7.0/24'])
+    }
+}
+
+
+class TestFeedIndexRegexes(unittest.TestCase):
+    """
+    Test that feed indexes built with each module's line regexes list the
+    same things as matching every line against the regex did.
+    """
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    # How resourceList() checked a host name or address before indexing
+    def oldListed(self, regex, lines, target):
+        rx = unicode(regex).format(target)
+        for line in lines:
+            if re.match(rx, line, re.IGNORECASE):
+                return True
+        return False
+
+    # How resourceList() checked a netblock before indexing, except that
+    # it also skipped addresses shorter than 8 characters, such as 1.2.3.4
+    def oldListedIn(self, regex, lines, netblock):
+        pat = re.compile(regex.replace("{0}", "(\d+\.\d+\.\d+\.\d+)"), re.IGNORECASE)
+        for line in lines:
+            grp = re.findall(pat, line)
+            if len(grp) == 0:
+                continue
+            ip = grp[0].strip()
+            try:
+                if IPAddress(ip) in IPNetwork(netblock):
+                    return True
+            except BaseException:
+                continue
+        return False
+
+    def checkModule(self, modName):
+        malchecks = importlib.import_module("modules." + modName).malchecks
+        checks = dict((check['id'], check) for check in malchecks.values())
+
+        for (cid, (lines, targets, netblocks)) in samples[modName].items():
+            regex = checks[cid]['regex']
+            path = os.path.join(self.dir, cid)
+            index = SpiderFootFeedIndex.build(path, "\n".join(lines), regex)
+
+            for target in targets:
+                self.assertEqual(self.oldListed(regex, lines, target), index.contains(target),
+                                 "%s: %s %s" % (modName, cid, target))
+            for netblock in netblocks:
+                self.assertEqual(self.oldListedIn(regex, lines, netblock),
+                                 index.hasAddressIn(netblock),
+                                 "%s: %s %s" % (modName, cid, netblock))
+
+    def test_samples_should_cover_every_list_regex(self):
+        for modName in os.listdir("modules"):
+            if not modName.startswith("sfp_") or not modName.endswith(".py"):
+                continue
+            modName = modName[0:-3]
+            source = open(os.path.join("modules", modName + ".py")).read()
+            if "feedIndexPut" not in source:
+                continue
+            malchecks = importlib.import_module("modules." + modName).malchecks
+            for check in malchecks.values():
+                if check.get('type', 'list') == 'list' and check.get('regex'):
+                    self.assertIn(check['id'], samples.get(modName, {}),
+                                  "No samples for " + modName + " " + check['id'])
+
+    def test_abusech(self):
+        self.checkModule('sfp_abusech')
+
+    def test_alienvaultiprep(self):
+        self.checkModule('sfp_alienvaultiprep')
+
+    def test_badipscom(self):
+        self.checkModule('sfp_badipscom')
+
+    def test_bambenek(self):
+        self.checkModule('sfp_bambenek')
+
+    def test_cleantalk(self):
+        self.checkModule('sfp_cleantalk')
+
+    def test_coinblocker(self):
+        self.checkModule('sfp_coinblocker')
+
+    def test_cryptoioc(self):
+        self.checkModule('sfp_cryptoioc')
+
+    def test_customfeed(self):
+        self.checkModule('sfp_customfeed')
+
+    def test_cybercrimetracker(self):
+        self.checkModule('sfp_cybercrimetracker')
+
+    def test_malwaredomainlist(self):
+        self.checkModule('sfp_malwaredomainlist')
+
+    def test_malwaredomains(self):
+        self.checkModule('sfp_malwaredomains')
+
+    def test_multiproxy(self):
+        self.checkModule('sfp_multiproxy')
+
+    def test_openphish(self):
+        self.checkModule('sfp_openphish')
+
+    def test_phishtank(self):
+        self.checkModule('sfp_phishtank')
+
+    def test_torexits(self):
+        self.checkModule('sfp_torexits')
+
+    def test_voipbl(self):
+        self.checkModule('sfp_voipbl')
+
+    def test_vxvault(self):
+        self.checkModule('sfp_vxvault')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+# test_sfp_hosting.py
+import unittest
+from array import array
+from netaddr import IPAddress
+
+from modules.sfp_hosting import sfp_hosting
+
+
+class TestModuleHosting(unittest.TestCase):
+    """
+    Test modules.sfp_hosting
+    """
+
+    def module(self, rows):
+        module = sfp_hosting()
+        flat = module.flattenRanges(rows)
+        module.ranges = (array('L', [row[0] for row in flat]),
+                         array('L', [row[1] for row in flat]),
+                         [row[2] for row in flat])
+        return module
+
+    def test_flattenRanges_should_return_disjoint_sorted_ranges(self):
+        rows = [(10, 100, 'outer', 'u'), (20, 30, 'inner', 'u'),
+                (5, 15, 'early', 'u'), (200, 300, 'x', 'u')]
+        flat = sfp_hosting().flattenRanges(rows)
+        self.assertEqual([[5, 9, ['early', 'u']], [10, 100, ['outer', 'u']],
+                          [200, 300, ['x', 'u']]], flat)
+
+    def test_flattenRanges_should_keep_first_listed_provider(self):
+        rows = [(20, 30, 'inner', 'u'), (10, 100, 'outer', 'u')]
+        flat = sfp_hosting().flattenRanges(rows)
+        self.assertEqual([[10, 19, ['outer', 'u']], [20, 30, ['inner', 'u']],
+                          [31, 100, ['outer', 'u']]], flat)
+
+    def test_queryAddr_should_find_address_in_containing_range(self):
+        # 1.0.0.0-1.0.255.255 contains 1.0.0.0-1.0.0.255, which starts
+        # at the same address but ends sooner.
+        module = self.module([(16777216, 16842751, 'outer', 'u'),
+                              (16777216, 16777471, 'inner', 'u')])
+        self.assertEqual(['outer', 'u'], module.queryAddr('1.0.1.1'))
+        self.assertEqual(['outer', 'u'], module.queryAddr('1.0.0.1'))
+
+    def test_queryAddr_should_find_address_after_nested_range(self):
+        module = self.module([(16777216, 16842751, 'outer', 'u'),
+                              (16777472, 16777727, 'inner', 'u')])
+        self.assertEqual(['outer', 'u'], module.queryAddr('1.0.2.1'))
+        self.assertEqual(['outer', 'u'], module.queryAddr('1.0.1.1'))
+
+    def test_queryAddr_outside_ranges_should_return_none(self):
+        module = self.module([(16777216, 16777471, 'range', 'u')])
+        self.assertIsNone(module.queryAddr('0.255.255.255'))
+        self.assertIsNone(module.queryAddr('1.0.1.0'))
+
+    def test_flattenRanges_should_match_scanning_the_rows(self):
+        rows = [(0, 50, 'a', 'u'), (10, 20, 'b', 'u'), (15, 60, 'c', 'u'),
+                (55, 55, 'd', 'u'), (70, 80, 'e', 'u'), (40, 75, 'f', 'u')]
+        module = self.module(rows)
+        for addr in range(0, 90):
+            expected = None
+            for row in rows:
+                if row[0] <= addr <= row[1]:
+                    expected = [row[2], row[3]]
+                    break
+            self.assertEqual(expected, module.queryAddr(str(IPAddress(addr))))
+
+
+if __name__ == '__main__':
+    unittest.main()
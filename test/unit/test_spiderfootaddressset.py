@@ -0,0 +1,69 @@
+# test_spiderfootaddressset.py
+import struct
+import unittest
+from bisect import bisect_left, bisect_right
+
+from sflib import SpiderFootAddressSet, SpiderFootPackedArray
+
+
+class TestSpiderFootAddressSet(unittest.TestCase):
+    """
+    Test SpiderFootAddressSet and SpiderFootPackedArray
+    """
+
+    addresses = ['1.2.3.4', '1.2.3.9', '1.2.4.0', '10.0.0.1', '255.255.255.255']
+
+    def packed(self, values, header="HEAD"):
+        data = header + struct.pack("<%dI" % len(values), *values)
+        return SpiderFootPackedArray(data, len(header), len(values), "<I")
+
+    def addressSet(self):
+        values = sorted([SpiderFootAddressSet.toInt(a) for a in self.addresses])
+        return SpiderFootAddressSet(self.packed(values))
+
+    def test_packed_array_should_index_values(self):
+        array = self.packed([3, 5, 8])
+        self.assertEqual(3, len(array))
+        self.assertEqual([3, 5, 8], [array[i] for i in range(3)])
+        self.assertEqual(8, array[-1])
+        self.assertRaises(IndexError, lambda: array[3])
+        self.assertRaises(IndexError, lambda: array[-4])
+
+    def test_packed_array_should_support_bisect(self):
+        values = [3, 5, 5, 8, 13]
+        array = self.packed(values)
+        for value in range(0, 15):
+            self.assertEqual(bisect_left(values, value), bisect_left(array, value))
+            self.assertEqual(bisect_right(values, value), bisect_right(array, value))
+
+    def test_toInt_should_convert_dotted_addresses(self):
+        self.assertEqual(0, SpiderFootAddressSet.toInt('0.0.0.0'))
+        self.assertEqual(16909060, SpiderFootAddressSet.toInt('1.2.3.4'))
+        self.assertEqual(4294967295, SpiderFootAddressSet.toInt('255.255.255.255'))
+
+    def test_toInt_invalid_address_should_return_none(self):
+        for address in ['1.2.3', '1.2.3.4.5', '1.2.3.256', 'a.b.c.d', '::1', '']:
+            self.assertIsNone(SpiderFootAddressSet.toInt(address))
+
+    def test_countIn_should_count_addresses_in_netblock(self):
+        addressSet = self.addressSet()
+        self.assertEqual(2, addressSet.countIn('1.2.3.0/24'))
+        self.assertEqual(3, addressSet.countIn('1.2.0.0/16'))
+        self.assertEqual(1, addressSet.countIn('10.0.0.1/32'))
+        self.assertEqual(1, addressSet.countIn('255.255.255.0/24'))
+        self.assertEqual(5, addressSet.countIn('0.0.0.0/0'))
+        self.assertEqual(0, addressSet.countIn('10.0.0.2/31'))
+
+    def test_anyIn_should_match_netblock_membership(self):
+        addressSet = self.addressSet()
+        self.assertTrue(addressSet.anyIn('1.2.4.0/30'))
+        self.assertFalse(addressSet.anyIn('1.2.5.0/24'))
+
+    def test_invalid_or_ipv6_netblock_should_match_nothing(self):
+        addressSet = self.addressSet()
+        self.assertEqual(0, addressSet.countIn('not a netblock'))
+        self.assertEqual(0, addressSet.countIn('::/0'))
+
+
+if __name__ == '__main__':
+    unittest.main()
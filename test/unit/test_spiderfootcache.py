@@ -0,0 +1,110 @@
+# test_spiderfootcache.py
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from sflib import SpiderFootCache
+
+
+class TestSpiderFootCache(unittest.TestCase):
+    """
+    Test SpiderFootCache
+    """
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "cache.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_get_should_return_stored_data_as_unicode(self):
+        cache = SpiderFootCache(self.path, 1024 * 1024, 1024)
+        cache.put('a', u'd\xe9j\xe0'.encode('utf-8'))
+        self.assertEqual(u'd\xe9j\xe0', cache.get('a', 0))
+        # And from the database, once no longer held in memory
+        cache.memory.clear()
+        cache.memoryBytes = 0
+        self.assertEqual(u'd\xe9j\xe0', cache.get('a', 0))
+
+    def test_get_missing_or_empty_should_return_none(self):
+        cache = SpiderFootCache(self.path, 1024 * 1024, 1024)
+        self.assertIsNone(cache.get('a', 0))
+        cache.put('a', '')
+        self.assertIsNone(cache.get('a', 0))
+
+    def test_get_expired_should_return_none(self):
+        cache = SpiderFootCache(self.path, 1024 * 1024, 1024)
+        cache.put('a', 'data', expiryHrs=1)
+        self.assertEqual('data', cache.get('a', 0))
+        cache.memory['a'] = (time.time() - 7200, time.time() - 3600, u'data', 4)
+        self.assertIsNone(cache.get('a', 0))
+
+    def test_get_older_than_timeout_should_return_none(self):
+        cache = SpiderFootCache(self.path, 1024 * 1024, 1024)
+        cache.put('a', 'data')
+        cache.memory['a'] = (time.time() - 7200, 0, u'data', 4)
+        self.assertIsNone(cache.get('a', 1))
+        self.assertEqual('data', cache.get('a', 3))
+        self.assertEqual('data', cache.get('a', 0))
+
+    def test_memory_should_count_encoded_bytes(self):
+        cache = SpiderFootCache(self.path, 1024 * 1024, 5)
+        cache.put('a', u'\xe9\xe9'.encode('utf-8'))
+        self.assertEqual(4, cache.memoryBytes)
+        cache.put('b', 'xx')
+        # Over the limit, so the least recently used is dropped from memory
+        self.assertEqual(['b'], cache.memory.keys())
+        self.assertEqual(2, cache.memoryBytes)
+        self.assertEqual(u'\xe9\xe9', cache.get('a', 0))
+
+    def test_memory_hits_should_update_accessed(self):
+        cache = SpiderFootCache(self.path, 1024 * 1024, 1024)
+        cache._touchInterval = 0
+        cache.put('a', 'data')
+        qry = "SELECT accessed FROM tbl_cache WHERE label = 'a'"
+        before = cache.conn.execute(qry).fetchone()[0]
+        time.sleep(0.01)
+        cache.get('a', 0)
+        self.assertGreater(cache.conn.execute(qry).fetchone()[0], before)
+
+    def test_put_over_limit_should_evict_least_recently_used(self):
+        cache = SpiderFootCache(self.path, 10, 1024)
+        cache.put('a', 'aaaa')
+        time.sleep(0.01)
+        cache.put('b', 'bbbb')
+        time.sleep(0.01)
+        cache.get('a', 0)
+        time.sleep(0.01)
+        cache.put('c', 'cccc')
+        self.assertEqual('aaaa', cache.get('a', 0))
+        self.assertIsNone(cache.get('b', 0))
+        self.assertEqual('cccc', cache.get('c', 0))
+
+
+    def test_files_from_before_the_database_should_be_removed_once(self):
+        def write(name, age):
+            path = os.path.join(self.dir, name)
+            with open(path, "w") as f:
+                f.write("data")
+            os.utime(path, (time.time() - age, time.time() - age))
+            return path
+
+        old = write("a" * 56, 3600)
+        snapshot = write("psl-" + "b" * 64, 3600)
+        other = write("c" * 55, 3600)
+        SpiderFootCache(self.path, 1024 * 1024, 1024)
+        self.assertFalse(os.path.exists(old))
+        self.assertTrue(os.path.exists(snapshot))
+        self.assertTrue(os.path.exists(other))
+
+        # Only when the database is first created
+        later = write("d" * 56, 3600)
+        SpiderFootCache(self.path, 1024 * 1024, 1024)
+        self.assertTrue(os.path.exists(later))
+
+
+if __name__ == '__main__':
+    unittest.main()
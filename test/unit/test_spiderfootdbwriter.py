@@ -0,0 +1,185 @@
+# test_spiderfootdbwriter.py
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+
+from sflib import SpiderFoot
+from sfdb import SpiderFootDb, SpiderFootDbWriter
+
+
+class TestSpiderFootDbWriter(unittest.TestCase):
+    """
+    Test SpiderFootDbWriter
+    """
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "test.db")
+        # Fail straight away rather than waiting on another connection's lock
+        self.conn = sqlite3.connect(self.path, timeout=0, check_same_thread=False)
+        self.conn.execute("CREATE TABLE tbl_test (val INT)")
+        self.conn.commit()
+        self.writes = list()
+
+    def tearDown(self):
+        self.conn.close()
+        shutil.rmtree(self.dir)
+
+    def store(self, rows):
+        self.writes.append(len(rows))
+        try:
+            self.conn.executemany("INSERT INTO tbl_test (val) VALUES (?)", rows)
+            self.conn.commit()
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+
+    def stored(self):
+        conn = sqlite3.connect(self.path)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM tbl_test").fetchone()[0]
+        finally:
+            conn.close()
+
+    def waitFor(self, count, timeout=5):
+        deadline = time.time() + timeout
+        while self.stored() < count and time.time() < deadline:
+            time.sleep(0.02)
+        return self.stored()
+
+    def test_rows_should_be_written_once_max_rows_are_queued(self):
+        writer = SpiderFootDbWriter(self.store, 3, 60000, 100)
+        writer.start()
+        for i in range(1, 4):
+            writer.put([i])
+        self.assertEqual(3, self.waitFor(3))
+
+        # One more row is held until there are enough or the time is up
+        writer.put([4])
+        time.sleep(0.3)
+        self.assertEqual(3, self.stored())
+        self.assertEqual([3], self.writes)
+
+        writer.stop()
+        self.assertEqual(4, self.stored())
+        self.assertEqual(0, writer.unwritten)
+
+    def test_rows_should_be_written_once_max_ms_have_passed(self):
+        writer = SpiderFootDbWriter(self.store, 1000, 200, 100)
+        writer.start()
+        started = time.time()
+        writer.put([1])
+        writer.put([2])
+        self.assertEqual(2, self.waitFor(2))
+        self.assertGreaterEqual(time.time() - started, 0.2)
+        self.assertEqual([2], self.writes)
+        writer.stop()
+
+    def test_stop_should_write_queued_rows(self):
+        writer = SpiderFootDbWriter(self.store, 1000, 60000, 100)
+        writer.start()
+        for i in range(5):
+            writer.put([i])
+        writer.stop()
+        self.assertFalse(writer.is_alive())
+        self.assertEqual(5, self.stored())
+        self.assertEqual(0, writer.unwritten)
+
+    def test_rows_should_be_retried_while_database_is_locked(self):
+        other = sqlite3.connect(self.path, timeout=0)
+        other.execute("BEGIN EXCLUSIVE")
+
+        writer = SpiderFootDbWriter(self.store, 2, 60000, 100, retryMs=100)
+        writer.start()
+        writer.put([1])
+        writer.put([2])
+        deadline = time.time() + 5
+        while writer.error is None and time.time() < deadline:
+            time.sleep(0.02)
+        self.assertIn("locked", str(writer.error))
+
+        # Rows queued meanwhile are written along with the failed ones
+        writer.put([3])
+        other.rollback()
+        other.close()
+        self.assertEqual(3, self.waitFor(3))
+        self.assertIsNone(writer.error)
+        writer.stop()
+        self.assertEqual(0, writer.unwritten)
+
+    def test_stop_should_report_rows_still_locked_out(self):
+        other = sqlite3.connect(self.path, timeout=0)
+        other.execute("BEGIN EXCLUSIVE")
+
+        writer = SpiderFootDbWriter(self.store, 1000, 60000, 100, retryMs=100)
+        writer.start()
+        writer.put([1])
+        writer.put([2])
+        writer.stop()
+        other.rollback()
+        other.close()
+        self.assertEqual(2, writer.unwritten)
+        self.assertIn("locked", str(writer.error))
+        self.assertEqual(0, self.stored())
+
+    def test_failed_rows_should_be_dropped_when_dropping(self):
+        other = sqlite3.connect(self.path, timeout=0)
+        other.execute("BEGIN EXCLUSIVE")
+
+        writer = SpiderFootDbWriter(self.store, 2, 60000, 2, dropWhenFull=True)
+        writer.start()
+        writer.put([1])
+        writer.put([2])
+        writer.stop()
+        other.rollback()
+        other.close()
+        # A failed write is dropped rather than kept when dropping
+        self.assertEqual(2, writer.dropped)
+        self.assertEqual(0, writer.unwritten)
+
+
+
+class TestSpiderFootDbBatching(unittest.TestCase):
+    """
+    Test SpiderFootDb writing through SpiderFootDbWriter
+    """
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        opts = {'_debug': False, '__logging': False, '_dnsserver': ''}
+        # The database path is taken relative to the SpiderFoot directory
+        opts['__database'] = os.path.relpath(os.path.join(self.dir, "test.db"),
+                                             SpiderFoot(opts).myPath())
+        self.db = SpiderFootDb(opts, init=True)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.dir)
+
+    def test_scan_setup_should_share_the_connection_with_the_log_writer(self):
+        self.db.scanLogBatchStart(maxRows=10, maxMs=10)
+
+        def log():
+            for i in range(500):
+                self.db.scanLogEvent("scan0", "INFO", "message " + str(i))
+
+        t = threading.Thread(target=log)
+        t.start()
+        for i in range(50):
+            scanId = "scan" + str(i)
+            self.db.scanInstanceCreate(scanId, "name", "example.com")
+            self.db.scanConfigSet(scanId, {'a': '1', 'sfp_x:b': '2'})
+            self.assertEqual({'a': '1', 'sfp_x:b': '2'}, self.db.scanConfigGet(scanId))
+        t.join()
+
+        self.assertEqual(0, self.db.scanLogBatchStop())
+        self.assertEqual(50, len(self.db.scanInstanceList()))
+        self.assertEqual(500, len(self.db.scanLogs("scan0")))
+
+
+if __name__ == '__main__':
+    unittest.main()
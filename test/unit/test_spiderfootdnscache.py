@@ -0,0 +1,127 @@
+# test_spiderfootdnscache.py
+import time
+import unittest
+
+import sflib
+from sflib import SpiderFoot, SpiderFootDnsCache, globalDnsCache
+
+
+class FakeBulkResolver(object):
+    """
+    Stands in for SpiderFootDnsBulkResolver, answering every name with
+    the (answers, aliases, ttl) given for it.
+    """
+
+    answers = dict()
+
+    def __init__(self, nameservers, rate, retries, maxInFlight, timeout):
+        self.unanswered = 0
+
+    def iterate(self, names, qtype="A", stopCheck=None, aliases=False, ttls=False):
+        for name in names:
+            (answers, cnames, ttl) = self.answers[name]
+            ret = (name, answers)
+            if aliases:
+                ret += (cnames,)
+            if ttls:
+                ret += (ttl,)
+            yield ret
+
+
+class TestSpiderFootDnsCache(unittest.TestCase):
+    """
+    Test SpiderFootDnsCache
+    """
+
+    default_options = {
+        '_debug': False,
+        '__logging': False,
+        '_dnsserver': ''
+    }
+
+    def test_get_should_return_unexpired_entry(self):
+        cache = SpiderFootDnsCache()
+        cache.put('a', ['127.0.0.1'], 60)
+        entry = cache.get('a')
+        self.assertIsNotNone(entry)
+        self.assertEqual(['127.0.0.1'], entry[1])
+
+    def test_get_should_not_return_expired_entry(self):
+        cache = SpiderFootDnsCache()
+        cache.put('a', ['127.0.0.1'], -1)
+        self.assertIsNone(cache.get('a'))
+
+    def test_get_should_return_cached_negative_answer(self):
+        cache = SpiderFootDnsCache()
+        cache.put('a', None, 60)
+        entry = cache.get('a')
+        self.assertIsNotNone(entry)
+        self.assertIsNone(entry[1])
+
+    def test_cache_key_should_include_dns_server(self):
+        opts = dict(self.default_options)
+        sf = SpiderFoot(opts)
+        opts['_dnsserver'] = '10.0.0.1'
+        sf2 = SpiderFoot(opts)
+        self.assertEqual(sf._dnsCacheKey('A', 'Example.COM'),
+                         sf._dnsCacheKey('A', 'example.com'))
+        self.assertNotEqual(sf._dnsCacheKey('A', 'example.com'),
+                            sf2._dnsCacheKey('A', 'example.com'))
+
+    def test_hits_and_misses_should_be_counted_per_scan(self):
+        sf = SpiderFoot(self.default_options)
+        other = SpiderFoot(self.default_options)
+        key = sf._dnsCacheKey('TEST', 'hits.example.com')
+        sf._dnsCacheGet(key)
+        globalDnsCache.put(key, ['127.0.0.1'], 60)
+        sf._dnsCacheGet(key)
+        sf.forComponent('modules.sfp_test')._dnsCacheGet(key)
+        self.assertEqual(2, sf.stats.get('dnsHits'))
+        self.assertEqual(1, sf.stats.get('dnsMisses'))
+        self.assertEqual(0, other.stats.get('dnsHits'))
+
+
+    def bulkResolve(self, answers, resolve):
+        opts = dict(self.default_options)
+        opts['_dnsserver'] = '10.0.0.53'
+        opts['_dnscachettl'] = 300
+        sf = SpiderFoot(opts)
+        FakeBulkResolver.answers = answers
+        resolver = sflib.SpiderFootDnsBulkResolver
+        sflib.SpiderFootDnsBulkResolver = FakeBulkResolver
+        try:
+            resolve(sf)
+        finally:
+            sflib.SpiderFootDnsBulkResolver = resolver
+        return sf
+
+    # Seconds until the cached entry for key expires
+    def expiresIn(self, key):
+        entry = globalDnsCache.get(key)
+        self.assertIsNotNone(entry)
+        return entry[0] - time.time()
+
+    def test_bulk_host_answers_should_be_cached_for_at_most_their_ttl(self):
+        sf = self.bulkResolve({
+            'short.ttl.example.com': (['10.0.0.1'], ['cname.example.com'], 30),
+            'long.ttl.example.com': (['10.0.0.2'], [], 86400)
+        }, lambda sf: sf.resolveHostsBulk(['short.ttl.example.com',
+                                           'long.ttl.example.com']))
+
+        self.assertAlmostEqual(30, self.expiresIn(sf._dnsCacheKey('A', 'short.ttl.example.com')), 0)
+        self.assertAlmostEqual(300, self.expiresIn(sf._dnsCacheKey('A', 'long.ttl.example.com')), 0)
+        self.assertEqual(set(['short.ttl.example.com', 'cname.example.com', '10.0.0.1']),
+                         set(globalDnsCache.get(sf._dnsCacheKey('A', 'short.ttl.example.com'))[1]))
+
+    def test_bulk_address_answers_should_be_cached_for_at_most_their_ttl(self):
+        sf = self.bulkResolve({
+            '1.0.0.10.in-addr.arpa.': (['short.ttl.example.com'], [], 30),
+            '2.0.0.10.in-addr.arpa.': (['long.ttl.example.com'], [], 86400)
+        }, lambda sf: list(sf.resolveIPsBulk(['10.0.0.1', '10.0.0.2'])))
+
+        self.assertAlmostEqual(30, self.expiresIn(sf._dnsCacheKey('PTR', '10.0.0.1')), 0)
+        self.assertAlmostEqual(300, self.expiresIn(sf._dnsCacheKey('PTR', '10.0.0.2')), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
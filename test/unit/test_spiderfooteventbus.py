@@ -0,0 +1,217 @@
+# test_spiderfooteventbus.py
+import threading
+import time
+import unittest
+
+from sflib import SpiderFootPlugin, SpiderFootEvent, SpiderFootEventBus, \
+    globalScanStatus
+
+
+class RecordingModule(SpiderFootPlugin):
+    """
+    Records the data of each event handled, and how many events were at
+    most handed to it and handled by it at once. Handling blocks until
+    gate is set, and can take delay seconds.
+    """
+
+    def __init__(self, name, threadSafe=False, delay=0):
+        self.__name__ = name
+        self._threadSafe = threadSafe
+        self.delay = delay
+        self.gate = threading.Event()
+        self.gate.set()
+        self.started = threading.Event()
+        self.handled = list()
+        self.dispatched = 0
+        self.maxDispatched = 0
+        self.running = 0
+        self.maxRunning = 0
+        self.lock = threading.Lock()
+        self.clearListeners()
+
+    def processEvent(self, event):
+        with self.lock:
+            self.dispatched += 1
+            self.maxDispatched = max(self.maxDispatched, self.dispatched)
+        try:
+            SpiderFootPlugin.processEvent(self, event)
+        finally:
+            with self.lock:
+                self.dispatched -= 1
+
+    def handleEvent(self, event):
+        with self.lock:
+            self.running += 1
+            self.maxRunning = max(self.maxRunning, self.running)
+        self.started.set()
+        self.gate.wait(10)
+        time.sleep(self.delay)
+        with self.lock:
+            self.handled.append(event.data)
+            self.running -= 1
+
+
+class ChainingModule(RecordingModule):
+    """
+    Posts a follow-up to every event it handles, until depth events
+    have been handled, the way modules produce events from events.
+    """
+
+    def __init__(self, name, bus, depth):
+        RecordingModule.__init__(self, name, delay=0.05)
+        self.bus = bus
+        self.depth = depth
+
+    def handleEvent(self, event):
+        RecordingModule.handleEvent(self, event)
+        if int(event.data) < self.depth:
+            evt = SpiderFootEvent("TEST", str(int(event.data) + 1), self.__name__, event)
+            self.bus.post([self], evt)
+
+
+class TestSpiderFootEventBus(unittest.TestCase):
+    """
+    Test SpiderFootEventBus
+    """
+
+    def setUp(self):
+        self.root = SpiderFootEvent("ROOT", "example.com", "", None)
+        self.bus = None
+
+    def tearDown(self):
+        if self.bus is not None:
+            self.bus.shutdown()
+
+    def startBus(self, scanId, workers, modules, maxWorkers=1):
+        self.bus = SpiderFootEventBus(scanId, workers)
+        for module in modules:
+            module.setScanId(scanId)
+            self.bus.register(module, maxWorkers)
+        self.bus.start()
+        return self.bus
+
+    def event(self, data):
+        return SpiderFootEvent("TEST", data, "sfp_test", self.root)
+
+    # Run waitForIdle() in another thread so that a bus that never goes
+    # idle fails the test rather than hanging it.
+    def waitForIdle(self, bus):
+        t = threading.Thread(target=bus.waitForIdle)
+        t.daemon = True
+        t.start()
+        t.join(10)
+        self.assertFalse(t.isAlive(), "Event bus never went idle")
+
+    def test_events_should_reach_each_listener_in_order_posted(self):
+        first = RecordingModule("sfp_first", delay=0.001)
+        second = RecordingModule("sfp_second")
+        bus = self.startBus("test_bus_order", 4, [first, second])
+
+        expected = [str(i) for i in range(50)]
+        for data in expected:
+            bus.post([first, second], self.event(data))
+        self.waitForIdle(bus)
+
+        self.assertEqual(expected, first.handled)
+        self.assertEqual(expected, second.handled)
+
+    def test_wait_for_idle_should_wait_for_chained_events(self):
+        bus = SpiderFootEventBus("test_bus_chain", 2)
+        module = ChainingModule("sfp_chain", bus, 5)
+        module.setScanId("test_bus_chain")
+        bus.register(module)
+        bus.start()
+        self.bus = bus
+
+        bus.post([module], self.event("1"))
+        self.waitForIdle(bus)
+
+        self.assertEqual(["1", "2", "3", "4", "5"], module.handled)
+        self.assertEqual(0, bus.pendingCount())
+
+    def test_done_should_be_called_once_all_listeners_have_handled_event(self):
+        first = RecordingModule("sfp_first", delay=0.05)
+        second = RecordingModule("sfp_second")
+        bus = self.startBus("test_bus_done", 2, [first, second])
+
+        handledWhenDone = list()
+        bus.post([first, second], self.event("a"),
+                 lambda: handledWhenDone.append(first.handled + second.handled))
+        self.waitForIdle(bus)
+
+        self.assertEqual([["a", "a"]], handledWhenDone)
+
+    def test_shutdown_should_discard_queued_events(self):
+        module = RecordingModule("sfp_blocked")
+        module.gate.clear()
+        bus = self.startBus("test_bus_shutdown", 2, [module])
+
+        for i in range(10):
+            bus.post([module], self.event(str(i)))
+        self.assertTrue(module.started.wait(10))
+
+        t = threading.Thread(target=bus.shutdown)
+        t.daemon = True
+        t.start()
+        # Shutting down waits for the event being handled
+        t.join(0.2)
+        self.assertTrue(t.isAlive())
+        module.gate.set()
+        t.join(10)
+        self.assertFalse(t.isAlive(), "Event bus never shut down")
+
+        self.assertEqual(["0"], module.handled)
+        self.assertEqual([], bus.workers)
+
+    def test_abort_should_drain_queued_events_without_handling_them(self):
+        scanId = "test_bus_abort"
+        module = RecordingModule("sfp_blocked")
+        module.gate.clear()
+        bus = self.startBus(scanId, 2, [module])
+
+        done = list()
+        for i in range(10):
+            bus.post([module], self.event(str(i)), lambda: done.append(True))
+        self.assertTrue(module.started.wait(10))
+
+        globalScanStatus.setStatus(scanId, "ABORT-REQUESTED")
+        try:
+            module.gate.set()
+            self.waitForIdle(bus)
+        finally:
+            globalScanStatus.setStatus(scanId, "ABORTED")
+
+        self.assertEqual(["0"], module.handled)
+        self.assertEqual(0, bus.pendingCount())
+        # Events that were never handled still have their callbacks run
+        self.assertEqual(10, len(done))
+
+    def test_module_not_thread_safe_should_handle_one_event_at_a_time(self):
+        module = RecordingModule("sfp_unsafe", delay=0.01)
+        bus = self.startBus("test_bus_unsafe", 4, [module], maxWorkers=4)
+
+        for i in range(20):
+            bus.post([module], self.event(str(i)))
+        self.waitForIdle(bus)
+
+        self.assertEqual(20, len(module.handled))
+        # The bus only uses one worker for it, never relying on the
+        # module's own lock
+        self.assertEqual(1, module.maxDispatched)
+        self.assertEqual(1, module.maxRunning)
+
+    def test_thread_safe_module_should_use_several_workers(self):
+        module = RecordingModule("sfp_safe", threadSafe=True, delay=0.05)
+        bus = self.startBus("test_bus_safe", 4, [module], maxWorkers=4)
+
+        for i in range(20):
+            bus.post([module], self.event(str(i)))
+        self.waitForIdle(bus)
+
+        self.assertEqual(20, len(module.handled))
+        self.assertGreater(module.maxRunning, 1)
+        self.assertLessEqual(module.maxRunning, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
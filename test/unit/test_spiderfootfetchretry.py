@@ -0,0 +1,88 @@
+# test_spiderfootfetchretry.py
+import email.utils
+import time
+import unittest
+
+import requests
+
+from sflib import SpiderFoot
+
+
+class TestSpiderFootFetchRetry(unittest.TestCase):
+    """
+    Test how fetchUrl() decides whether and when to retry a request
+    """
+
+    default_options = {
+        '_debug': False,
+        '__logging': False,
+        '_dnsserver': ''
+    }
+
+    def result(self, code, headers=None, retryable=False):
+        return {
+            'code': code,
+            'status': None,
+            'content': None,
+            'headers': headers,
+            'realurl': 'https://api.example.com/',
+            'retryable': retryable
+        }
+
+    def test_retryAfter_should_parse_seconds(self):
+        sf = SpiderFoot(self.default_options)
+        self.assertEqual(30, sf._retryAfter(self.result("429", {'retry-after': ' 30 '})))
+
+    def test_retryAfter_should_parse_dates(self):
+        sf = SpiderFoot(self.default_options)
+        date = email.utils.formatdate(time.time() + 20, usegmt=True)
+        wait = sf._retryAfter(self.result("503", {'retry-after': date}))
+        self.assertGreater(wait, 15)
+        self.assertLessEqual(wait, 20)
+
+        date = email.utils.formatdate(time.time() - 20, usegmt=True)
+        self.assertEqual(0, sf._retryAfter(self.result("503", {'retry-after': date})))
+
+    def test_retryAfter_missing_or_invalid_should_return_none(self):
+        sf = SpiderFoot(self.default_options)
+        self.assertIsNone(sf._retryAfter(self.result("429")))
+        self.assertIsNone(sf._retryAfter(self.result("429", {})))
+        self.assertIsNone(sf._retryAfter(self.result("429", {'retry-after': 'soon'})))
+
+    def test_fetchRetryDelay_should_not_retry_other_codes(self):
+        sf = SpiderFoot(self.default_options)
+        for code in ["200", "301", "400", "401", "403", "404"]:
+            self.assertIsNone(sf._fetchRetryDelay(self.result(code), 0))
+
+    def test_fetchRetryDelay_should_only_retry_retryable_errors(self):
+        sf = SpiderFoot(self.default_options)
+        self.assertIsNone(sf._fetchRetryDelay(self.result(None), 0))
+        self.assertIsNotNone(sf._fetchRetryDelay(self.result(None, retryable=True), 0))
+
+    def test_fetchRetryDelay_should_back_off_exponentially(self):
+        sf = SpiderFoot(self.default_options)
+        for attempt in range(0, 10):
+            backoff = min(sf._fetchRetryMaxWait, 2 ** attempt)
+            for i in range(20):
+                delay = sf._fetchRetryDelay(self.result("500"), attempt)
+                self.assertGreaterEqual(delay, backoff / 2.0)
+                self.assertLessEqual(delay, backoff)
+
+    def test_fetchRetryDelay_should_honour_retry_after(self):
+        sf = SpiderFoot(self.default_options)
+        self.assertEqual(7, sf._fetchRetryDelay(self.result("429", {'retry-after': '7'}), 3))
+        self.assertIsNone(sf._fetchRetryDelay(self.result("429", {'retry-after': '3600'}), 0))
+
+    def test_fetchRetryable_should_only_retry_connection_errors(self):
+        sf = SpiderFoot(self.default_options)
+        host = '127.0.0.1'
+        self.assertTrue(sf._fetchRetryable(requests.exceptions.ConnectionError(), host))
+        self.assertTrue(sf._fetchRetryable(requests.exceptions.ChunkedEncodingError(), host))
+        self.assertFalse(sf._fetchRetryable(requests.exceptions.ConnectTimeout(), host))
+        self.assertFalse(sf._fetchRetryable(requests.exceptions.ReadTimeout(), host))
+        self.assertFalse(sf._fetchRetryable(requests.exceptions.SSLError(), host))
+        self.assertFalse(sf._fetchRetryable(ValueError(), host))
+
+
+if __name__ == '__main__':
+    unittest.main()
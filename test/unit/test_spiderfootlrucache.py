@@ -0,0 +1,46 @@
+# test_spiderfootlrucache.py
+import unittest
+
+from sflib import SpiderFootLRUCache
+
+
+class TestSpiderFootLRUCache(unittest.TestCase):
+    """
+    Test SpiderFootLRUCache
+    """
+
+    def test_get_missing_should_return_default(self):
+        cache = SpiderFootLRUCache(2)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual('x', cache.get('a', 'x'))
+
+    def test_put_should_replace_existing_value(self):
+        cache = SpiderFootLRUCache(2)
+        cache.put('a', 1)
+        cache.put('a', 2)
+        self.assertEqual(2, cache.get('a'))
+        self.assertEqual(1, len(cache))
+
+    def test_put_over_limit_should_evict_least_recently_used(self):
+        cache = SpiderFootLRUCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        # Reading 'a' makes 'b' the least recently used
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertEqual(2, len(cache))
+        self.assertEqual(1, cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(3, cache.get('c'))
+
+    def test_falsy_values_should_be_cached(self):
+        cache = SpiderFootLRUCache(2)
+        cache.put('a', None)
+        cache.put('b', 0)
+        missing = object()
+        self.assertIsNone(cache.get('a', missing))
+        self.assertEqual(0, cache.get('b', missing))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+# test_spiderfootplugin.py
+import threading
+import unittest
+
+from sflib import SpiderFootPlugin, SpiderFootEvent, SpiderFootEventBus
+
+
+class SelfListeningModule(SpiderFootPlugin):
+    """
+    Re-notifies every INTERNET_NAME it gets as a sub-domain of it, a few
+    levels deep, the way sfp_dns acts on its own events.
+    """
+
+    def __init__(self):
+        self.__name__ = "sfp_selflistening"
+        self.handled = list()
+
+    def watchedEvents(self):
+        return ["INTERNET_NAME"]
+
+    def handleEvent(self, event):
+        self.handled.append(event.data)
+        if event.data.count(".") < 4:
+            evt = SpiderFootEvent("INTERNET_NAME", "sub." + event.data,
+                                  self.__name__, event)
+            self.notifyListeners(evt)
+
+
+class TestSpiderFootPlugin(unittest.TestCase):
+    """
+    Test SpiderFootPlugin
+    """
+
+    expected = ["example.com", "sub.example.com", "sub.sub.example.com",
+                "sub.sub.sub.example.com"]
+
+    def module(self, scanId):
+        module = SelfListeningModule()
+        module.clearListeners()
+        module.setScanId(scanId)
+        module.registerListener(module)
+        return module
+
+    def dispatch(self, module):
+        root = SpiderFootEvent("ROOT", "example.com", "", None)
+        evt = SpiderFootEvent("INTERNET_NAME", "example.com", "sfp_test", root)
+        # Run in another thread so that a deadlock fails the test rather
+        # than hanging it.
+        t = threading.Thread(target=module.processEvent, args=(evt,))
+        t.daemon = True
+        t.start()
+        t.join(10)
+        self.assertFalse(t.isAlive(), "Dispatch deadlocked")
+
+    def test_module_notifying_itself_should_not_deadlock(self):
+        module = self.module("test_plugin_direct")
+        self.dispatch(module)
+        self.assertEqual(self.expected, module.handled)
+
+    def test_module_notifying_itself_on_event_bus_should_not_deadlock(self):
+        bus = SpiderFootEventBus("test_plugin_bus", 2)
+        module = self.module("test_plugin_bus")
+        module.setEventBus(bus)
+        bus.register(module)
+        bus.start()
+        try:
+            self.dispatch(module)
+            t = threading.Thread(target=bus.waitForIdle)
+            t.daemon = True
+            t.start()
+            t.join(10)
+            self.assertFalse(t.isAlive(), "Event bus never went idle")
+        finally:
+            bus.shutdown()
+        self.assertEqual(self.expected, module.handled)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+# test_spiderfootratelimiter.py
+import unittest
+
+from sflib import SpiderFootRateLimiter, SpiderFootScanStats
+
+
+class TestSpiderFootRateLimiter(unittest.TestCase):
+    """
+    Test SpiderFootRateLimiter and SpiderFootScanStats
+    """
+
+    def test_first_request_should_not_wait(self):
+        limiter = SpiderFootRateLimiter()
+        self.assertEqual(0, limiter.acquire('a', 10))
+
+    def test_no_interval_should_not_wait(self):
+        limiter = SpiderFootRateLimiter()
+        for i in range(5):
+            self.assertEqual(0, limiter.acquire('a', 0))
+
+    def test_requests_should_be_spaced_by_interval(self):
+        limiter = SpiderFootRateLimiter()
+        limiter.acquire('a', 0.05)
+        waited = limiter.acquire('a', 0.05)
+        self.assertGreater(waited, 0.03)
+        self.assertLessEqual(waited, 0.05)
+
+    def test_keys_should_be_limited_separately(self):
+        limiter = SpiderFootRateLimiter()
+        limiter.acquire('a', 10)
+        self.assertEqual(0, limiter.acquire('b', 10))
+
+    def test_burst_should_allow_requests_together(self):
+        limiter = SpiderFootRateLimiter()
+        for i in range(3):
+            self.assertEqual(0, limiter.acquire('a', 0.05, 3))
+        self.assertGreater(limiter.acquire('a', 0.05, 3), 0.03)
+
+    def test_hold_should_delay_requests(self):
+        limiter = SpiderFootRateLimiter()
+        limiter.hold('a', 0.05)
+        self.assertGreater(limiter.acquire('a', 0), 0.03)
+        self.assertEqual(0, limiter.acquire('a', 0))
+
+    def test_scan_stats_should_add_up(self):
+        stats = SpiderFootScanStats()
+        self.assertEqual(0, stats.get('waits'))
+        stats.add('waits')
+        stats.add('waits')
+        stats.add('waited', 0.5)
+        self.assertEqual(2, stats.get('waits'))
+        self.assertEqual(0.5, stats.get('waited'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+# test_spiderfoottarget.py
+import itertools
+import unittest
+
+import netaddr
+
+from sflib import SpiderFootTarget
+
+
+# SpiderFootTarget.matches() as it was before names and addresses were
+# indexed, which the indexed version must agree with.
+def oldMatches(target, value, includeParents=False, includeChildren=True):
+    value = value.lower()
+
+    if value is None or value == "":
+        return False
+
+    if target.targetType == "HUMAN_NAME" or target.targetType == "PHONE_NUMBER":
+        return True
+
+    if netaddr.valid_ipv4(value):
+        addresses = [a['value'].lower() for a in target.targetAliases
+                     if a['type'] == "IP_ADDRESS"]
+        if target.targetType == "IP_ADDRESS":
+            addresses.append(target.targetValue)
+        if value in addresses:
+            return True
+        if target.targetType == "NETBLOCK_OWNER":
+            if netaddr.IPAddress(value) in netaddr.IPNetwork(target.targetValue):
+                return True
+        if target.targetType == "IP_ADDRESS":
+            if netaddr.IPAddress(value) in \
+                    netaddr.IPNetwork(netaddr.IPAddress(target.targetValue)):
+                return True
+    else:
+        names = [a['value'].lower() for a in target.targetAliases
+                 if a['type'] == "INTERNET_NAME"]
+        if target.targetType == "INTERNET_NAME" and target.targetValue.lower() not in names:
+            names.append(target.targetValue.lower())
+        for name in names:
+            if value == name:
+                return True
+            if includeParents and name.endswith("." + value):
+                return True
+            if includeChildren and value.endswith("." + name):
+                return True
+
+    return None
+
+
+class TestSpiderFootTarget(unittest.TestCase):
+    """
+    Test SpiderFootTarget
+    """
+
+    def target(self, value, typeName, aliases=list()):
+        target = SpiderFootTarget(value, typeName)
+        for (aliasType, alias) in aliases:
+            target.setAlias(alias, aliasType)
+        return target
+
+    # Check matches() gives the expected result, and the same one the
+    # old implementation did.
+    def assertMatches(self, expected, target, value, includeParents=False,
+                      includeChildren=True):
+        args = (value, includeParents, includeChildren)
+        self.assertEqual(expected, target.matches(*args), repr(args))
+        self.assertEqual(expected, oldMatches(target, *args), repr(args))
+
+    def test_name_should_match_itself_and_aliases(self):
+        target = self.target("Example.com", "INTERNET_NAME",
+                             [("INTERNET_NAME", "example.net")])
+        self.assertMatches(True, target, "example.com")
+        self.assertMatches(True, target, "EXAMPLE.COM")
+        self.assertMatches(True, target, "example.net")
+        self.assertMatches(None, target, "example.org")
+
+    def test_name_should_match_subdomains(self):
+        target = self.target("example.com", "INTERNET_NAME")
+        self.assertMatches(True, target, "www.example.com")
+        self.assertMatches(True, target, "a.b.example.com")
+        self.assertMatches(None, target, "example.com.au")
+
+    def test_name_should_only_match_at_label_boundary(self):
+        target = self.target("example.com", "INTERNET_NAME")
+        self.assertMatches(None, target, "notexample.com")
+        self.assertMatches(None, target, "www.notexample.com")
+        self.assertMatches(None, target, "ample.com", includeParents=True)
+        self.assertMatches(None, target, "xample.com", includeParents=True)
+
+    def test_include_children_should_control_subdomain_matches(self):
+        target = self.target("example.com", "INTERNET_NAME")
+        self.assertMatches(True, target, "www.example.com", includeChildren=True)
+        self.assertMatches(None, target, "www.example.com", includeChildren=False)
+        self.assertMatches(True, target, "example.com", includeChildren=False)
+
+    def test_include_parents_should_control_parent_domain_matches(self):
+        target = self.target("www.example.com", "INTERNET_NAME")
+        self.assertMatches(None, target, "example.com")
+        self.assertMatches(True, target, "example.com", includeParents=True)
+        self.assertMatches(True, target, "com", includeParents=True)
+        self.assertMatches(True, target, "example.com", includeParents=True,
+                           includeChildren=False)
+        self.assertMatches(None, target, "mail.example.com", includeParents=True)
+
+    def test_names_should_match_with_both_flags_off_only_when_equal(self):
+        target = self.target("example.com", "INTERNET_NAME",
+                             [("INTERNET_NAME", "www.example.org")])
+        for value in ["www.example.com", "example.org", "notexample.com"]:
+            self.assertMatches(None, target, value, includeParents=False,
+                               includeChildren=False)
+        self.assertMatches(True, target, "www.example.org", includeParents=False,
+                           includeChildren=False)
+
+    def test_ip_should_match_itself_and_aliases(self):
+        target = self.target("192.168.0.1", "IP_ADDRESS",
+                             [("IP_ADDRESS", "10.0.0.1"), ("INTERNET_NAME", "example.com")])
+        self.assertMatches(True, target, "192.168.0.1")
+        self.assertMatches(True, target, "10.0.0.1")
+        self.assertMatches(None, target, "192.168.0.2")
+        self.assertMatches(True, target, "www.example.com")
+
+    def test_ip_should_match_when_in_netblock(self):
+        target = self.target("192.168.0.0/24", "NETBLOCK_OWNER",
+                             [("IP_ADDRESS", "10.0.0.1")])
+        self.assertMatches(True, target, "192.168.0.0")
+        self.assertMatches(True, target, "192.168.0.77")
+        self.assertMatches(True, target, "192.168.0.255")
+        self.assertMatches(None, target, "192.168.1.0")
+        self.assertMatches(None, target, "192.167.255.255")
+        self.assertMatches(True, target, "10.0.0.1")
+
+    def test_names_and_phone_numbers_should_match_anything(self):
+        for typeName in ["HUMAN_NAME", "PHONE_NUMBER"]:
+            target = self.target("John Smith", typeName)
+            self.assertMatches(True, target, "example.com")
+            self.assertMatches(True, target, "192.168.0.1")
+
+    def test_empty_value_should_not_match(self):
+        target = self.target("example.com", "INTERNET_NAME")
+        self.assertMatches(False, target, "")
+
+    def test_matches_should_agree_with_old_behaviour(self):
+        target = self.target("example.com", "INTERNET_NAME",
+                             [("INTERNET_NAME", "www.example.net"),
+                              ("INTERNET_NAME", "a.b.example.org"),
+                              ("IP_ADDRESS", "192.168.0.1")])
+        labels = ["a", "b", "www", "example", "notexample", "com", "net", "org"]
+        values = ["192.168.0.1", "192.168.0.2"]
+        for n in range(1, 5):
+            values.extend(".".join(v) for v in itertools.product(labels, repeat=n))
+
+        for value in values:
+            for (includeParents, includeChildren) in itertools.product([False, True], repeat=2):
+                args = (value, includeParents, includeChildren)
+                self.assertEqual(oldMatches(target, *args), target.matches(*args),
+                                 repr(args))
+
+
+if __name__ == '__main__':
+    unittest.main()